@@ -0,0 +1,178 @@
+# Benchmarks/scaleHarness.py
+import argparse, json, multiprocessing, os, queue, sys, tempfile, time
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Repository root, for Utils / Benchmarks imports
+
+from Benchmarks.syntheticData import SyntheticOrganizationServer, synthetic_followership, synthetic_member
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+## NOTES: Runs organization_info_request, compare_user_relations and write_to_excel against synthetic data (see syntheticData.py) at a
+## configurable scale, each stage in its own spawned process so its peak RSS is its own and not left over from an earlier stage.
+## Inputs a stage needs (e.g. normalized follower lists) are built inside the stage process before the clock starts: they count toward
+## peak RSS, as they would in a real run, but not toward the stage's time. The GraphQL transport is replaced by the synthetic server,
+## so organization_info_request measures pagination, flattening and cache writes without network time.
+## A stage fails when it raises or exceeds its time (--max-seconds) or memory (--max-rss-mb) ceiling; the harness then exits with 1.
+## Usage (from the repository root): python -m Benchmarks.scaleHarness --members 100000 --repos 50000 --max-seconds 300 --max-rss-mb write_to_excel=4096
+
+STAGES = ["organization_info", "compare_user_relations", "write_to_excel"]
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process and its finished children (MB), or None when the platform does not report it."""
+    if resource is not None:
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024 # Bytes on macOS, kilobytes elsewhere
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+def _stage_organization_info(args) -> Tuple[Callable[[], int], Dict]:
+    import Utils.organizationRequests as organizationRequests
+    from Utils.entityCache import EntityCache
+    server = SyntheticOrganizationServer(args.members, args.repos, args.seed)
+    organizationRequests.send_graphql = server # Synthetic transport: every page is served from memory
+    orgs = [f"synthetic-org-{i}" for i in range(args.orgs)]
+    def run():
+        rows = organizationRequests.organization_info_request("synthetic", orgs, cache=EntityCache())
+        # Unique members (one row per login) and repositories returned; nodesServed counts every node the server sent (members of several orgs once per org)
+        return sum(1 for row in rows if "organizationRoles" in row) + sum(row.get("repositoryCount") or 0 for row in rows)
+    return run, {"requests": lambda: server.requests, "nodesServed": lambda: server.nodes_served}
+
+def _stage_compare_user_relations(args) -> Tuple[Callable[[], int], Dict]:
+    from Utils.userRequests import _normalize_user
+    from Utils.dataTransformations import compare_user_relations
+    lists = synthetic_followership(args.members, args.members, int(args.members * args.mutual), args.seed)
+    following = [_normalize_user(node) for node in lists["following"]]
+    followers = [_normalize_user(node) for node in lists["followers"]]
+    del lists
+    target = _normalize_user(synthetic_member(-1, args.seed))
+    def run():
+        compare_user_relations(following, followers, target)
+        return len(following) + len(followers)
+    return run, {}
+
+def _stage_write_to_excel(args) -> Tuple[Callable[[], int], Dict]:
+    from Utils.userRequests import _normalize_user
+    from Utils.writeToFile import write_to_excel
+    rows = []
+    for i in range(args.members):
+        row = _normalize_user(synthetic_member(i, args.seed))
+        row["organizations"], row["organizationRoles"] = ["synthetic-org-0"], {"synthetic-org-0": "MEMBER"}
+        rows.append(row)
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix="scaleHarness_")
+    def run():
+        write_to_excel(rows, "synthetic-org-0", {"search_mode": "Organization", "search_method": "Info"}, rows_per_sheet=args.rows_per_sheet,
+                       workers=args.writers, output_dir=output_dir)
+        return len(rows)
+    return run, {"output": lambda: output_dir}
+
+_STAGE_SETUP = {
+    "organization_info": _stage_organization_info,
+    "compare_user_relations": _stage_compare_user_relations,
+    "write_to_excel": _stage_write_to_excel,
+}
+
+def _run_stage(stage: str, args, results) -> None:
+    """Stage process: builds the stage's inputs, times the stage, and reports {"items", "seconds", "setupSeconds", "peakRssMb", ...}."""
+    try:
+        started = time.perf_counter()
+        run, extras = _STAGE_SETUP[stage](args)
+        setup_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        items = run()
+        seconds = time.perf_counter() - started
+        report = {"items": items, "seconds": round(seconds, 3), "setupSeconds": round(setup_seconds, 3), "peakRssMb": peak_rss_mb(), "error": None}
+        report.update({key: value() for key, value in extras.items()})
+    except Exception as e:
+        report = {"items": 0, "seconds": None, "setupSeconds": None, "peakRssMb": peak_rss_mb(), "error": f"{type(e).__name__}: {e}"}
+    results.put(report)
+
+def _ceilings(values: List[str]) -> Dict[str, float]:
+    """Parses ["300", "write_to_excel=600"] into {"*": 300.0, "write_to_excel": 600.0}."""
+    ceilings = {}
+    for value in values or []:
+        stage, _, number = value.rpartition("=")
+        if stage and stage not in STAGES:
+            raise argparse.ArgumentTypeError(f"Unknown stage '{stage}' (expected one of {', '.join(STAGES)})")
+        ceilings[stage or "*"] = float(number)
+    return ceilings
+
+def run_harness(args) -> List[Dict]:
+    """
+    Inputs: Parsed harness arguments (scale, seed, stages, ceilings, writer options).
+    Outputs: One report per stage: {"stage", "items", "seconds", "itemsPerSecond", "setupSeconds", "peakRssMb", "error", "breaches", "passed"}.
+    Method: Each stage runs in a fresh spawned process; its report is checked against the time and memory ceilings.
+    """
+    max_seconds, max_rss = _ceilings(args.max_seconds), _ceilings(args.max_rss_mb)
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    for stage in args.stages:
+        print(f"Running {stage} ({args.members} members, {args.repos} repos, {args.orgs} orgs)...")
+        results = context.Queue()
+        process = context.Process(target=_run_stage, args=(stage, args, results))
+        process.start()
+        report = None
+        while report is None:
+            try:
+                report = results.get(timeout=1)
+            except queue.Empty:
+                if not process.is_alive() and results.empty(): # Killed (e.g. by the OOM killer) before reporting
+                    report = {"items": 0, "seconds": None, "setupSeconds": None, "peakRssMb": None, "error": f"stage process exited with code {process.exitcode}"}
+        process.join()
+        report["stage"] = stage
+        report["itemsPerSecond"] = round(report["items"] / report["seconds"], 1) if report["seconds"] else None
+
+        breaches = []
+        time_limit = max_seconds.get(stage, max_seconds.get("*"))
+        rss_limit = max_rss.get(stage, max_rss.get("*"))
+        if report["error"]:
+            breaches.append(report["error"])
+        if time_limit is not None and report["seconds"] is not None and report["seconds"] > time_limit:
+            breaches.append(f"time {report['seconds']}s > {time_limit}s")
+        if rss_limit is not None and report["peakRssMb"] is not None and report["peakRssMb"] > rss_limit:
+            breaches.append(f"peak RSS {report['peakRssMb']:.0f} MB > {rss_limit:.0f} MB")
+        report["breaches"] = breaches
+        report["passed"] = not breaches
+        reports.append(report)
+
+        rss = f"{report['peakRssMb']:.0f} MB" if report["peakRssMb"] is not None else "n/a"
+        print(f"  {report['items']} items in {report['seconds']}s ({report['itemsPerSecond']} items/s), setup {report['setupSeconds']}s, "
+              f"peak RSS {rss}: {'PASS' if report['passed'] else 'FAIL (' + '; '.join(breaches) + ')'}")
+    return reports
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scale harness: runs search stages against synthetic organizations and checks time / memory ceilings.")
+    parser.add_argument("--members", type=int, default=100_000, help="Members per organization (and followed users / followers)")
+    parser.add_argument("--repos", type=int, default=50_000, help="Repositories per organization")
+    parser.add_argument("--orgs", type=int, default=1, help="Organizations requested by organization_info")
+    parser.add_argument("--mutual", type=float, default=0.3, help="Share of followed users who also follow the target")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--max-seconds", action="append", metavar="[STAGE=]SECONDS", help="Time ceiling for every stage, or for one stage")
+    parser.add_argument("--max-rss-mb", action="append", metavar="[STAGE=]MB", help="Peak RSS ceiling for every stage, or for one stage")
+    parser.add_argument("--rows-per-sheet", type=int, default=1_048_575, help="write_to_excel rows per sheet (smaller values force sharding)")
+    parser.add_argument("--writers", type=int, default=None, help="write_to_excel worker processes")
+    parser.add_argument("--output-dir", default=None, help="Folder for write_to_excel output (defaults to a temporary folder)")
+    parser.add_argument("--json", default=None, help="Also write the reports to this JSON file")
+    args = parser.parse_args(argv)
+    try:
+        _ceilings(args.max_seconds), _ceilings(args.max_rss_mb)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    reports = run_harness(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"members": args.members, "repos": args.repos, "orgs": args.orgs, "seed": args.seed, "stages": reports}, f, indent=2)
+    failed = [report["stage"] for report in reports if not report["passed"]]
+    print(f"{len(reports) - len(failed)} of {len(reports)} stages passed." + (f" Failed: {', '.join(failed)}" if failed else ""))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
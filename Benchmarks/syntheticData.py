@@ -0,0 +1,110 @@
+# Benchmarks/syntheticData.py
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+## NOTES: Deterministic stand-ins for GitHub GraphQL payloads, shaped like the responses of graphQL_organization_info_query (and the
+## UserProfile fragment), so the request, transformation and writing code paths run unchanged at scales no test org provides.
+## Every member / repository is derived from (seed, index) alone, so a page can be generated on demand without materializing the whole
+## organization, and two runs with the same seed see identical data. Cursors are the stringified offset of the next item, and a page
+## requested with the end cursor of the last page comes back empty, as GitHub's does.
+
+PAGE_SIZE = 100 # first: 100 in the organization query
+
+_FIRST = ["alex", "sam", "kim", "jordan", "li", "maria", "omar", "yuki", "noah", "priya", "ivan", "chen", "ana", "lucas", "fatima", "tom"]
+_LAST = ["smith", "wang", "garcia", "kumar", "nguyen", "muller", "rossi", "silva", "kowalski", "ito", "haddad", "okafor", "jensen", "park"]
+_WORDS = ["data", "cloud", "infra", "ml", "web", "sec", "dev", "ops", "rust", "go", "py", "js", "core", "lab", "net", "kit", "api", "ui"]
+_LOCATIONS = ["Berlin", "San Francisco", "London", "Bangalore", "Tokyo", "São Paulo", "Toronto", "Lagos", "Warsaw", "Seoul", None, None]
+_COMPANIES = ["@acme", "Initech", "Globex", "@umbrella-corp", "Hooli", "Freelance", None, None, None]
+_SOCIAL = ["https://twitter.com/{0}", "https://www.linkedin.com/in/{0}", "https://mastodon.social/@{0}", "http://{0}.dev", "https://medium.com/@{0}"]
+_EPOCH = datetime(2008, 4, 10)
+
+def _rng(seed: int, kind: str, key) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{key}")
+
+def synthetic_member(index: int, seed: int = 0) -> Dict:
+    """Returns the UserProfile node of member number index (login, createdAt, name, email, bio, location, company, socialAccounts, id)."""
+    rng = _rng(seed, "user", index)
+    first, last = rng.choice(_FIRST), rng.choice(_LAST)
+    login = f"{first}-{rng.choice(_WORDS)}{index}"
+    social = rng.sample(_SOCIAL, rng.choice([0, 0, 1, 1, 2, 3]))
+    return {
+        "id": f"U_kgDO{seed:02d}{index:09d}",
+        "login": login,
+        "createdAt": (_EPOCH + timedelta(days=rng.randrange(6500), seconds=rng.randrange(86400))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "name": f"{first.title()} {last.title()}" if rng.random() < 0.7 else None,
+        "email": f"{first}.{last}{index}@example.com" if rng.random() < 0.25 else "",
+        "bio": " ".join(rng.choices(_WORDS, k=rng.randrange(12))) or None,
+        "location": rng.choice(_LOCATIONS),
+        "company": rng.choice(_COMPANIES),
+        "socialAccounts": {"nodes": [{"url": url.format(login)} for url in social]},
+    }
+
+def synthetic_repository(index: int, seed: int = 0) -> Dict:
+    """Returns the repository node (name, description, stargazerCount, forkCount) of repository number index."""
+    rng = _rng(seed, "repo", index)
+    name = "-".join(rng.sample(_WORDS, rng.randrange(1, 4))) + f"-{index}"
+    stars = int(rng.paretovariate(1.2)) - 1 # Heavy-tailed: most repos have a handful of stars, a few have thousands
+    return {"name": name, "description": " ".join(rng.choices(_WORDS, k=rng.randrange(20))) or None, "stargazerCount": stars, "forkCount": stars // rng.randrange(3, 12)}
+
+def synthetic_member_edge(index: int, seed: int = 0) -> Dict:
+    """Returns the membersWithRole edge ({role, node}) of member number index; about one member in twenty is an ADMIN."""
+    return {"role": "ADMIN" if _rng(seed, "role", index).random() < 0.05 else "MEMBER", "node": synthetic_member(index, seed)}
+
+def _page(make, total: int, cursor: Optional[str], seed: int, page_size: int, field: str = "nodes") -> Dict:
+    start = int(cursor) if cursor else 0
+    end = min(start + page_size, total)
+    return {
+        field: [make(i, seed) for i in range(start, end)],
+        "pageInfo": {"hasNextPage": end < total, "endCursor": str(end) if end > start else None},
+    }
+
+class SyntheticOrganizationServer:
+    """
+    Stands in for send_graphql when the organization info query is sent: answers every org{i} alias of a request with one page of
+    repositories and members, following $repoCursor{i} / $memberCursor{i} and leaving out connections whose $include{...}{i} flag is false.
+    Counts requests and the nodes it has served.
+    """
+    def __init__(self, members: int = 100_000, repositories: int = 50_000, seed: int = 0, page_size: int = PAGE_SIZE):
+        self.members = members
+        self.repositories = repositories
+        self.seed = seed
+        self.page_size = page_size
+        self.requests = 0
+        self.nodes_served = 0
+
+    def organization(self, login: str) -> Dict:
+        rng = _rng(self.seed, "org", login)
+        return {
+            "id": f"O_kgDO{rng.randrange(10**9):09d}", "login": login, "name": login.replace("-", " ").title(),
+            "email": f"contact@{login}.example.com", "location": rng.choice(_LOCATIONS), "websiteUrl": f"https://{login}.example.com",
+            "createdAt": (_EPOCH + timedelta(days=rng.randrange(6500))).strftime("%Y-%m-%dT%H:%M:%SZ"), "isVerified": rng.random() < 0.5,
+            "twitterUsername": login if rng.random() < 0.5 else None,
+        }
+
+    def __call__(self, token, query: str, variables: Dict = None) -> Dict:
+        variables = variables or {}
+        self.requests += 1
+        data = {}
+        i = 0
+        while f"login{i}" in variables:
+            org = self.organization(variables[f"login{i}"])
+            if variables.get(f"includeRepos{i}", True): # @include(if: $includeRepos{i})
+                org["repositories"] = _page(synthetic_repository, self.repositories, variables.get(f"repoCursor{i}"), self.seed, self.page_size)
+                self.nodes_served += len(org["repositories"]["nodes"])
+            if variables.get(f"includeMembers{i}", True):
+                org["membersWithRole"] = _page(synthetic_member_edge, self.members, variables.get(f"memberCursor{i}"), self.seed, self.page_size, "edges")
+                self.nodes_served += len(org["membersWithRole"]["edges"])
+            data[f"org{i}"] = org
+            i += 1
+        return {"data": data}
+
+def synthetic_followership(following: int, followers: int, mutual: int = 0, seed: int = 0) -> Dict[str, List[Dict]]:
+    """
+    Inputs: Number of followed users, of followers, how many users are in both lists, and the seed.
+    Outputs: {"following": [...], "followers": [...]} of UserProfile nodes (mutual users appear in both lists, as separate dicts).
+    """
+    mutual = min(mutual, following, followers)
+    following_nodes = [synthetic_member(i, seed) for i in range(following)]
+    followers_nodes = [synthetic_member(i, seed) for i in range(mutual)] + [synthetic_member(following + i, seed) for i in range(followers - mutual)]
+    return {"following": following_nodes, "followers": followers_nodes}
@@ -0,0 +1,107 @@
+# Modules/authorSearch.py
+import hashlib, queue, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Set, Tuple
+
+from Utils.repositoryRequests import commit_history_request
+from Utils.searchBudget import SearchBudget, with_budget
+
+## NOTES: Identities are deduplicated on a 64-bit blake2b digest of (login, name, lower-cased email) instead of the tuples themselves,
+## which keeps the seen-set small when scanning hundreds of thousands of commits. Commits whose author has no linked GitHub
+## account are reported under login None. If the consumer stops early (or raises), a stop event tells the fetch workers to abandon
+## their batches instead of blocking forever on the full page queue.
+
+_DONE = object()
+
+class _Stopped(Exception):
+    pass
+
+def _identity_key(login, name, email) -> int:
+    raw = f"{login or ''}\0{name or ''}\0{(email or '').lower()}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+def iter_commit_authors(
+    token: str,
+    target_repos: List[str],
+    max_commits_per_repo: int = 1000,
+    batch_size: int = 10,
+    workers: int = 4,
+    budget: SearchBudget = None
+    ) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Inputs: Personal access token, list of repositories ('owner/name'), commit cap per repository, repositories per aliased query, number of concurrent batches,
+            and an optional SearchBudget (paging stops when it runs out).
+    Outputs: Generator of (login, name, email, repo) for every identity the first time it is seen.
+    Method: Batches of repositories are paged concurrently (commit_history_request); pages are handed to this generator through a queue and
+            deduplicated as they arrive, so identities stream out while later pages are still being fetched.
+    Information (per Identity): Linked GitHub login, commit author/committer name and email, first repository it was seen in.
+    """
+    token = with_budget(token, budget)
+    pages = queue.Queue(maxsize=workers * 4) # Bounded so fetch workers wait for the consumer instead of buffering whole histories
+    seen: Set[int] = set()
+    batches = [target_repos[i:i+batch_size] for i in range(0, len(target_repos), batch_size)]
+    stop = threading.Event()
+
+    def put(item):
+        while True: # Wait for room in the queue, but give up as soon as the consumer has gone away
+            if stop.is_set():
+                raise _Stopped()
+            try:
+                pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def fetch(batch):
+        if stop.is_set():
+            return
+        try:
+            commit_history_request(token, batch, max_commits_per_repo, lambda repo, nodes: put((repo, nodes)))
+        except _Stopped:
+            pass
+        except Exception as e:
+            print(f"Error fetching commit history for {', '.join(batch)}: {e}")
+
+    def run():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(fetch, batches))
+        try:
+            put(_DONE)
+        except _Stopped:
+            pass
+
+    threading.Thread(target=run, daemon=True).start()
+
+    try:
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                break
+            repo, nodes = item
+            for commit in nodes:
+                for person in (commit.get("author"), commit.get("committer")):
+                    if not person:
+                        continue
+                    login = (person.get("user") or {}).get("login")
+                    name, email = person.get("name"), person.get("email")
+                    if not (name or email):
+                        continue
+                    key = _identity_key(login, name, email)
+                    if key not in seen:
+                        seen.add(key)
+                        yield login, name, email, repo
+    finally:
+        stop.set() # Consumer finished, raised or closed the generator early: release any blocked fetch workers
+
+def author_search(token: str, target_repos: List[str], max_commits_per_repo: int = 1000, budget: SearchBudget = None) -> Dict[str, Set[Tuple[str, str]]]:
+    """
+    Inputs: Personal access token, list of repositories ('owner/name'), commit cap per repository, and an optional SearchBudget.
+    Outputs: Dict of {login: {(fullname, email), ...}} containing every unique identity found in the repositories' commit history.
+    Method: Collects the stream produced by iter_commit_authors.
+    """
+    identities: Dict[str, Set[Tuple[str, str]]] = {}
+    for count, (login, name, email, repo) in enumerate(iter_commit_authors(token, target_repos, max_commits_per_repo, budget=budget), 1):
+        identities.setdefault(login, set()).add((name, email))
+        if count % 100 == 0:
+            print(f"Unique commit identities found: {count}")
+    return identities
@@ -0,0 +1,145 @@
+# Modules/confidenceScoring.py
+import re
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from Utils.userRequests import _as_set
+
+## NOTES: Confidence = how much attributable identity information a record carries (real-looking name, personal email that matches
+## the name/login, location, company, social links, achievements, account age, relation to the target). It is not a probability
+## that the account belongs to a specific person; it ranks candidates so the richest ones are reviewed and enriched first.
+## Features are extracted into one float32 matrix in a single pass; scoring every candidate is then one matrix-vector product.
+
+FEATURES = [
+    "has_email",
+    "email_matches_identity", # Email local part contains the login or a name token
+    "personal_email_domain", # Not a noreply/users.noreply.github.com address
+    "full_name", # Name with at least two tokens
+    "name_matches_login",
+    "has_location",
+    "has_company",
+    "has_bio",
+    "social_links", # log1p(count), capped
+    "achievements", # log1p(count), capped
+    "organizations", # log1p(count), capped
+    "account_age_years", # capped at 10
+    "mutual_relation",
+]
+
+DEFAULT_WEIGHTS = {
+    "has_email": 1.0,
+    "email_matches_identity": 1.5,
+    "personal_email_domain": 0.5,
+    "full_name": 1.0,
+    "name_matches_login": 0.75,
+    "has_location": 0.75,
+    "has_company": 0.75,
+    "has_bio": 0.25,
+    "social_links": 1.0,
+    "achievements": 0.5,
+    "organizations": 0.25,
+    "account_age_years": 0.1,
+    "mutual_relation": 0.5,
+}
+DEFAULT_BIAS = -3.0 # Shifts the logistic curve so a bare account (login only) scores close to 0
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def _tokens(value: Optional[str]) -> List[str]:
+    return [t for t in _TOKEN.findall((value or "").lower()) if len(t) > 2]
+
+def _age_years(created_at: Optional[str], now: datetime) -> float:
+    if not created_at:
+        return 0.0
+    try:
+        created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    return max(0.0, (now - created).days / 365.25)
+
+def extract_features(users: List[Dict]) -> np.ndarray:
+    """
+    Inputs: List of normalized user dicts (any search mode output; missing fields count as absent).
+    Outputs: float32 matrix of shape (len(users), len(FEATURES)).
+    Method: One pass over the records filling preallocated feature columns.
+    """
+    now = datetime.now(timezone.utc)
+    matrix = np.zeros((len(users), len(FEATURES)), dtype=np.float32)
+    column = {name: i for i, name in enumerate(FEATURES)}
+
+    for row, user in enumerate(users):
+        login = (user.get("login") or "").lower()
+        name_tokens = _tokens(user.get("name") or next(iter(_as_set(user.get("names"))), None))
+        emails = _as_set(user.get("emails")) | _as_set(user.get("email"))
+        locals_ = [e.lower().split("@")[0] for e in emails if e]
+        identity_tokens = set(name_tokens) | ({login} if login else set())
+
+        features = matrix[row]
+        features[column["has_email"]] = bool(emails)
+        features[column["email_matches_identity"]] = any(tok in local for local in locals_ for tok in identity_tokens)
+        features[column["personal_email_domain"]] = any(e and "noreply" not in e.lower() for e in emails)
+        features[column["full_name"]] = len(name_tokens) >= 2
+        features[column["name_matches_login"]] = any(tok in login for tok in name_tokens)
+        features[column["has_location"]] = bool(user.get("location"))
+        features[column["has_company"]] = bool(user.get("company"))
+        features[column["has_bio"]] = bool(user.get("bio"))
+        features[column["social_links"]] = len(_as_set(user.get("socialAccounts")))
+        features[column["achievements"]] = len(_as_set(user.get("achievements")))
+        features[column["organizations"]] = len(_as_set(user.get("organizations")))
+        features[column["account_age_years"]] = _age_years(user.get("createdAt"), now)
+        features[column["mutual_relation"]] = user.get("relation") == "mutual"
+
+    # Count features are compressed so one prolific account cannot dominate the score
+    for name, cap in (("social_links", 10), ("achievements", 20), ("organizations", 50)):
+        matrix[:, column[name]] = np.log1p(np.minimum(matrix[:, column[name]], cap))
+    matrix[:, column["account_age_years"]] = np.minimum(matrix[:, column["account_age_years"]], 10)
+    return matrix
+
+def score_features(features: np.ndarray, weights: Dict[str, float] = None, bias: float = DEFAULT_BIAS) -> np.ndarray:
+    """
+    Inputs: Feature matrix from extract_features, optional weights ({feature: weight}, missing features use DEFAULT_WEIGHTS), and bias.
+    Outputs: float32 array of confidence scores in (0, 1).
+    Method: Vectorized weighted sum followed by a logistic squash.
+    """
+    merged = {**DEFAULT_WEIGHTS, **(weights or {})}
+    weight_vector = np.array([merged[name] for name in FEATURES], dtype=np.float32)
+    return (1.0 / (1.0 + np.exp(-(features @ weight_vector + bias)))).astype(np.float32)
+
+def score_users(users: List[Dict], weights: Dict[str, float] = None, bias: float = DEFAULT_BIAS, annotate: bool = True) -> np.ndarray:
+    """
+    Inputs: List of normalized user dicts, optional weights and bias, and whether to write the score into each dict.
+    Outputs: Array of confidence scores aligned with users (also stored as user['confidence'] when annotate is True).
+    Method: extract_features + score_features.
+    """
+    if not users:
+        return np.zeros(0, dtype=np.float32)
+    scores = score_features(extract_features(users), weights, bias)
+    if annotate:
+        for user, score in zip(users, scores.tolist()):
+            user["confidence"] = round(score, 4)
+    return scores
+
+def rank_users(users: List[Dict], weights: Dict[str, float] = None, bias: float = DEFAULT_BIAS) -> List[Dict]:
+    """Returns users sorted by descending confidence (annotating each with user['confidence'])."""
+    scores = score_users(users, weights, bias)
+    return [users[i] for i in np.argsort(-scores, kind="stable")]
+
+def prune_for_enrichment(
+    users: List[Dict],
+    min_confidence: float = None,
+    top_k: int = None,
+    weights: Dict[str, float] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Inputs: List of user dicts, minimum confidence and/or top-k, and optional weights.
+    Outputs: (users to enrich, users skipped), both in descending confidence order.
+    Method: Ranks with rank_users and splits by threshold and count. Target records (relation 'target') are always kept.
+    """
+    ranked = rank_users(users, weights)
+    keep, skipped = [], []
+    for user in ranked:
+        selected = user.get("relation") == "target" or (
+            (min_confidence is None or user["confidence"] >= min_confidence) and (top_k is None or len(keep) < top_k)
+        )
+        (keep if selected else skipped).append(user)
+    return keep, skipped
@@ -0,0 +1,140 @@
+# Modules/followershipCrawler.py
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from Utils.queries import graphQL_followership_query
+from Utils.userRequests import user_followership_request, user_hydration_request
+from Utils.dataTransformations import compare_user_relations
+from Utils.entityCache import EntityCache, resolve_cache
+from Utils.bloomFilter import BloomFilter
+from Utils.relationshipGraph import RelationshipGraph
+from Utils.searchBudget import SearchBudget, with_budget, mark_partial
+from .confidenceScoring import score_users
+
+## NOTES: Each record is annotated with 'hop' (distance from the target), 'parent' (the login it was discovered through)
+## and 'relation' relative to that parent. A login reachable through several parents is only recorded for the first one, but every
+## follow edge the crawl sees is kept in a RelationshipGraph (Utils/relationshipGraph.py), so 'sharedConnections' counts each user's
+## links to the target's own followers / followed users however many of them the user was reachable through.
+
+class _RequestBudget:
+    """Global, thread-safe cap on the number of GraphQL requests a crawl may send."""
+    def __init__(self, max_requests: int):
+        self.max_requests = max_requests
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self, points: int = 1) -> bool:
+        with self._lock:
+            if self.used + points > self.max_requests:
+                return False
+            self.used += points
+            return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used >= self.max_requests
+
+def crawl_followership(
+    token: str,
+    target_user: str,
+    depth: int = 2,
+    fanout_caps: list = None,
+    max_requests: int = 500,
+    workers: int = 8,
+    cache: EntityCache = None,
+    budget: SearchBudget = None
+    ) -> list:
+    """
+    Inputs: GitHub username (login), personal access token, crawl depth, per-hop fan-out caps (max following/followers collected per user at each hop,
+            the last value repeats for deeper hops), global request budget, number of concurrent workers, an optional EntityCache, and an optional
+            SearchBudget (deadline / API points).
+    Outputs: List of user dicts reached within depth hops of the target (target first, with its full profile), annotated with 'hop', 'parent' and 'relation'
+             (PartialResults if the SearchBudget ran out).
+    Method: Breadth-first crawl. Each hop's frontier is expanded concurrently with a bounded window of in-flight users, and visited logins are
+            deduplicated with a Bloom filter so second-degree networks of hundreds of thousands of users stay compact.
+            Under a SearchBudget, each frontier is expanded in descending confidence order so the highest-signal users are crawled first.
+    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs, sharedConnections (followers / followed users of the target
+                            the user follows or is followed by, from every edge seen during the crawl).
+    """
+    cache = resolve_cache(cache)
+    fanout_caps = fanout_caps or [250, 50]
+    request_budget = _RequestBudget(max_requests)
+    token = with_budget(token, budget)
+    query = graphQL_followership_query()
+
+    # Sized for the worst case of every frontier user returning a full page of both connections
+    expected = sum(2 * fanout_caps[min(hop, len(fanout_caps) - 1)] for hop in range(depth)) * min(max_requests, 10_000)
+    visited = BloomFilter(expected_items=min(expected, 50_000_000))
+    visited.add(target_user.lower())
+
+    # Hop 0: the target's own profile (served from the cache when this run already fetched it)
+    fetch_target = lambda logins: user_hydration_request(token, logins) if request_budget.spend() else {}
+    target_record = cache.get_or_fetch_many("user", [target_user], fetch_target)[target_user] or {"login": target_user}
+    target_record.update({"relation": "target", "hop": 0, "parent": None})
+    records = [target_record]
+    frontier = [target_user]
+    graph = RelationshipGraph() # Every follow edge seen, including those to users already recorded through another parent
+
+    def expand(login: str, cap: int):
+        variables = {"login": login, "pageSize": min(cap, 100), "socialSize": 10, "max_following": cap, "max_followers": cap}
+        return user_followership_request(token, query, variables, request_budget, cache)
+
+    for hop in range(1, depth + 1):
+        if not frontier or request_budget.exhausted or (budget is not None and budget.exhausted):
+            break
+
+        cap = fanout_caps[min(hop - 1, len(fanout_caps) - 1)]
+        next_frontier = []
+        print(f"Crawling hop {hop} of {depth}: {len(frontier)} users (requests used: {request_budget.used} of {max_requests})")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            remaining = iter(frontier)
+
+            while True:
+                # Keeps at most 2 * workers users in flight so large frontiers do not queue thousands of futures at once
+                while len(pending) < workers * 2 and not request_budget.exhausted and not (budget is not None and budget.exhausted):
+                    login = next(remaining, None)
+                    if login is None:
+                        break
+                    pending[pool.submit(expand, login, cap)] = login
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parent = pending.pop(future)
+                    try:
+                        following, followers = future.result()
+                    except Exception as e:
+                        print(f"Error crawling {parent}: {e}")
+                        continue
+
+                    for user in compare_user_relations(following, followers):
+                        if user["relation"] in ("follower", "mutual"):
+                            graph.add_edge("follow", user["login"], parent)
+                        if user["relation"] in ("following", "mutual"):
+                            graph.add_edge("follow", parent, user["login"])
+                        if visited.add(user["login"].lower()):
+                            user["hop"] = hop
+                            user["parent"] = parent
+                            records.append(user)
+                            next_frontier.append(user["login"])
+
+        frontier = next_frontier
+        if budget is not None and len(frontier) > 1: # Highest-signal users of the new frontier are expanded first
+            scores = score_users(records[-len(frontier):], annotate=False)
+            frontier = [frontier[i] for i in (-scores).argsort(kind="stable")]
+
+    if request_budget.exhausted:
+        print(f"Request budget of {max_requests} reached; returning the network collected so far.")
+
+    target_id = graph.lookup("user", target_user)
+    if target_id is not None:
+        shared = graph.common_neighbor_counts("follow", target_id, "both")
+        for record in records[1:]:
+            node = graph.lookup("user", record["login"])
+            record["sharedConnections"] = int(shared[node]) if node is not None else 0
+
+    return mark_partial(records, budget)
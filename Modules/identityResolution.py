@@ -0,0 +1,162 @@
+# Modules/identityResolution.py
+import re, zlib
+import numpy as np
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+from Utils.userRequests import _as_set
+
+## NOTES: Records are never compared pairwise. Each record emits blocking keys (login, normalized emails, social URLs, name key)
+## and MinHash-LSH band keys over its name/login shingles; only records sharing a key are linked, with union-find merging the links
+## into clusters. Exact keys link directly, LSH candidates are verified against the estimated Jaccard similarity of their signatures.
+## Blocks larger than max_block_size (e.g. a very common name, "github-actions" emails) are ignored since they carry no identity signal.
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def _normalize_email(email: str) -> str:
+    """Lower-cases and strips +tags (and dots for Gmail) so aliases of one mailbox share a key. Noreply addresses are ignored."""
+    local, _, domain = email.strip().lower().partition("@")
+    if not domain or "noreply" in domain:
+        return ""
+    local = local.split("+")[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}"
+
+def _name_key(name: str) -> str:
+    tokens = sorted(_TOKEN.findall((name or "").lower()))
+    return " ".join(tokens) if len(tokens) >= 2 else "" # Single-token names are too ambiguous for an exact block
+
+def _shingles(text: str, size: int = 3) -> Set[int]:
+    text = "".join(_TOKEN.findall(text.lower()))
+    return {zlib.crc32(text[i:i+size].encode()) & 0x7FFFFFFF for i in range(max(1, len(text) - size + 1))} if text else set()
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root: # Path compression
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+def minhash_signatures(shingle_sets: List[Set[int]], num_perm: int = 64, seed: int = 1) -> np.ndarray:
+    """
+    Inputs: List of shingle hash sets and number of permutations.
+    Outputs: uint64 matrix (len(shingle_sets), num_perm) of MinHash signatures (all-max rows for empty sets).
+    Method: Universal hashing (a*x + b) mod p applied to every shingle of a record at once with NumPy broadcasting.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for row, shingles in enumerate(shingle_sets):
+        if shingles:
+            x = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+            signatures[row] = ((np.outer(x, a) + b) % _MERSENNE_PRIME).min(axis=0)
+    return signatures
+
+def resolve_identities(
+    records: Iterable[Dict],
+    num_perm: int = 64,
+    bands: int = 16,
+    name_threshold: float = 0.6,
+    max_block_size: int = 50
+    ) -> List[Dict]:
+    """
+    Inputs: User dicts from any search mode (login, name/names, emails/email, socialAccounts), MinHash parameters, the minimum estimated
+            Jaccard similarity for a fuzzy name match, and the largest block that is still used for linking.
+    Outputs: List of candidate clusters with more than one distinct login: {"logins": set, "records": [indices], "evidence": set of matched keys}.
+    Method: Blocking on exact keys plus MinHash-LSH banding on name/login shingles, merged with union-find. Runs in near-linear time in the
+            number of records (plus the size of the capped blocks).
+    Information (per Cluster): Logins, indices of the input records, and the keys that linked them (e.g. "email:jdoe@acme.io", "name~").
+    """
+    records = list(records)
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    shingle_sets = []
+
+    for idx, record in enumerate(records):
+        login = (record.get("login") or "").lower()
+        names = _as_set(record.get("name")) | _as_set(record.get("names"))
+        if login:
+            blocks[f"login:{login}"].append(idx)
+        for email in _as_set(record.get("emails")) | _as_set(record.get("email")):
+            key = _normalize_email(email)
+            if key:
+                blocks[f"email:{key}"].append(idx)
+        for url in _as_set(record.get("socialAccounts")):
+            key = url.lower().split("://")[-1].rstrip("/")
+            if key:
+                blocks[f"social:{key}"].append(idx)
+        for name in names:
+            key = _name_key(name)
+            if key:
+                blocks[f"name:{key}"].append(idx)
+        shingle_sets.append(set().union(*(_shingles(n) for n in names)) if names else _shingles(login))
+
+    union_find = _UnionFind(len(records))
+    evidence: Dict[int, Set[str]] = defaultdict(set)
+
+    for key, members in blocks.items():
+        if len(members) < 2 or len(members) > max_block_size:
+            continue
+        for other in members[1:]:
+            union_find.union(members[0], other)
+        for member in members:
+            evidence[member].add(key)
+
+    # MinHash-LSH: records whose signatures agree on a whole band become candidates; candidates are verified on the full signature
+    signatures = minhash_signatures(shingle_sets, num_perm)
+    rows_per_band = num_perm // bands
+    empty = signatures[:, 0] == np.iinfo(np.uint64).max
+    candidates = np.flatnonzero(~empty)
+    for band in range(bands):
+        band_slice = np.ascontiguousarray(signatures[candidates, band*rows_per_band:(band+1)*rows_per_band])
+        # Groups identical band rows without a Python loop; only buckets with 2+ records are visited below
+        _, bucket_ids, bucket_sizes = np.unique(band_slice.view(f"V{band_slice.shape[1] * 8}").ravel(), return_inverse=True, return_counts=True)
+        shared = (bucket_sizes[bucket_ids] >= 2) & (bucket_sizes[bucket_ids] <= max_block_size)
+        order = np.argsort(bucket_ids[shared], kind="stable")
+        grouped, grouped_ids = candidates[shared][order], bucket_ids[shared][order]
+        for members in np.split(grouped, np.flatnonzero(np.diff(grouped_ids)) + 1):
+            if len(members) < 2:
+                continue
+            members = members.tolist()
+            similarity = (signatures[members[1:]] == signatures[members[0]]).mean(axis=1)
+            for other, sim in zip(members[1:], similarity):
+                if sim >= name_threshold and union_find.find(other) != union_find.find(members[0]):
+                    union_find.union(members[0], other)
+                    evidence[members[0]].add("name~")
+                    evidence[other].add("name~")
+
+    clusters: Dict[int, Dict] = {}
+    for idx, record in enumerate(records):
+        root = union_find.find(idx)
+        cluster = clusters.setdefault(root, {"logins": set(), "records": [], "evidence": set()})
+        if record.get("login"):
+            cluster["logins"].add(record["login"])
+        cluster["records"].append(idx)
+        cluster["evidence"] |= {key for key in evidence.get(idx, ()) if not key.startswith("login:")}
+
+    return [cluster for cluster in clusters.values() if len(cluster["logins"]) > 1]
+
+def annotate_identity_clusters(records: List[Dict], **kwargs) -> List[Dict]:
+    """
+    Inputs: List of user dicts (and optional resolve_identities parameters).
+    Outputs: The candidate clusters; each clustered record gets record['identityCluster'] (cluster number) and record['possibleAliases'] (other logins in its cluster).
+    Method: resolve_identities followed by annotation of the input records.
+    """
+    clusters = resolve_identities(records, **kwargs)
+    for number, cluster in enumerate(clusters, 1):
+        for idx in cluster["records"]:
+            record = records[idx]
+            record["identityCluster"] = number
+            record["possibleAliases"] = cluster["logins"] - {record.get("login")}
+    return clusters
@@ -0,0 +1,256 @@
+# Modules/investigationService.py
+import json, threading, time, uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from Modules.userSearch import user_search_exact, user_search_partial
+from Modules.multiTargetSearch import user_search_multi
+from Modules.followershipCrawler import crawl_followership
+from Modules.authorSearch import iter_commit_authors
+from Modules.organizationSearch import organization_search_info, organization_search_intersection
+from Modules.repositorySearch import repository_search_info
+from Utils.entityCache import EntityCache
+from Utils.searchBudget import SearchBudget
+from Utils.sendRequests import response_stats
+from Utils.retryPolicy import retry_status
+
+## NOTES: Long-running local service (python main.py --serve [port]). The process keeps the pooled HTTP session, the token pool and one
+## EntityCache warm across jobs, so analysts re-querying overlapping targets are served from memory. The cache is replaced by a new one
+## after cache_ttl seconds so entities do not go stale; jobs already running keep the cache they started with.
+## Finished jobs (and their records) are kept for job_ttl seconds and at most max_finished_jobs of them, oldest evicted first.
+## Enrichment in jobs never clears the terminal (the console is shared with every other job's progress output).
+## Endpoints (JSON):
+##   POST /jobs               {"mode": "user_exact" | "user_multi" | "user_partial" | "user_crawl" | "author" | "org_info" | "org_intersection" | "repository",
+##                             "target": "login" | "targets": [...], "options": {...}}  -> 202 {"job_id": ...}
+##   GET  /jobs               -> status of every job
+##   GET  /jobs/<id>          -> status, and the records once the job is done
+##   GET  /jobs/<id>/stream   -> newline-delimited JSON records as they are produced, then a final {"status": ...} line
+##   GET  /stats              -> cache, request and retry statistics (retry budgets, circuit breaker states)
+## Author Search jobs stream every identity as soon as it is found; other modes emit their records when the search returns.
+## user_multi jobs emit the merged records followed by the overlap report rows (rows with an "overlap" key).
+## options.deadline (seconds) and options.max_points bound a job with a SearchBudget; such jobs use a private cache (their entities may be
+## incomplete) and report "partial": <reason> when the budget ran out.
+
+def _to_json(value):
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(value, key=str) if isinstance(value, (set, frozenset)) else list(value)
+    return str(value)
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, default=_to_json).encode("utf-8")
+
+class _Job:
+    """One queued search. Records are appended as they are produced; stream readers wait on the condition for new ones."""
+    def __init__(self, mode: str, targets: list, options: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.targets = targets
+        self.options = options
+        self.status = "queued"
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.records = []
+        self.budget = None
+        self.cache = None
+        self._condition = threading.Condition()
+
+    def emit(self, records) -> None:
+        with self._condition:
+            self.records.extend(records)
+            self._condition.notify_all()
+
+    def finish(self, status: str, error: str = None) -> None:
+        with self._condition:
+            self.status, self.error, self.finished = status, error, time.time()
+            self._condition.notify_all()
+
+    def follow(self):
+        """Yields records from the first one onwards, blocking until new records arrive or the job ends."""
+        position = 0
+        while True:
+            with self._condition:
+                while position >= len(self.records) and self.status in ("queued", "running"):
+                    self._condition.wait(timeout=15)
+                pending, position = self.records[position:], len(self.records)
+                done = self.status not in ("queued", "running")
+            yield from pending
+            if done and position >= len(self.records):
+                return
+
+    def summary(self) -> dict:
+        return {"job_id": self.id, "mode": self.mode, "targets": self.targets, "status": self.status, "error": self.error,
+                "records": len(self.records), "created": self.created, "finished": self.finished,
+                "partial": self.budget.reason if self.budget is not None and self.budget.exhausted else None}
+
+class InvestigationService:
+    """Job queue and worker pool that runs the search modes with warm, shared caches."""
+    def __init__(self, token, workers: int = 4, cache_ttl: float = 3600, job_ttl: float = 3600, max_finished_jobs: int = 100):
+        self.token = token
+        self.cache = EntityCache()
+        self.cache_ttl = cache_ttl
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self._cache_started = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, mode: str, targets: list, options: dict = None) -> _Job:
+        if mode not in self._runners():
+            raise ValueError(f"Unknown mode '{mode}'. Expected one of: {', '.join(self._runners())}")
+        if not targets:
+            raise ValueError("At least one target is required")
+        job = _Job(mode, targets, options or {})
+        with self._lock:
+            self._evict_jobs()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def job(self, job_id: str):
+        with self._lock:
+            self._evict_jobs()
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list:
+        with self._lock:
+            self._evict_jobs()
+            jobs = list(self._jobs.values())
+        return [job.summary() for job in jobs]
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = len(self._jobs)
+        return {"cache": self._shared_cache().stats(), "requests": response_stats.summary(), "retries": retry_status(), "jobs": jobs}
+
+    def _evict_jobs(self) -> None:
+        """Drops finished jobs older than job_ttl, then the oldest finished jobs beyond max_finished_jobs. Called with self._lock held."""
+        now = time.time()
+        finished = sorted((job for job in self._jobs.values() if job.finished is not None), key=lambda job: job.finished)
+        expired = [job for job in finished if now - job.finished > self.job_ttl]
+        kept = [job for job in finished if now - job.finished <= self.job_ttl]
+        expired += kept[:max(0, len(kept) - self.max_finished_jobs)]
+        for job in expired:
+            del self._jobs[job.id]
+
+    def _shared_cache(self) -> EntityCache:
+        """Returns the shared cache, replacing it with an empty one once it is older than cache_ttl (jobs holding the old one keep it)."""
+        with self._lock:
+            if time.time() - self._cache_started > self.cache_ttl:
+                self.cache = EntityCache()
+                self._cache_started = time.time()
+            return self.cache
+
+    @staticmethod
+    def _enrich(job: _Job):
+        """Returns the enrich argument of a job's search: False, or enrich_user_data options that never clear the terminal."""
+        enrich = job.options.get("enrich", False)
+        if not enrich:
+            return False
+        return dict(enrich if isinstance(enrich, dict) else {}, clear_terminal=False)
+
+    def _runners(self) -> dict:
+        return {
+            "user_exact": lambda job: [user_search_exact(self.token, t, job.cache, enrich=self._enrich(job), budget=job.budget) for t in job.targets],
+            "user_multi": lambda job: user_search_multi(self.token, job.targets, job.cache, enrich=self._enrich(job), budget=job.budget),
+            "user_partial": lambda job: [user_search_partial(self.token, t, enrich=self._enrich(job), budget=job.budget, cache=job.cache) for t in job.targets],
+            "user_crawl": lambda job: [crawl_followership(self.token, t, depth=int(job.options.get("depth", 2)), cache=job.cache, budget=job.budget) for t in job.targets],
+            "author": self._run_author_search,
+            "org_info": lambda job: [organization_search_info(self.token, job.targets, job.cache, budget=job.budget)],
+            "org_intersection": lambda job: [organization_search_intersection(self.token, job.targets, job.cache, budget=job.budget)],
+            "repository": lambda job: [repository_search_info(self.token, job.targets, cache=job.cache, budget=job.budget)],
+        }
+
+    def _run_author_search(self, job: _Job) -> list:
+        max_commits = int(job.options.get("max_commits_per_repo", 1000))
+        for login, name, email, repo in iter_commit_authors(self.token, job.targets, max_commits, budget=job.budget):
+            job.emit([{"login": login, "name": name, "email": email, "repository": repo}])
+        return []
+
+    def _run(self, job: _Job) -> None:
+        deadline, max_points = job.options.get("deadline"), job.options.get("max_points")
+        if deadline or max_points:
+            job.budget = SearchBudget(float(deadline) if deadline else None, int(max_points) if max_points else None)
+        job.cache = EntityCache() if job.budget is not None else self._shared_cache()
+        job.status = "running"
+        try:
+            for records in self._runners()[job.mode](job):
+                job.emit(records or [])
+            job.finish("done")
+        except Exception as e:
+            job.finish("failed", f"{type(e).__name__}: {e}")
+
+def _handler(service: InvestigationService):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args): # Keeps the console for search progress output
+            pass
+
+        def _reply(self, status: int, body) -> None:
+            data = _dumps(body)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if urlparse(self.path).path.rstrip("/") != "/jobs":
+                return self._reply(404, {"error": "Not found"})
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                targets = request.get("targets") or ([request["target"]] if request.get("target") else [])
+                job = service.submit(request.get("mode"), targets, request.get("options"))
+            except (ValueError, KeyError) as e:
+                return self._reply(400, {"error": str(e)})
+            self._reply(202, {"job_id": job.id, "status": job.status})
+
+        def do_GET(self):
+            parts = [p for p in urlparse(self.path).path.split("/") if p]
+            if parts == ["jobs"]:
+                return self._reply(200, service.jobs())
+            if parts == ["stats"]:
+                return self._reply(200, service.stats())
+            if len(parts) >= 2 and parts[0] == "jobs":
+                job = service.job(parts[1])
+                if job is None:
+                    return self._reply(404, {"error": f"No job {parts[1]}"})
+                if len(parts) == 3 and parts[2] == "stream":
+                    return self._stream(job)
+                body = job.summary()
+                if job.status == "done":
+                    body["results"] = job.records
+                return self._reply(200, body)
+            self._reply(404, {"error": "Not found"})
+
+        def _stream(self, job: _Job) -> None:
+            # No Content-Length: the body is newline-delimited JSON ended by closing the connection
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            try:
+                for record in job.follow():
+                    self.wfile.write(_dumps(record) + b"\n")
+                    self.wfile.flush()
+                self.wfile.write(_dumps({"status": job.status, "error": job.error}) + b"\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return Handler
+
+def serve(token, host: str = "127.0.0.1", port: int = 8765, workers: int = 4) -> None:
+    """
+    Inputs: Personal access token (or TokenPool), bind address, port, and number of concurrent jobs.
+    Outputs: None (runs until interrupted).
+    Method: ThreadingHTTPServer in front of an InvestigationService job queue.
+    """
+    service = InvestigationService(token, workers=workers)
+    server = ThreadingHTTPServer((host, port), _handler(service))
+    print(f"Investigation service listening on http://{host}:{port} ({workers} concurrent jobs). Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
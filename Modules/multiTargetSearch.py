@@ -0,0 +1,138 @@
+# Modules/multiTargetSearch.py
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+from Utils.entityCache import EntityCache, resolve_cache
+from Utils.searchBudget import SearchBudget, mark_partial
+from .userSearch import user_search_exact
+from .targetEnrichment import enrich_user_data, enrichment_options
+from .stargazingAnalysis import analyze_stargazing
+
+## NOTES: Every target runs the Exact search on its own worker thread, but all of them share one EntityCache, so a follower common to
+## several targets has its stargazing fetched once (concurrent requesters wait on the request already in flight).
+## Results are merged into one row per login: 'targets' lists the targets whose network the user is in and 'targetRelations' holds the
+## relation to each ({target: "follower" | "following" | "mutual" | "target"}). 'relation' keeps the single relation when there is one,
+## otherwise the strongest ("target" > "mutual" > the rest, reported as "multiple").
+## The overlap report lists every follower, followed user, organization and starred repo owner shared by two or more targets.
+
+_RELATION_RANK = {"target": 3, "mutual": 2}
+
+def _merge_relation(relations: Dict[str, str]) -> str:
+    values = set(relations.values())
+    if len(values) == 1:
+        return values.pop()
+    best = max(values, key=lambda relation: _RELATION_RANK.get(relation, 0))
+    return best if best in _RELATION_RANK else "multiple"
+
+def merge_target_results(results_by_target: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Inputs: {target: records returned by user_search_exact for that target}.
+    Outputs: One record per login (targets first, in input order), annotated with 'targets' and 'targetRelations'.
+    Method: Records are merged by case-insensitive login; fields missing from the first record seen are filled from later ones.
+    """
+    merged: Dict[str, Dict] = {}
+    for target, records in results_by_target.items():
+        for record in records or []:
+            login = (record or {}).get("login")
+            if not login:
+                continue
+            key = login.lower()
+            row = merged.get(key)
+            if row is None:
+                row = merged[key] = dict(record, targets=[], targetRelations={})
+            else:
+                for field, value in record.items():
+                    if value and not row.get(field):
+                        row[field] = value
+            row["targets"].append(target)
+            row["targetRelations"][target] = record.get("relation")
+
+    for row in merged.values():
+        row["relation"] = _merge_relation(row["targetRelations"])
+    target_keys = [target.lower() for target in results_by_target]
+    return sorted(merged.values(), key=lambda row: target_keys.index(row["login"].lower()) if row["login"].lower() in target_keys else len(target_keys))
+
+def overlap_report(results_by_target: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Inputs: {target: records returned by user_search_exact for that target}.
+    Outputs: List of {"overlap", "item", "targets", "targetCount"} for every follower, followed user, organization (of the targets) and starred
+             repo owner (of the targets) shared by two or more targets, most shared first within each kind.
+    Method: Set membership per target, inverted into {item: targets}.
+    """
+    shared: Dict[str, Dict[str, set]] = {"follower": {}, "following": {}, "organization": {}, "starredOwner": {}}
+    for target, records in results_by_target.items():
+        for record in records or []:
+            login = (record or {}).get("login")
+            if not login:
+                continue
+            relation = record.get("relation")
+            if relation in ("follower", "mutual"):
+                shared["follower"].setdefault(login, set()).add(target)
+            if relation in ("following", "mutual"):
+                shared["following"].setdefault(login, set()).add(target)
+            if relation == "target":
+                for org in record.get("organizations") or []:
+                    shared["organization"].setdefault(org, set()).add(target)
+                for repo in record.get("stargazing") or []:
+                    owner = repo.split("/", 1)[0] if isinstance(repo, str) else None
+                    if owner and owner.lower() != login.lower():
+                        shared["starredOwner"].setdefault(owner, set()).add(target)
+
+    rows = []
+    for kind, items in shared.items():
+        overlapping = [(item, targets) for item, targets in items.items() if len(targets) >= 2]
+        overlapping.sort(key=lambda pair: (-len(pair[1]), pair[0].lower()))
+        rows.extend({"overlap": kind, "item": item, "targets": sorted(targets), "targetCount": len(targets)} for item, targets in overlapping)
+    return rows
+
+def pairwise_overlap(report: List[Dict], targets: List[str]) -> Dict[Tuple[str, str], Dict[str, int]]:
+    """Returns {(target a, target b): {overlap kind: shared items}} for every pair of targets, from an overlap report."""
+    pairs = {pair: {} for pair in combinations(targets, 2)}
+    for row in report:
+        for pair in combinations(targets, 2):
+            if pair[0] in row["targets"] and pair[1] in row["targets"]:
+                pairs[pair][row["overlap"]] = pairs[pair].get(row["overlap"], 0) + 1
+    return pairs
+
+def user_search_multi(
+    token,
+    targets: List[str],
+    cache: EntityCache = None,
+    enrich = None,
+    budget: SearchBudget = None,
+    workers: int = 4
+    ) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Inputs: GitHub usernames (logins), personal access token, an optional EntityCache shared by every target (defaults to the run cache),
+            whether to enrich (prompts when None; a dict passes enrich_user_data limits such as top_k), an optional SearchBudget shared by every target, and the number of targets searched at once.
+    Outputs: (merged records, one row per login (PartialResults if the budget ran out); overlap report rows).
+    Method: Concurrent user_search_exact per target on one shared cache, then merge_target_results, a cross-target stargazing analysis,
+            overlap_report and (optionally) one enrichment pass over the merged users, so shared users are scraped once.
+    Information (per User): Exact Search fields plus targets and targetRelations.
+    """
+    cache = resolve_cache(cache)
+    targets = list(dict.fromkeys(t for t in targets if t))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(targets)))) as pool:
+        futures = {target: pool.submit(user_search_exact, token, target, cache, False, budget) for target in targets}
+        results_by_target = {}
+        for target, future in futures.items():
+            try:
+                results_by_target[target] = future.result()
+            except Exception as e:
+                print(f"Error searching {target}: {e}")
+                results_by_target[target] = []
+
+    records = merge_target_results(results_by_target)
+    report = overlap_report(results_by_target)
+    repos = {repo for record in records for repo in record.get("stargazing") or []}
+    analyze_stargazing(records, {repo: cache.get("repoStargazers", repo) for repo in repos}) # Similarity across every target's network, not just within one
+
+    for (a, b), counts in pairwise_overlap(report, targets).items():
+        print(f"{a} & {b}: " + (", ".join(f"{count} shared {kind}" for kind, count in counts.items()) or "no overlap"))
+
+    options = enrichment_options(enrich)
+    if options is not None:
+        records = enrich_user_data(records, budget=budget, cache=cache, **options)
+
+    return mark_partial(records, budget), report
@@ -1,38 +1,34 @@
 # Modules/organizationSearch.py
-from Utils.queries import graphQL_build_bulk_user_query
 from Utils.organizationRequests import organization_info_request, organization_membership_request
-from Utils.userRequests import user_bulk_request
+from Utils.nodeRequests import hydrate_users
+from Utils.entityStore import default_store
+from Utils.entityCache import EntityCache, resolve_cache
+from Utils.searchBudget import SearchBudget, with_budget, mark_partial
 
-def organization_search_info(token: str, target_orgs: list) -> dict: # Add organization selection before return prompting for enrichment
+def organization_search_info(token: str, target_orgs: list, cache: EntityCache = None, budget: SearchBudget = None) -> dict: # Add organization selection before return prompting for enrichment
     """
-    Inputs: GitHub organization (login) and personal access token.
-    Outputs: Target org info, dictionary of members, list of followers.
-    Method: GitHub GraphQL API with pagination.
-    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
+    Inputs: GitHub organization (login), personal access token, an optional EntityCache (defaults to the run cache), and an optional SearchBudget.
+    Outputs: Target org info rows (with member and repository statistics), then one row per member (PartialResults if the budget ran out).
+    Method: GitHub GraphQL API with pagination; members are merged by login across the target orgs.
+    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs, organizations, organizationRoles.
     """
-    org_info = organization_info_request(token, target_orgs)
+    org_info = organization_info_request(with_budget(token, budget), target_orgs, cache)
     
-    return org_info
+    return mark_partial(org_info, budget)
 
-def organization_search_intersection(token: str, target_orgs: list):
+def organization_search_intersection(token: str, target_orgs: list, cache: EntityCache = None, budget: SearchBudget = None):
     """
-    Inputs: List of GitHub organizations (logins) and personal access token.
-    Outputs: List of users that are members of ~50% of the organization names in target_orgs.
-    Method: GitHub GraphQL API with pagination. Membership testing across multiple organizations.
+    Inputs: List of GitHub organizations (logins), personal access token, an optional EntityCache (defaults to the run cache), and an optional SearchBudget.
+    Outputs: List of users that are members of ~50% of the organization names in target_orgs (PartialResults if the budget ran out).
+    Method: GitHub GraphQL API with pagination. Membership testing across multiple organizations. Users already fetched in this run are served from the cache; users already stored are refreshed by node ID.
     Information (per User): Login, Name, Email, Bio, Location, Company, social
     """
+    cache = resolve_cache(cache)
+    token = with_budget(token, budget)
     users = organization_membership_request(token, target_orgs) # Fetches list of users that are members of at least (1/3 + 1) of the organizations (rounded up)
     #print(f"Users: {users}")
     
-    results = []
+    hydrated = cache.get_or_fetch_many("user", users, lambda logins: hydrate_users(token, logins, default_store().node_ids("user", logins)))
+    results = [hydrated[login] for login in users if hydrated.get(login)]
     
-    batch_size = 50
-    for i in range(0, len(users), batch_size):
-        user_batch = users[i:i+batch_size]
-        query = graphQL_build_bulk_user_query(user_batch)
-        #print(query)
-        
-        results += user_bulk_request(token, query)
-        print(results)
-        
-        return results
\ No newline at end of file
+    return mark_partial(results, budget)
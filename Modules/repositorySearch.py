@@ -0,0 +1,118 @@
+# Modules/repositorySearch.py
+from concurrent.futures import ThreadPoolExecutor
+
+from Utils.queries import graphQL_repository_info_query, graphQL_repository_stargazers_query, graphQL_repository_forks_query
+from Utils.repositoryRequests import repository_info_request, repository_connection_request, repository_contributors_request
+from Utils.userRequests import _normalize_user
+from Utils.nodeRequests import hydrate_users
+from Utils.entityStore import default_store
+from Utils.entityCache import EntityCache, resolve_cache
+from Utils.searchBudget import SearchBudget, with_budget, mark_partial
+
+## NOTES: Users are merged by login across all target repositories and all relations, so a user who starred three targets and
+## contributed to one appears once, with 'repoRelations' = {repo: {"stargazer", "contributor", ...}}.
+
+def _merge_user(users: dict, record: dict, repo: str, relation: str) -> dict:
+    login = record.get("login")
+    user = users.get(login)
+    if user is None:
+        user = users[login] = dict(record)
+        user["repositories"] = set()
+        user["repoRelations"] = {}
+        user["contributions"] = 0
+    else:
+        for key, value in record.items():
+            if isinstance(value, set):
+                user[key] = (user.get(key) or set()) | value
+            elif value and not user.get(key):
+                user[key] = value
+    user["repositories"].add(repo)
+    user["repoRelations"].setdefault(repo, set()).add(relation)
+    return user
+
+def repository_search_info(
+    token: str,
+    target_repos: list,
+    max_stargazers: int = 1000,
+    max_forks: int = 500,
+    max_contributors: int = 500,
+    workers: int = 8,
+    cache: EntityCache = None,
+    budget: SearchBudget = None
+    ) -> list:
+    """
+    Inputs: List of repositories ('owner/name'), personal access token, per-connection caps, number of concurrent workers, an optional EntityCache,
+            and an optional SearchBudget.
+    Outputs: List of repository info dicts followed by one merged dict per user related to any target repository (PartialResults if the budget ran out).
+    Method: Metadata, stargazers, forks and contributors of every repository are requested as independent tasks on one thread pool, so each
+            connection is paginated concurrently. Contributors (REST, login only) are hydrated with bulk GraphQL user queries through the cache.
+            Tasks are queued by priority (metadata of every repository, then contributors, stargazers, forks), so a cut-off budget keeps the most useful parts.
+    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs, repositories, relation per repository, contributions, forks owned.
+    """
+    cache = resolve_cache(cache)
+    token = with_budget(token, budget)
+    info_query = graphQL_repository_info_query()
+    stargazers_query = graphQL_repository_stargazers_query()
+    forks_query = graphQL_repository_forks_query()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        tasks = {}
+        for repo in target_repos:
+            tasks[(repo, "info")] = pool.submit(repository_info_request, token, info_query, repo)
+        for repo in target_repos:
+            tasks[(repo, "contributors")] = pool.submit(repository_contributors_request, token, repo, max_contributors)
+        for repo in target_repos:
+            tasks[(repo, "stargazers")] = pool.submit(repository_connection_request, token, stargazers_query, repo, "stargazers", max_stargazers)
+        for repo in target_repos:
+            tasks[(repo, "forks")] = pool.submit(repository_connection_request, token, forks_query, repo, "forks", max_forks)
+
+        results = {}
+        for (repo, part), future in tasks.items():
+            try:
+                results[(repo, part)] = future.result()
+            except Exception as e:
+                print(f"Error fetching {part} for {repo}: {e}")
+                results[(repo, part)] = None
+
+    output = []
+    users = {}
+    contributor_logins = []
+
+    for repo in target_repos:
+        info = results.get((repo, "info"))
+        if info:
+            output.append(info)
+
+        for node in results.get((repo, "stargazers")) or []:
+            user = _normalize_user(node)
+            cache.put("user", user["login"], user)
+            _merge_user(users, user, repo, "stargazer")
+
+        for fork in results.get((repo, "forks")) or []:
+            owner = fork.get("owner") or {}
+            if not owner.get("login"):
+                continue
+            user = _normalize_user(owner)
+            if "createdAt" in owner: # Only User owners carry profile fields; organization owners keep the login only
+                cache.put("user", user["login"], user)
+            merged = _merge_user(users, user, repo, "fork")
+            merged.setdefault("forks", set()).add(fork.get("nameWithOwner"))
+
+        for contributor in results.get((repo, "contributors")) or []:
+            if contributor.get("type") != "User":
+                continue
+            merged = _merge_user(users, {"login": contributor["login"]}, repo, "contributor")
+            merged["contributions"] += contributor.get("contributions") or 0
+            contributor_logins.append(contributor["login"])
+
+    # Contributors only come with a login; their profiles are hydrated once each (and not at all if already known this run; by node ID if already stored)
+    profiles = cache.get_or_fetch_many("user", contributor_logins, lambda logins: hydrate_users(token, logins, default_store().node_ids("user", logins)))
+    for login, profile in profiles.items():
+        if profile:
+            user = users[login]
+            for key, value in profile.items():
+                if key not in user or (value and not user.get(key)):
+                    user[key] = value
+
+    output.extend(users.values())
+    return mark_partial(output, budget)
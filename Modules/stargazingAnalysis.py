@@ -0,0 +1,178 @@
+# Modules/stargazingAnalysis.py
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from typing import Dict, List, Optional, Tuple
+
+## NOTES: Accounts run by the same person tend to star the same (often obscure) repositories. Every user's 'stargazing' list is loaded
+## into one binary user × repo CSR matrix; X @ X.T then gives the number of shared stars for every pair of users in one sparse product,
+## and Jaccard similarity follows from the row degrees. Only pairs sharing at least min_shared repos are kept, so the result stays sparse.
+## Clusters are the connected components of the pairs above a similarity threshold.
+## Over-representation compares how many of the network's users starred a repo with the repo's total stargazerCount: a repo with 40
+## stars of which 6 come from the target's network says much more than a repo with 200k stars starred by 20 of them. When stargazer
+## counts are unknown (e.g. stargazing served from an older cache entry), the network share is used instead; the two shares are not
+## comparable, so those repos are ranked after every repo with a known total.
+
+def build_star_matrix(users: List[Dict]) -> Tuple[sparse.csr_matrix, List[str], List[str]]:
+    """
+    Inputs: User dicts carrying user['stargazing'] (list of nameWithOwner).
+    Outputs: Binary float32 CSR matrix (users × repos), the row logins and the column repo names.
+    Method: Repo names are mapped to column IDs in one pass; duplicates within a user are collapsed by the binary conversion.
+    """
+    logins, rows, cols = [], [], []
+    repo_ids: Dict[str, int] = {}
+    for user in users:
+        if not user or not user.get("login"):
+            continue
+        row = len(logins)
+        logins.append(user["login"])
+        for repo in user.get("stargazing") or []:
+            if isinstance(repo, str) and repo:
+                rows.append(row)
+                cols.append(repo_ids.setdefault(repo, len(repo_ids)))
+
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+                               shape=(len(logins), len(repo_ids)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix, logins, list(repo_ids)
+
+def user_similarity(matrix: sparse.csr_matrix, min_shared: int = 2) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """
+    Inputs: Binary user × repo matrix and the minimum number of shared repos for a pair to be kept.
+    Outputs: (Jaccard similarity, shared-repo counts) as symmetric CSR matrices with an empty diagonal.
+    Method: Sparse product X @ X.T for the shared counts, then |A ∩ B| / (|A| + |B| - |A ∩ B|) on the stored entries only.
+    """
+    shared = (matrix @ matrix.T).tocoo()
+    degrees = np.asarray(matrix.sum(axis=1)).ravel()
+    keep = (shared.row != shared.col) & (shared.data >= min_shared)
+    rows, cols, counts = shared.row[keep], shared.col[keep], shared.data[keep]
+    jaccard = counts / (degrees[rows] + degrees[cols] - counts)
+    shape = (matrix.shape[0], matrix.shape[0])
+    return (sparse.csr_matrix((jaccard.astype(np.float32), (rows, cols)), shape=shape),
+            sparse.csr_matrix((counts.astype(np.int32), (rows, cols)), shape=shape))
+
+def top_similar(similarity: sparse.csr_matrix, shared: sparse.csr_matrix, logins: List[str], k: int = 5) -> Dict[str, List[Tuple[str, float, int]]]:
+    """Returns {login: [(other login, jaccard, shared repos), ...]} with each user's k most similar users, most similar first."""
+    result = {}
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        values, columns = similarity.data[start:end], similarity.indices[start:end]
+        order = np.argsort(-values, kind="stable")[:k]
+        counts = shared[row, columns[order]].toarray().ravel()
+        result[logins[row]] = [(logins[c], round(float(v), 3), int(n)) for c, v, n in zip(columns[order], values[order], counts)]
+    return result
+
+def shared_repo_clusters(
+    matrix: sparse.csr_matrix,
+    similarity: sparse.csr_matrix,
+    logins: List[str],
+    repos: List[str],
+    min_similarity: float = 0.2,
+    top_repos: int = 10
+    ) -> List[Dict]:
+    """
+    Inputs: Binary user × repo matrix, its Jaccard similarity matrix, row logins, column repo names, the similarity threshold, and repos listed per cluster.
+    Outputs: List of clusters {"cluster", "members", "sharedRepos"} (two or more members), largest first.
+    Method: Connected components of the thresholded similarity graph; a cluster's shared repos are the columns starred by the most members.
+    """
+    linked = similarity.multiply(similarity >= min_similarity).tocsr()
+    linked.eliminate_zeros()
+    count, labels = connected_components(linked, directed=False)
+    sizes = np.bincount(labels, minlength=count)
+
+    clusters = []
+    for label in np.argsort(-sizes, kind="stable"):
+        if sizes[label] < 2:
+            break
+        members = np.flatnonzero(labels == label)
+        repo_counts = np.asarray(matrix[members].sum(axis=0)).ravel()
+        best = [c for c in np.argsort(-repo_counts, kind="stable")[:top_repos] if repo_counts[c] >= 2]
+        clusters.append({
+            "cluster": len(clusters) + 1,
+            "members": [logins[m] for m in members],
+            "sharedRepos": [(repos[c], int(repo_counts[c])) for c in best],
+        })
+    return clusters
+
+def overrepresented_repos(
+    matrix: sparse.csr_matrix,
+    repos: List[str],
+    stargazer_counts: Optional[Dict[str, int]] = None,
+    exclude_owner: str = None,
+    min_users: int = 2,
+    top: int = 25
+    ) -> List[Dict]:
+    """
+    Inputs: Binary user × repo matrix, column repo names, optional {repo: stargazerCount}, an owner whose own repos are skipped (the target),
+            the minimum number of network users starring a repo, and the number of repos returned.
+    Outputs: List of {"repository", "networkStargazers", "stargazerCount", "networkShare"}: repos with a known stargazerCount, most
+             over-represented first, followed by repos whose total is unknown (stargazerCount None), ranked the same way.
+    Method: Column sums give the network stargazers per repo; networkShare divides them by the repo's total stargazers (or by the number of
+            users in the network when the total is unknown).
+    """
+    network_counts = np.asarray(matrix.sum(axis=0)).ravel()
+    stargazer_counts = stargazer_counts or {}
+    totals = np.array([stargazer_counts.get(repo) or 0 for repo in repos], dtype=np.float64)
+    known = totals > 0
+    share = np.where(known, network_counts / np.maximum(totals, 1), network_counts / max(matrix.shape[0], 1))
+    eligible = network_counts >= min_users
+    if exclude_owner:
+        prefix = f"{exclude_owner.lower()}/"
+        eligible &= np.array([not repo.lower().startswith(prefix) for repo in repos], dtype=bool)
+
+    candidates = np.flatnonzero(eligible)
+    # The two shares measure different things, so they are ranked separately: repos with a known total first (by share of their
+    # stargazers), then repos with an unknown total (by share of the network); ties are broken by network count
+    order = candidates[np.lexsort((-network_counts[candidates], -share[candidates], ~known[candidates]))][:top]
+    return [{
+        "repository": repos[c],
+        "networkStargazers": int(network_counts[c]),
+        "stargazerCount": int(totals[c]) if known[c] else None,
+        "networkShare": round(float(min(share[c], 1.0)), 4),
+    } for c in order]
+
+def analyze_stargazing(
+    users: List[Dict],
+    stargazer_counts: Optional[Dict[str, int]] = None,
+    min_shared: int = 2,
+    min_similarity: float = 0.2,
+    top_k: int = 5,
+    annotate: bool = True
+    ) -> Dict:
+    """
+    Inputs: User dicts with user['stargazing'] (the target first), optional {repo: stargazerCount}, pair/cluster thresholds, similar users
+            listed per user, and whether to write the results into the user dicts.
+    Outputs: {"similar": {login: [...]}, "clusters": [...], "overrepresented": [...]}.
+    Method: build_star_matrix → user_similarity → top_similar / shared_repo_clusters / overrepresented_repos.
+    Information (per User, when annotating): user["stargazingSimilar"] (list of "login (jaccard, shared)"), user["stargazingCluster"] (int).
+    Information (Target): user["overrepresentedRepos"] (list of "owner/name (network/total)").
+    """
+    matrix, logins, repos = build_star_matrix(users)
+    if matrix.nnz == 0:
+        return {"similar": {}, "clusters": [], "overrepresented": []}
+
+    similarity, shared = user_similarity(matrix, min_shared)
+    similar = top_similar(similarity, shared, logins, top_k)
+    clusters = shared_repo_clusters(matrix, similarity, logins, repos, min_similarity)
+    target = users[0].get("login") if users and users[0] else None
+    overrepresented = overrepresented_repos(matrix, repos, stargazer_counts, exclude_owner=target)
+    print(f"Stargazing analysis: {len(logins)} users × {len(repos)} repos, {similarity.nnz // 2} similar pairs, {len(clusters)} clusters.")
+
+    if annotate:
+        cluster_of = {login: cluster["cluster"] for cluster in clusters for login in cluster["members"]}
+        for user in users:
+            login = (user or {}).get("login")
+            if not login:
+                continue
+            user["stargazingSimilar"] = [f"{other} ({jaccard}, {count})" for other, jaccard, count in similar.get(login, [])]
+            user["stargazingCluster"] = cluster_of.get(login)
+        if target:
+            users[0]["overrepresentedRepos"] = [
+                f"{row['repository']} ({row['networkStargazers']}/{row['stargazerCount'] if row['stargazerCount'] is not None else '?'})"
+                for row in overrepresented
+            ]
+
+    return {"similar": similar, "clusters": clusters, "overrepresented": overrepresented}
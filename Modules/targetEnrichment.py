@@ -1,16 +1,36 @@
 # Modules/targetEnrichment.py
-import os, requests, lxml, time
+import os, lxml, sqlite3, time
+import numpy as np
 from bs4 import BeautifulSoup
 from tldextract import extract
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
+from Utils.sendRequests import fetch_page
+from Utils.userRequests import _as_set
+from Utils.pipeline import staged_map
+from Utils.linkResolver import resolve_user_links
+from Utils.pageArchive import PageArchive, default_archive, resolve_archive
+from Utils.entityCache import EntityCache
+from Utils.menus import enrichment_menu, enrichment_limits_menu
+from .confidenceScoring import score_users, prune_for_enrichment
 
 ## NOTES: I did not implement an Inclusion or Exclusion Sets for URLs to prevent over-filtering.
 ## An Inclusion Set would inevitably filter out relevant URLs for lesser-known, foreign, and emerging platforms.
 ## An Inclusion Set could never reliably include all freelancer platforms.
 ## An Exclusion Set would require constant updating and maintenance to remain effective.
 
-## CONSIDERED FOR FUTURE UPDATES:
-## 1) Exclude results based on subsequent call to confidence scoring module (to be developed).
+## Enrichment is prioritized and can be stopped early: users are scraped in enrichment_priority order (target first, then mutuals,
+## followed users and followers, users shared by several targets / organizations, users without a known email), and a run can stop
+## after top_k users or time_budget seconds. Each user records user["enrichment"] ("enriched", "failed" or "pending"); calling
+## resume_enrichment on the same records later enriches only the pending users (or chosen logins), in the same order.
+## With min_confidence, candidates scoring below it (Modules/confidenceScoring.py: prune_for_enrichment) are not scraped at all and are
+## marked "skipped"; the target is always kept. resume_enrichment with a lower (or no) min_confidence picks them up again.
+
+## Every fetched profile page is kept in the page archive (Utils/pageArchive.py). enrich_from_archive re-runs _parse_profile over the
+## archived pages without any request, and enrich_user_data(max_archive_age=...) serves recently archived pages instead of re-scraping.
+
+RELATION_PRIORITY = {"target": 100.0, "mutual": 3.0, "multiple": 2.5, "following": 2.0, "follower": 1.0}
+PRIORITY_WEIGHTS = {"overlap": 1.0, "missing_email": 1.5, "confidence": 1.0} # overlap: log1p(targets + organizations)
 
 def _normalize_url(url: str) -> str:
     """
@@ -25,100 +45,245 @@ def _normalize_url(url: str) -> str:
         normal_url = normal_url.replace("www.", "")
     return normal_url
 
-def enrich_user_data(users: list, base_url="https://github.com/", start_time: float = None) -> list:
+def _fetch_profile(login: str, base_url: str = "https://github.com/") -> str:
     """
-    Inputs: users (login) and a GitHub base URL. #Accepts lists of users when called in a for loop from followership.py.
-    Outputs: Appends email addresses and social media links identified in a user's Readme file to user["email"] and user["links"] for each input user.
-    Method: Scraping the anchor tags found on a GitHub user's Readme/Profile page. Only external links are collected
-    Information (per User): user["email"] (list), user["links"] (list)
+    Inputs: User login and a GitHub base URL.
+    Outputs: HTML of the user's profile page.
+    Method: GET through Utils/sendRequests.fetch_page (pooled session, shared retry policy). Runs on the pipeline's I/O threads.
     """
-    '''Scrapes a GitHub user's profile page to extract their achievements.'''
+    return fetch_page(f"{base_url}{login}", "profilePage").text
+
+def _parse_profile(html: str) -> tuple:
+    """
+    Inputs: HTML of a GitHub profile page.
+    Outputs: (profile achievements, email addresses, external links) as sets.
+    Method: BeautifulSoup (lxml) scrape of the achievement badges and anchor tags. Runs in the pipeline's worker processes, so it must stay module-level.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    
+    #PROFILE ACHIEVEMENTS
+    profile_achievements = set(el['alt'][13:] for el in soup.select('.border-top.color-border-muted.pt-3.mt-3.d-none.d-md-block [alt]'))
+    
+    #HYPERLINKS TO SOCIAL MEDIA AND EMAIL ADDRESSES
+    emails, links = set(), set()
+    for a_tag in soup.select('a[href]'):
+        href = a_tag['href']
+    
+        # Skip empty hrefs
+        if not href:
+            continue
+    
+        # Skip non-navigational hrefs quickly
+        if href[0] == ('#') or href[:4] == 'java':
+            continue
+    
+        # Handle mailto early and cheaply
+        if href[:7] == 'mailto:':
+            emails.add(href[7:])
+            continue
+    
+        parsed_url = urlparse(href).netloc
     
-    print(type(users),": ", users)
+        #Relative links are internal (achievements are read from the badges above)
+        if not parsed_url:
+            continue
+    
+        # Compare base domain only when needed
+        base = extract(parsed_url).domain
+        if "github" in base:
+            continue
+        links.add(href)
+    
+    return profile_achievements, emails, links
+
+def _apply_profile(user: Dict, parsed: tuple) -> None:
+    """Merges the (achievements, emails, links) parsed from a profile page into the user dict."""
+    profile_achievements, emails, links = parsed
+    user["achievements"] = profile_achievements
+    user['emails'] = set(user.get("emails") or ()) | emails # Start with any emails from upstream
+    
+    # Merge scraped links into any socialAccounts from upstream data, normalized to eliminate erroneous duplicates
+    social_accounts = _as_set(user.get("socialAccounts")) | links
+    user['socialAccounts'] = {_normalize_url(url) for url in social_accounts}
+    user["enrichment"] = "enriched"
+
+def enrichment_priority(users: List[Dict], weights: Dict[str, float] = None) -> np.ndarray:
+    """
+    Inputs: List of user dicts and optional weights ({"overlap", "missing_email", "confidence"}).
+    Outputs: float32 array of enrichment priorities aligned with users (higher is enriched first).
+    Method: Relation rank (RELATION_PRIORITY) + weighted cheap signals: targets / organizations shared, no known email (the profile page
+            is most likely to add one), and the confidence score (Modules/confidenceScoring.py) as a tie-breaker.
+    """
+    if not users:
+        return np.zeros(0, dtype=np.float32)
+    weights = {**PRIORITY_WEIGHTS, **(weights or {})}
+    relation = np.array([RELATION_PRIORITY.get(user.get("relation"), 0.0) for user in users], dtype=np.float32)
+    overlap = np.log1p(np.array([len(user.get("targets") or []) + len(user.get("organizations") or []) for user in users], dtype=np.float32))
+    missing_email = np.array([not (user.get("emails") or user.get("email")) for user in users], dtype=np.float32)
+    confidence = score_users(users, annotate=False)
+    return relation + weights["overlap"] * overlap + weights["missing_email"] * missing_email + weights["confidence"] * confidence
+
+def enrichment_options(enrich) -> Optional[Dict]:
+    """
+    Inputs: The enrich argument of a search: None (prompt with enrichment_menu), True / False, or a dict of enrich_user_data options (e.g. {"top_k": 50}).
+    Outputs: None when enrichment is skipped, otherwise the keyword options for enrich_user_data.
+    """
+    if enrich is None:
+        choice = enrichment_menu()
+        if choice == "2":
+            return None
+        if choice == "3":
+            top_k, time_budget, min_confidence = enrichment_limits_menu()
+            return {"top_k": top_k, "time_budget": time_budget, "min_confidence": min(min_confidence, 100) / 100 if min_confidence else None}
+        return {}
+    if isinstance(enrich, dict):
+        return enrich
+    return {} if enrich else None
+
+def enrich_user_data(
+    users: list,
+    base_url="https://github.com/",
+    start_time: float = None,
+    budget = None,
+    fetch_workers: int = 8,
+    parse_workers: int = None,
+    resolve_links: bool = True,
+    top_k: int = None,
+    time_budget: float = None,
+    logins: List[str] = None,
+    archive: PageArchive = None,
+    max_archive_age: float = None,
+    clear_terminal: bool = True,
+    cache: EntityCache = None,
+    min_confidence: float = None
+    ) -> list:
+    """
+    Inputs: users (login), a GitHub base URL, an optional SearchBudget, the number of fetching threads / parsing processes, whether to resolve links,
+            optional limits: the number of users to enrich (top_k), seconds to spend (time_budget), and the only logins to enrich, the PageArchive
+            fetched pages are kept in (defaults to the default archive; False disables archiving), and the age in seconds up to which an archived page
+            is used instead of a new fetch (None: always fetch), whether to clear the terminal first (False in service mode), and the search's EntityCache
+            link resolutions are kept in (defaults to one private to this call), and the confidence score (0-1) below which users are not enriched. #Accepts lists of users when called in a for loop from followership.py.
+    Outputs: Appends email addresses and social media links identified in a user's Readme file to user["emails"] and user["socialAccounts"] for each input user.
+    Method: Scraping the anchor tags found on a GitHub user's Readme/Profile page. Only external links are collected.
+            Pages are fetched on threads while earlier pages are parsed in worker processes (Utils/pipeline.staged_map), with a bounded number of pages in flight.
+            Fetched pages are archived as they arrive. Users not enriched yet are taken in enrichment_priority order until top_k users are started, time_budget passes, or the SearchBudget runs out;
+            the rest are marked "pending" and returned as they are (see resume_enrichment). Users below min_confidence are pruned first and marked "skipped".
+            Links of the users enriched in this call are then resolved to their final destinations (Utils/linkResolver.py).
+    Information (per User): user["achievements"] (set), user["emails"] (set), user["socialAccounts"] (set), user["resolvedLinks"], user["linkPlatforms"], user["deadLinks"],
+                            user["enrichment"] ("enriched", "failed", "pending", or "skipped"), user["confidence"] (when min_confidence is given)
+    """
+    '''Scrapes a GitHub user's profile page to extract their achievements.'''
     
     if type(users) is str: # For handling test inputs
         user = users
         del users
         users = [{"login": user}]
     
-    #TARGET URL CONSTRUCTION
-    for i, user in enumerate(users):
-        achievements = set()
-        
+    wanted = {login.lower() for login in logins} if logins is not None else None
+    candidates = [i for i, user in enumerate(users) if user and user.get("login") and user.get("enrichment") != "enriched"
+                  and (wanted is None or user["login"].lower() in wanted)]
+    if min_confidence is not None: # Low-confidence users are not worth a scrape; the target is always kept
+        kept, skipped = prune_for_enrichment([users[i] for i in candidates], min_confidence=min_confidence)
+        for user in skipped:
+            user["enrichment"] = "skipped"
+        kept = {id(user) for user in kept}
+        candidates = [i for i in candidates if id(users[i]) in kept]
+    priorities = enrichment_priority([users[i] for i in candidates])
+    order = [candidates[i] for i in (-priorities).argsort(kind="stable")][:top_k]
+    for index in candidates:
+        users[index]["enrichment"] = "pending"
+    
+    if clear_terminal:
         os.system('cls' if os.name == 'nt' else 'clear')
-        print(f"ENRICHING USER: {user['login']} ({i+1} of {len(users)})")
-        
-        emails = set(user.get("emails", {}))  # Start with any emails from upstream
-        
-        # Seed links with any existing links or socialAccounts from upstream data
-        social_accounts = set(user.get("socialAccounts", {}))
-        
-        login = user['login']
-        target_url = f"{base_url}{login}"
-        
-        #ADDS PROFILE ACHIEVEMENTS TO USER DICT
-        try:
-            response = requests.get(target_url, timeout=120)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            #PROFILE ACHIEVEMENTS
-            profile_achievements = set(el['alt'][13:] for el in soup.select('.border-top.color-border-muted.pt-3.mt-3.d-none.d-md-block [alt]'))
-            user["achievements"] = profile_achievements
-        
-        except Exception as e:
-            print(f"Error: {e}")
-            return None
-        
-        #ADDS HYPERLINKS TO SOCIAL MEDIA AND EMAIL ADDRESSES TO USER DICT
-        try:
-            for a_tag in soup.select('a[href]'):
-                href = a_tag['href']
-                
-                # Skip empty hrefs
-                if not href:
-                    continue
-                
-                # Skip non-navigational hrefs quickly
-                if href[0] == ('#') or href[:4] == 'java':
-                    continue
-                
-                # Handle mailto early and cheaply
-                if href[:7] == 'mailto:':
-                    emails.add(href[7:])
-                    continue
-                
-                parsed_url = urlparse(href).netloc
-                
-                #Identifies Relative links
-                if not parsed_url:
-                    # Relative link → internal; check for achievements directly
-                    if 'achievement=' in href:
-                        val = href.split('achievement=')[1]
-                        if '&' in val:
-                            val = val.split('&')[0]
-                        achievements.add(val)
-                    continue
-                
-                # Compare base domain only when needed
-                base = extract(parsed_url).domain
-                if "github" in base:
-                    continue
-                
-                else:
-                    social_accounts.add(href)
-        
-        except Exception as e:
-            print(f"Error: {e}")
-            return None
-        
-        user['emails'] = emails
-        
-        if user.get('socialAccounts'):
-            existing_socials = set(user["socialAccounts"])
-            normalized_socials = {_normalize_url(url) for url in existing_socials}
-            user['socialAccounts'] = normalized_socials
+    print(f"ENRICHING {len(order)} OF {len(candidates)} USERS...")
+    
+    started = time.monotonic()
+    keep_going = lambda: (budget is None or not budget.exhausted) and (time_budget is None or time.monotonic() - started < time_budget)
+    use_processes = len(order) >= 8 # Worker start-up costs more than it saves for a handful of pages
+    archive = resolve_archive(archive)
+    
+    def fetch(index):
+        login = users[index]['login']
+        if archive is not None and max_archive_age is not None:
+            archived = archive.latest(login, max_archive_age)
+            if archived:
+                return archived[1]
+        html = _fetch_profile(login, base_url)
+        if archive is not None:
+            try:
+                archive.put(login, f"{base_url}{login}", html)
+            except (OSError, sqlite3.Error) as e: # Archiving is best effort; the page is still parsed
+                print(f"Could not archive the profile page of {login}: {e}")
+        return html
+    
+    enriched = []
+    
+    for index, parsed, error in staged_map(order, fetch, _parse_profile, fetch_workers=fetch_workers, parse_workers=parse_workers,
+                                           use_processes=use_processes, keep_going=keep_going):
+        user = users[index]
+        enriched.append(user)
+        if error is not None:
+            print(f"Error enriching {user['login']}: {error}")
+            user["enrichment"] = "failed"
+            continue
+    
+        _apply_profile(user, parsed)
+        print(f"ENRICHED USER: {user['login']} ({len(enriched)} of {len(order)})")
+    
+    pending = len(candidates) - len(enriched)
+    if pending:
+        print(f"{pending} users left pending enrichment (resume_enrichment enriches them later).")
+    
+    # Follows every collected link to its final destination and records liveness and platform
+    if resolve_links:
+        resolve_user_links(enriched, cache=cache if cache is not None else EntityCache(), budget=budget)
+    
+    return users
+
+def resume_enrichment(users: list, logins: List[str] = None, top_k: int = None, time_budget: float = None, budget = None, **kwargs) -> list:
+    """
+    Inputs: Records returned by an earlier (limited) enrichment, optional logins to enrich on demand, the same limits as enrich_user_data, and its other options.
+    Outputs: The same records, with the next pending users (or the requested logins) enriched.
+    Method: enrich_user_data skips users already marked "enriched", so only pending and failed users are scraped, highest priority first.
+    """
+    return enrich_user_data(users, budget=budget, top_k=top_k, time_budget=time_budget, logins=logins, **kwargs)
+
+def enrich_from_archive(users: list, archive: PageArchive = None, logins: List[str] = None, parse_workers: int = None, resolve_links: bool = False,
+                        cache: EntityCache = None) -> list:
+    """
+    Inputs: User dicts, the PageArchive to read (defaults to the default archive), optional logins to restrict to, parsing processes, whether to resolve links,
+            and the EntityCache link resolutions are kept in (defaults to one private to this call).
+    Outputs: The same users; those with an archived page are enriched from its most recent version (user["archivedAt"] holds its fetch time).
+    Method: Archived pages are read and decompressed on threads and parsed with _parse_profile in worker processes (Utils/pipeline.staged_map),
+            so extraction rules can be re-run over everything scraped before without sending a request.
+    """
+    archive = archive or default_archive()
+    wanted = {login.lower() for login in logins} if logins is not None else None
+    order = [i for i, user in enumerate(users) if user and user.get("login") and (wanted is None or user["login"].lower() in wanted)]
+    fetched_at = {}
+    
+    def read(index):
+        archived = archive.latest(users[index]["login"])
+        if archived is None:
+            raise LookupError("no archived page")
+        fetched_at[index] = archived[0]
+        return archived[1]
+    
+    started = time.perf_counter()
+    enriched, missing = [], 0
+    for index, parsed, error in staged_map(order, read, _parse_profile, parse_workers=parse_workers, use_processes=len(order) >= 8):
+        if error is not None:
+            missing += isinstance(error, LookupError)
+            if not isinstance(error, LookupError):
+                print(f"Error re-extracting {users[index]['login']}: {error}")
+            continue
+        _apply_profile(users[index], parsed)
+        users[index]["archivedAt"] = fetched_at[index]
+        enriched.append(users[index])
+    print(f"Re-extracted {len(enriched)} archived profiles in {time.perf_counter() - started:.1f} seconds ({missing} users have no archived page).")
     
+    if resolve_links:
+        resolve_user_links(enriched, cache=cache if cache is not None else EntityCache())
     return users
 
 if __name__ == '__main__':
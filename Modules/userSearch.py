@@ -1,121 +1,151 @@
 # Modules/userSearch.py
 import requests, time
+from urllib.parse import quote
 
-from Utils.queries import graphQL_user_exact_query, graphQL_build_partial_user_query, graphQL_build_stargazing_query, graphQL_build_stargazing_query, graphQL_repo_insights_query
+from Utils.queries import graphQL_user_exact_query, graphQL_build_partial_user_query, graphQL_build_stargazing_query, graphQL_repo_insights_query
 from Utils.userRequests import user_exact_request, user_partial_request, starred_repos_request, repo_insights_request
-from Utils.menus import enrichment_menu
 from Utils.dataTransformations import compare_repo_insights
-from .targetEnrichment import enrich_user_data
+from Utils.entityCache import EntityCache, resolve_cache
+from Utils.sendRequests import send_rest
+from Utils.searchBudget import SearchBudget, BudgetExhausted, with_budget, mark_partial
+from .targetEnrichment import enrich_user_data, enrichment_options
+from .confidenceScoring import score_users
+from .stargazingAnalysis import analyze_stargazing
 
-def user_search_exact(token: str, target_user: str): # Add user selection before return prompting for enrichment.
+def _fetch_stargazing(token: str, logins: list, batch_size: int = 5, repo_stars: dict = None) -> dict:
     """
-    Inputs: GitHub username (login) and personal access token.
-    Outputs: Target user profile dict, list of following, list of followers.
-    Method: GitHub GraphQL API with pagination.
-    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
+    Inputs: Personal access token, list of user logins, and an optional dict filled with {nameWithOwner: stargazerCount} of every starred repo seen.
+    Outputs: Dict of {login: [nameWithOwner of each starred repo]}.
+    Method: Batched GraphQL requests (batch_size aliases per query); transient failures are retried by Utils/retryPolicy.py.
     """
-    query = graphQL_user_exact_query(target_user) # Fetch the GraphQL query string
-    variables = {
-        "login": target_user,
-        "pageSize": 100,
-        "socialSize": 10,
-        "followingCursor": None,
-        "followersCursor": None,
-        "max_following": 250,
-        "max_followers": 250
-    }
-    target_user, followership = user_exact_request(token, query, variables)
-    
-    # ================== BATCHED STARGAZING ENRICHMENT =====================
+    stargazing_by_login = {}
     
-    # Collect all user logins to enrich (excluding None logins)
-    all_users = target_user + followership
-    all_user_logins = [user for user in all_users if user.get('login')]
-    batch_size = 5
-    
-    for i in range(0, len(all_user_logins), batch_size):
-        batch = all_user_logins[i:i+batch_size]
-        logins = [user['login'] for user in batch]
+    for i in range(0, len(logins), batch_size):
+        batch = logins[i:i+batch_size]
         
         # Build the GraphQL query for this batch
-        query = graphQL_build_stargazing_query(logins)
+        query, variables = graphQL_build_stargazing_query(batch)
         
-        # Send the GraphQL request for this batch with retry logic
-        if i+batch_size < len(all_user_logins):
-            print(f"Requesting stargazing data for users: {i+batch_size} of {len(all_user_logins)}")
+        # Send the GraphQL request for this batch
+        if i+batch_size < len(logins):
+            print(f"Requesting stargazing data for users: {i+batch_size} of {len(logins)}")
         else:
-            print(f"Requesting stargazing data for users: {len(all_user_logins)} of {len(all_user_logins)}")
+            print(f"Requesting stargazing data for users: {len(logins)} of {len(logins)}")
         
-        max_retries = 3
-        attempt = 0
         result = None
-        
-        while attempt < max_retries:
-            try:
-                result = starred_repos_request(token, query)
-                break  # Success, exit retry loop
-            
-            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as ce:
-                attempt += 1
-                print(f"Connection error during stargazing request (attempt {attempt}): {ce}")
-                
-                if attempt < max_retries:
-                    print("Waiting 15 seconds before retrying...")
-                    time.sleep(15)
-                    
-                else:
-                    print("Max retries reached. Skipping this batch.")
-                    result = {}
-                    
+        try:
+            result = starred_repos_request(token, query, variables) # Retries and backoff are handled by Utils/retryPolicy.py
+
+        except BudgetExhausted:
+            print("Search budget reached. Skipping the remaining stargazing batches.")
+            return stargazing_by_login
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Stargazing request failed after retries: {e}. Skipping this batch.")
+
         # For each user in the batch, extract their stargazing repos
-        for idx, user in enumerate(batch):
+        for idx, login in enumerate(batch):
             user_key = f'user{idx}'
-            user_data = result.get('data', {}).get(user_key, {}) if result else {}
+            user_data = (result.get('data') or {}).get(user_key) or {} if result else {}
             stargazing = []
             
             try:
                 starred = user_data.get('starredRepositories', {})
                 nodes = starred.get('nodes', [])
                 stargazing = [repo.get('nameWithOwner') for repo in nodes if repo.get('nameWithOwner')]
+                if repo_stars is not None:
+                    repo_stars.update((repo['nameWithOwner'], repo.get('stargazerCount')) for repo in nodes if repo.get('nameWithOwner'))
             
             except Exception:
                 pass
             
-            user['stargazing'] = stargazing
+            stargazing_by_login[login] = stargazing
         
         # Sleep to mitigate rate limiting
         time.sleep(1)
     
+    return stargazing_by_login
+
+def user_search_exact(token: str, target_user: str, cache: EntityCache = None, enrich = None, budget: SearchBudget = None): # Add user selection before return prompting for enrichment.
+    """
+    Inputs: GitHub username (login), personal access token, an optional EntityCache (defaults to the run cache), whether to enrich (prompts when None; a dict passes enrich_user_data limits such as top_k),
+            and an optional SearchBudget (deadline / API points).
+    Outputs: Target user profile dict, list of following, list of followers (PartialResults if the budget ran out).
+    Method: GitHub GraphQL API with pagination. Under a budget, work is done in priority order: target profile and followership, target repo insights,
+            stargazing of the highest-confidence users first, then enrichment in priority order (Modules/targetEnrichment.enrichment_priority). Stargazing is compared across users (Modules/stargazingAnalysis.py).
+    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs, stargazing-similar users and cluster.
+    """
+    query = graphQL_user_exact_query(target_user) # Fetch the GraphQL query string
+    variables = {
+        "login": target_user,
+        "pageSize": 100,
+        "socialSize": 10,
+        "followingCursor": None,
+        "followersCursor": None,
+        "max_following": 250,
+        "max_followers": 250
+    }
+    cache = resolve_cache(cache)
+    token = with_budget(token, budget)
+    target_user, followership = user_exact_request(token, query, variables, cache)
+    if target_user[0] is None: # Unknown login, or the budget ran out before the first page
+        return mark_partial([], budget)
+    
+    # Collect all user logins to enrich (excluding None logins)
+    all_users = target_user + followership
+    
     # For the target_user, adds contextual repo insights based on users that forked and starred target_user-owned repos
     forked_users, starred_users = repo_insights_request(token, all_users[0].get('login'))
     repo_insights = compare_repo_insights(forked_users, starred_users)
     all_users[0]['repo_insights'] = repo_insights
     
-    enrich = enrichment_menu()
+    # ================== BATCHED STARGAZING ENRICHMENT =====================
+    
+    all_user_logins = [user for user in all_users if user.get('login')]
+    if budget is not None: # Highest-signal connections first, so a cut-off budget still covers the most useful users
+        scores = score_users(all_user_logins[1:], annotate=False)
+        all_user_logins = all_user_logins[:1] + [all_user_logins[1:][i] for i in (-scores).argsort(kind="stable")]
+    
+    # Logins already fetched (or being fetched) in this run are served from the cache; only the rest are requested
+    repo_stars = {}
+    stargazing = cache.get_or_fetch_many(
+        "stargazing",
+        [user['login'] for user in all_user_logins],
+        lambda logins: _fetch_stargazing(token, logins, repo_stars=repo_stars)
+    )
+    for user in all_user_logins:
+        user['stargazing'] = stargazing.get(user['login']) or []
     
-    if enrich == "1":
-        e_users = enrich_user_data(all_users)
-        return e_users
+    # Stargazer totals outlive this search in the cache, so stargazing served from the cache can still be compared against them
+    for repo, count in repo_stars.items():
+        cache.put("repoStargazers", repo, count)
+    repos = {repo for user in all_user_logins for repo in user['stargazing']}
+    analyze_stargazing(all_user_logins, {repo: cache.get("repoStargazers", repo) for repo in repos})
+    
+    options = enrichment_options(enrich) # None: skip; otherwise enrich_user_data limits (top_k, time_budget)
+    
+    if options is not None:
+        e_users = enrich_user_data(all_users, budget=budget, cache=cache, **options)
+        return mark_partial(e_users, budget)
     
     else:
-        return all_users
+        return mark_partial(all_users, budget)
 #=============================================================================================
 
-def user_search_partial(token: str, target_user: str) -> dict:
+def user_search_partial(token: str, target_user: str, enrich = None, budget: SearchBudget = None, cache: EntityCache = None) -> dict:
     """
-    Inputs: GitHub username substring (login) and personal access token.
-    Outputs: Target user dict + Partial match user dicts.
+    Inputs: GitHub username substring (login), personal access token, whether to enrich (prompts when None; a dict passes enrich_user_data limits such as top_k), an optional SearchBudget,
+            and an optional EntityCache (defaults to the run cache; used for link resolution during enrichment).
+    Outputs: Target user dict + Partial match user dicts (PartialResults if the budget ran out).
     Method: GitHub GraphQL API with pagination.
     Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
     """
-    url = f"https://api.github.com/search/users?q={target_user}+in:login&per_page=100"
-    headers = {"Accept": "application/vnd.github+json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    
-    users = response.json()
+    token = with_budget(token, budget)
+    url = f"/search/users?q={quote(target_user)}+in:login&per_page=100"
+    try:
+        _, users = send_rest(token, url, "searchUsers")
+    except BudgetExhausted:
+        return mark_partial([], budget)
     
     logins = []
     for user in users.get("items", []):
@@ -125,19 +155,19 @@ def user_search_partial(token: str, target_user: str) -> dict:
             continue
     #print(f"users: {logins}")
     
-    query = graphQL_build_partial_user_query(logins)
-    variables = {
-        "pageSize": 100,
-        "socialSize": 10
-    }
-    results = user_partial_request(token, query, variables)
+    query, variables = graphQL_build_partial_user_query(logins)
+    variables["socialSize"] = 10
+    try:
+        results = user_partial_request(token, query, variables)
+    except BudgetExhausted:
+        return mark_partial([], budget)
     #print(results)
     
-    enrich = enrichment_menu()
+    options = enrichment_options(enrich) # None: skip; otherwise enrich_user_data limits (top_k, time_budget)
     
-    if enrich == "1":
-        e_users = enrich_user_data(results)
-        return e_users
+    if options is not None:
+        e_users = enrich_user_data(results, budget=budget, cache=resolve_cache(cache), **options)
+        return mark_partial(e_users, budget)
     
     else:
-        return results
\ No newline at end of file
+        return mark_partial(results, budget)
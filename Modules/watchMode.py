@@ -0,0 +1,210 @@
+# Modules/watchMode.py
+import os, json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from Utils.queries import WATCH_CONNECTIONS, graphQL_build_watch_query
+from Utils.sendRequests import send_graphql
+
+## NOTES: One JSON snapshot per watched target holds, per connection, its totalCount and its entities newest-first.
+## A refresh first pages each connection with small pages only until it meets an entity already in the snapshot. If the snapshot's
+## entities plus the new ones account for the current totalCount, nothing was removed and the refresh is done for that connection;
+## otherwise (removals, or a connection GitHub does not order newest-first) that connection alone is re-fetched in full and diffed.
+## Targets without a snapshot get a full baseline fetch on their first refresh (reported as a baseline, not as additions).
+## Connections larger than max_items are snapshotted up to the cap ('truncated'); for those only additions are reported.
+
+WATCH_DIR = Path(os.getenv("GITHUB_INVESTIGATION_WATCH_DIR") or Path.home() / "Downloads" / "GitHubInvestigationWatch")
+TARGET_KINDS = tuple(WATCH_CONNECTIONS)
+
+def _snapshot_path(kind: str, target: str) -> Path:
+    return WATCH_DIR / f"{kind}_{target.lower().replace('/', '__')}.json"
+
+def load_snapshot(kind: str, target: str) -> dict:
+    path = _snapshot_path(kind, target)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_snapshot(snapshot: dict) -> None:
+    WATCH_DIR.mkdir(parents=True, exist_ok=True)
+    path = _snapshot_path(snapshot["kind"], snapshot["target"])
+    temp = path.with_suffix(".tmp")
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    temp.replace(path) # Atomic, so an interrupted refresh never leaves a half-written snapshot
+
+def tracked_targets() -> List[Tuple[str, str]]:
+    """Returns (kind, target) for every target with a snapshot."""
+    targets = []
+    for path in sorted(WATCH_DIR.glob("*.json")) if WATCH_DIR.exists() else []:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        targets.append((snapshot["kind"], snapshot["target"]))
+    return targets
+
+def untrack(kind: str, target: str) -> bool:
+    """Deletes a target's snapshot. Returns True if it was tracked."""
+    path = _snapshot_path(kind, target)
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+class _ConnectionState:
+    """Paging state of one connection of one target during a refresh."""
+    def __init__(self, known: dict, full: bool, max_items: int):
+        self.known = known # Previous snapshot entry ({"total", "items", "truncated"}) or None
+        self.known_items = set(known["items"]) if known else set()
+        self.full = full
+        self.max_items = max_items
+        self.cursor = None
+        self.active = True
+        self.items = [] # Full mode: every entity; incremental mode: entities not in the snapshot
+        self.total = None
+        self.truncated = False
+
+    def restart_full(self) -> None:
+        self.full, self.cursor, self.active, self.items, self.truncated = True, None, True, [], False
+
+    def consume(self, connection: dict) -> None:
+        self.total = connection.get("totalCount")
+        page_info = connection.get("pageInfo") or {}
+        reached_known = False
+        for node in connection.get("nodes") or []:
+            item = next(iter(node.values()), None) if node else None
+            if not item:
+                continue
+            if not self.full and item in self.known_items:
+                reached_known = True
+                break
+            self.items.append(item)
+        self.cursor = page_info.get("endCursor")
+        at_cap = len(self.items) >= self.max_items
+        self.truncated = self.full and at_cap and bool(page_info.get("hasNextPage"))
+        self.active = bool(page_info.get("hasNextPage")) and not reached_known and not at_cap
+
+    def reconciled(self) -> bool:
+        """True when an incremental pass fully explains the current totalCount (no removals, nothing missed)."""
+        if self.full:
+            return True
+        if self.known.get("truncated"):
+            return True # Only additions can be detected for capped connections
+        return self.total == len(self.known["items"]) + len(self.items)
+
+def _page_batch(token, kind: str, batch: List[Tuple[str, Dict[str, _ConnectionState]]], page_size: int) -> None:
+    """Pages every active connection of a batch of same-kind targets through one aliased query per round trip."""
+    query, target_variables = graphQL_build_watch_query(kind, [target for target, _ in batch])
+    while any(state.active for _, states in batch for state in states.values()):
+        variables = dict(target_variables, pageSize=page_size)
+        for i, (_, states) in enumerate(batch):
+            for name, state in states.items():
+                variables[f"{name}Cursor{i}"] = state.cursor
+                variables[f"with_{name}{i}"] = state.active
+
+        payload = send_graphql(token, query, variables)
+        data = payload.get("data") or {}
+        for i, (target, states) in enumerate(batch):
+            node = data.get(f"target{i}")
+            for name, state in states.items():
+                if not state.active:
+                    continue
+                if node is None or node.get(name) is None:
+                    print(f"Could not resolve {kind} '{target}' ({name}); skipping it this refresh.")
+                    state.active, state.total = False, None
+                    continue
+                state.consume(node[name])
+
+def _run_phase(token, kind: str, work: List[Tuple[str, Dict[str, _ConnectionState]]], page_size: int, batch_size: int, workers: int) -> None:
+    batches = [work[i:i+batch_size] for i in range(0, len(work), batch_size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_page_batch, token, kind, batch, page_size) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error refreshing a batch of {kind} targets: {e}")
+                for _, states in batch: # A partly paged connection must not be diffed (it would report false removals)
+                    for state in states.values():
+                        state.active, state.total = False, None
+
+def refresh_targets(
+    token,
+    targets: List[Tuple[str, str]] = None,
+    batch_size: int = 10,
+    incremental_page_size: int = 20,
+    max_items: int = 20_000,
+    workers: int = 4
+    ) -> List[Dict]:
+    """
+    Inputs: Personal access token (or TokenPool), (kind, target) pairs to refresh (kind: "user", "organization" or "repository"; defaults to every
+            tracked target; untracked targets start being tracked), targets per aliased query, page size of the incremental pass, per-connection
+            cap, and number of concurrent batches.
+    Outputs: List of change rows {"kind", "target", "connection", "change", "item", "detectedAt"} where change is "added", "removed" or "baseline".
+    Method: Incremental pass (first pages only, until known entities are met) for every tracked connection, full re-fetch only of connections
+            whose totalCount is not explained by that pass, then a set diff against the snapshot. Snapshots are updated in place.
+    """
+    targets = list(dict.fromkeys(targets or tracked_targets()))
+    detected_at = datetime.now().isoformat(timespec="seconds")
+    work_by_kind: Dict[str, list] = {}
+    snapshots = {}
+
+    for kind, target in targets:
+        snapshot = load_snapshot(kind, target)
+        snapshots[(kind, target)] = snapshot
+        previous = (snapshot or {}).get("connections", {})
+        states = {name: _ConnectionState(previous.get(name), previous.get(name) is None, max_items) for name in WATCH_CONNECTIONS[kind]}
+        work_by_kind.setdefault(kind, []).append((target, states))
+
+    # Pass 1: incremental pages for known connections, full fetch for new ones
+    for kind, work in work_by_kind.items():
+        print(f"Refreshing {len(work)} {kind} targets...")
+        _run_phase(token, kind, work, incremental_page_size, batch_size, workers)
+
+    # Pass 2: full re-fetch of the connections whose counts do not reconcile
+    refetched = 0
+    for kind, work in work_by_kind.items():
+        unreconciled = []
+        for target, states in work:
+            pending = {name: state for name, state in states.items() if state.total is not None and not state.reconciled()}
+            for state in pending.values():
+                state.restart_full()
+            if pending:
+                unreconciled.append((target, pending))
+                refetched += len(pending)
+        if unreconciled:
+            _run_phase(token, kind, unreconciled, 100, batch_size, workers)
+
+    rows = []
+    for kind, work in work_by_kind.items():
+        for target, states in work:
+            snapshot = snapshots[(kind, target)] or {"kind": kind, "target": target, "created": detected_at, "connections": {}}
+            for name, state in states.items():
+                if state.total is None: # Target or connection could not be resolved; keep the previous snapshot
+                    continue
+                known = state.known
+                if known is None:
+                    rows.extend({"kind": kind, "target": target, "connection": name, "change": "baseline", "item": item, "detectedAt": detected_at} for item in state.items)
+                    current = state.items
+                elif state.full:
+                    current_set = set(state.items)
+                    rows.extend({"kind": kind, "target": target, "connection": name, "change": "added", "item": item, "detectedAt": detected_at}
+                                for item in state.items if item not in state.known_items)
+                    if not state.truncated:
+                        rows.extend({"kind": kind, "target": target, "connection": name, "change": "removed", "item": item, "detectedAt": detected_at}
+                                    for item in known["items"] if item not in current_set)
+                    current = state.items
+                else:
+                    rows.extend({"kind": kind, "target": target, "connection": name, "change": "added", "item": item, "detectedAt": detected_at} for item in state.items)
+                    current = state.items + known["items"]
+                snapshot["connections"][name] = {"total": state.total, "items": current[:max_items], "truncated": state.truncated or bool(known and known.get("truncated") and not state.full)}
+            if not snapshot["connections"]:
+                continue # Never resolved: not tracked
+            snapshot["updated"] = detected_at
+            _save_snapshot(snapshot)
+
+    changes = sum(1 for row in rows if row["change"] != "baseline")
+    print(f"Refreshed {len(targets)} targets: {changes} changes, {refetched} connections re-fetched in full.")
+    return rows
@@ -0,0 +1,49 @@
+# Utils/bloomFilter.py
+import hashlib, math, threading
+
+## NOTES: Used as the visited set of crawlers, where millions of logins may be seen. A false positive means a login is treated as
+## already visited and skipped; the false positive rate is configurable and is the only accuracy cost of the compact bitset.
+
+class BloomFilter:
+    """
+    Thread-safe Bloom filter over a bytearray bitset.
+    Bit positions are derived from one blake2b digest per item (Kirsch-Mitzenmacher double hashing).
+    """
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.001):
+        expected_items = max(1, expected_items)
+        self.bit_count = max(8, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / expected_items * math.log(2)))
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """
+        Inputs: Item (string).
+        Outputs: True if the item was newly added, False if it was (probably) already present.
+        Method: Sets the item's bits under a lock so check-and-add is atomic across crawler threads.
+        """
+        positions = self._positions(item)
+        with self._lock:
+            new = False
+            for p in positions:
+                mask = 1 << (p & 7)
+                if not self._bits[p >> 3] & mask:
+                    self._bits[p >> 3] |= mask
+                    new = True
+            if new:
+                self.count += 1
+            return new
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
@@ -97,4 +97,20 @@ def compare_repo_insights(forked_users: list, starred_users: list) -> list:
         
         repo_insights.append([login, {'relation': relation}, {'count': count}])
     
-    return repo_insights
\ No newline at end of file
+    return repo_insights
+
+def author_identity_rows(identities: dict) -> list:
+    """
+    Inputs: Dict of {login: {(fullname, email), ...}} (Author Search output).
+    Outputs: List of dicts, one per login, with the sets of names and emails used in commits.
+    Method: Unzipping each login's identity set.
+    Information (per Login): Login (None for commits without a linked account), names, emails.
+    """
+    rows = []
+    for login, pairs in identities.items():
+        rows.append({
+            "login": login,
+            "names": {name for name, _ in pairs if name},
+            "emails": {email for _, email in pairs if email}
+        })
+    return rows
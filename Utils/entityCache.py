@@ -0,0 +1,158 @@
+# Utils/entityCache.py
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+## NOTES: Entities are keyed by (kind, key), e.g. ("user", "octocat"), ("organization", "github"), ("stargazing", "octocat").
+## A None value is cached as well so that logins/orgs that do not resolve are not re-requested within the same run, but only when
+## the fetch reports it (an explicit None for the key): keys a fetch left out, e.g. because the search budget ran out first, stay
+## uncached and are fetched again by the next requester.
+## Readers get copies (get, get_or_fetch, get_or_fetch_many): callers annotate and merge into the records they are handed, and must not
+## alter the entity other searches in the run (or the service's shared cache) are served. Copies are one level deep: a record's own
+## fields and its set/list/dict values are new objects, nested records inside those containers are still shared.
+
+def _copy(value: Any) -> Any:
+    """Returns a copy of a cached value, with new containers for a dict's set/list/dict fields."""
+    if isinstance(value, dict):
+        return {k: v.copy() if isinstance(v, (dict, list, set)) else v for k, v in value.items()}
+    if isinstance(value, (list, set)):
+        return value.copy()
+    return value
+
+class EntityCache:
+    """
+    Per-run, thread-safe store of entities already fetched from GitHub.
+    Fetches that are in progress are registered as Futures, so concurrent requesters of the same entity wait on
+    the one request already in flight instead of sending their own (singleflight deduplication).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, Any] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: tuple) -> bool:
+        return item in self._entries
+
+    def get(self, kind: str, key: Hashable, default: Any = None) -> Any:
+        """Returns a copy of the cached entity or default (does not wait on in-flight fetches)."""
+        return _copy(self._entries.get((kind, key), default))
+
+    def put(self, kind: str, key: Hashable, value: Any) -> Any:
+        """
+        Inputs: Entity kind, key and value.
+        Outputs: A copy of the value now stored in the cache.
+        Method: Dict values are merged into an existing dict entry (new non-empty fields win, sets are unioned) so that
+        partial records from different queries (e.g. org member rows vs. follower nodes) accumulate into one entity.
+        """
+        return _copy(self._put(kind, key, value))
+
+    def _put(self, kind: str, key: Hashable, value: Any) -> Any:
+        value = _copy(value) # Callers annotating their own record (e.g. 'relation', emails) must not alter the cached entity
+        with self._lock:
+            existing = self._entries.get((kind, key))
+            if isinstance(existing, dict) and isinstance(value, dict):
+                merged = dict(existing)
+                for k, v in value.items():
+                    if isinstance(v, set) and isinstance(merged.get(k), set):
+                        merged[k] = merged[k] | v
+                    elif v not in (None, "", [], {}, set()) or k not in merged:
+                        merged[k] = v
+                value = merged
+            self._entries[(kind, key)] = value
+            return value
+
+    def get_or_fetch(self, kind: str, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Inputs: Entity kind, key and a zero-argument fetch callable.
+        Outputs: The cached entity, the result of an in-flight fetch for the same key, or the result of fetch().
+        Method: Singleflight; only the first requester of a missing key calls fetch(), later requesters wait on its Future.
+        """
+        return self.get_or_fetch_many(kind, [key], lambda keys: {keys[0]: fetch()})[key]
+
+    def get_or_fetch_many(
+        self,
+        kind: str,
+        keys: Iterable[Hashable],
+        fetch_many: Callable[[List[Hashable]], Dict[Hashable, Any]]
+        ) -> Dict[Hashable, Any]:
+        """
+        Inputs: Entity kind, keys and a callable that fetches a list of keys and returns {key: entity}.
+        Outputs: Dict of {key: copy of entity} for every requested key (None for keys that do not resolve or were not fetched).
+        Method: Keys are split into cached, in flight (owned by another requester) and missing. Only the missing keys are
+        passed to fetch_many, in one call, so batched GraphQL queries stay batched. fetch_many reports keys that do not resolve with
+        a None value (cached as not found); keys it leaves out were not attempted and are not cached.
+        """
+        results: Dict[Hashable, Any] = {}
+        waiting: Dict[Hashable, Future] = {}
+        owned: Dict[Hashable, Future] = {}
+
+        with self._lock:
+            for key in dict.fromkeys(keys): # Preserves order while removing duplicate keys
+                entry_key = (kind, key)
+                if entry_key in self._entries:
+                    results[key] = self._entries[entry_key]
+                    self.hits += 1
+                elif entry_key in self._inflight:
+                    waiting[key] = self._inflight[entry_key]
+                    self.hits += 1
+                else:
+                    future = Future()
+                    self._inflight[entry_key] = future
+                    owned[key] = future
+                    self.misses += 1
+
+        if owned:
+            try:
+                fetched = fetch_many(list(owned)) or {}
+            except BaseException as e:
+                with self._lock:
+                    for key, future in owned.items():
+                        self._inflight.pop((kind, key), None)
+                        future.set_exception(e)
+                raise
+
+            for key, future in owned.items():
+                if fetched.get(key) is not None:
+                    value = self._put(kind, key, fetched[key])
+                elif key in fetched:
+                    value = self._store_missing(kind, key)
+                else:
+                    value = None # Not attempted (e.g. budget spent): left out of the cache
+                with self._lock:
+                    self._inflight.pop((kind, key), None)
+                future.set_result(value)
+                results[key] = value
+
+        for key, future in waiting.items():
+            results[key] = future.result()
+
+        return {key: _copy(value) for key, value in results.items()}
+
+    def _store_missing(self, kind: str, key: Hashable) -> None:
+        with self._lock:
+            self._entries.setdefault((kind, key), None)
+            return self._entries[(kind, key)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entities": len(self._entries), "inflight": len(self._inflight), "hits": self.hits, "misses": self.misses}
+
+run_cache = EntityCache() # Shared by every request function in a run unless a cache is passed explicitly
+
+def reset_run_cache() -> EntityCache:
+    """Empties the shared run cache (called at the start of each search from main.py)."""
+    run_cache.clear()
+    return run_cache
+
+def resolve_cache(cache: Optional[EntityCache]) -> EntityCache:
+    return run_cache if cache is None else cache
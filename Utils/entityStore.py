@@ -0,0 +1,364 @@
+# Utils/entityStore.py
+import os, json, sqlite3, threading, time
+from typing import Dict, Iterable, List, Optional
+
+## NOTES: Local SQLite store shared by every investigation. Each search's normalized records are upserted into entity tables
+## (users, organizations, repositories) and typed edge tables (follows, stars, members, forks), and every entity a run returned is
+## recorded in run_entities, so cross-investigation questions are answered from indexes without new API calls.
+## Entity columns only ever fill in: a later run that lacks a field (e.g. a login-only contributor) never blanks a stored value.
+## Every address a user has listed is also kept, lower-cased, in user_emails (one row per login and address), so email lookups are
+## indexed equality matches rather than substring scans of the comma-joined emails column.
+## The full record is also kept as JSON (sets become sorted lists) for fields that have no column of their own.
+## Edges are derived the same way as Utils/relationshipGraph.py's add_records, plus repository search relations and crawl parents.
+
+DEFAULT_DB_PATH = os.getenv("GITHUB_INVESTIGATION_DB") or os.path.join(os.path.expanduser("~"), "Downloads", "GitHubInvestigation.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_mode TEXT, search_method TEXT, target TEXT, started REAL
+);
+CREATE TABLE IF NOT EXISTS users (
+    login TEXT PRIMARY KEY COLLATE NOCASE,
+    node_id TEXT, name TEXT, emails TEXT, location TEXT, company TEXT, bio TEXT, created_at TEXT, social_accounts TEXT,
+    data TEXT, first_seen REAL, last_seen REAL
+);
+CREATE TABLE IF NOT EXISTS organizations (
+    login TEXT PRIMARY KEY COLLATE NOCASE,
+    node_id TEXT, name TEXT, email TEXT, location TEXT, website_url TEXT, created_at TEXT,
+    data TEXT, first_seen REAL, last_seen REAL
+);
+CREATE TABLE IF NOT EXISTS repositories (
+    name_with_owner TEXT PRIMARY KEY COLLATE NOCASE,
+    node_id TEXT, owner TEXT COLLATE NOCASE, stars INTEGER, forks INTEGER, created_at TEXT,
+    data TEXT, first_seen REAL, last_seen REAL
+);
+CREATE TABLE IF NOT EXISTS follows (
+    follower TEXT COLLATE NOCASE, followee TEXT COLLATE NOCASE, last_run INTEGER,
+    PRIMARY KEY (follower, followee)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stars (
+    login TEXT COLLATE NOCASE, repository TEXT COLLATE NOCASE, last_run INTEGER,
+    PRIMARY KEY (login, repository)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS members (
+    login TEXT COLLATE NOCASE, organization TEXT COLLATE NOCASE, role TEXT, last_run INTEGER,
+    PRIMARY KEY (login, organization)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS forks (
+    login TEXT COLLATE NOCASE, repository TEXT COLLATE NOCASE, fork TEXT, last_run INTEGER,
+    PRIMARY KEY (login, repository)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS run_entities (
+    run_id INTEGER, kind TEXT, name TEXT COLLATE NOCASE,
+    PRIMARY KEY (run_id, kind, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS follows_by_followee ON follows (followee, follower);
+CREATE INDEX IF NOT EXISTS stars_by_repository ON stars (repository, login);
+CREATE INDEX IF NOT EXISTS members_by_organization ON members (organization, login);
+CREATE INDEX IF NOT EXISTS forks_by_repository ON forks (repository, login);
+CREATE INDEX IF NOT EXISTS run_entities_by_name ON run_entities (kind, name, run_id);
+CREATE INDEX IF NOT EXISTS runs_by_mode ON runs (search_mode, search_method);
+CREATE INDEX IF NOT EXISTS users_by_name ON users (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS repositories_by_owner ON repositories (owner);
+"""
+
+_NODE_ID_INDEXES = """
+CREATE INDEX IF NOT EXISTS users_by_node_id ON users (node_id);
+CREATE INDEX IF NOT EXISTS organizations_by_node_id ON organizations (node_id);
+CREATE INDEX IF NOT EXISTS repositories_by_node_id ON repositories (node_id);
+"""
+
+_USER_EMAILS = """
+CREATE TABLE IF NOT EXISTS user_emails (
+    login TEXT COLLATE NOCASE, email TEXT,
+    PRIMARY KEY (login, email)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS user_emails_by_email ON user_emails (email, login);
+"""
+
+# Entity table and key column, and the edge columns that reference each entity kind (used for node ID lookups and renames)
+_ENTITY_TABLES = {"user": ("users", "login"), "organization": ("organizations", "login"), "repository": ("repositories", "name_with_owner")}
+_ENTITY_REFERENCES = {
+    "user": (("follows", "follower"), ("follows", "followee"), ("stars", "login"), ("members", "login"), ("forks", "login"), ("user_emails", "login")),
+    "organization": (("members", "organization"),),
+    "repository": (("stars", "repository"), ("forks", "repository")),
+}
+
+_RUN_FIELDS = ("relation", "hop", "parent", "identityCluster", "possibleAliases", "targets", "targetRelations") # Relative to one run's target; kept as edges, not as entity data
+
+def _to_json(value):
+    return sorted(value, key=str) if isinstance(value, (set, frozenset)) else str(value)
+
+def _dumps(value) -> Optional[str]:
+    return json.dumps(value, default=_to_json) if value not in (None, "", set(), [], {}) else None
+
+def _joined(value) -> Optional[str]:
+    if not value:
+        return None
+    return value if isinstance(value, str) else ", ".join(sorted(str(v) for v in value))
+
+def _emails(value) -> List[str]:
+    """Normalized (trimmed, lower-case) addresses of an email field: a set/list of addresses or a comma-joined string."""
+    if not value:
+        return []
+    addresses = value.split(",") if isinstance(value, str) else value
+    return sorted({str(email).strip().lower() for email in addresses if email and str(email).strip()})
+
+def _record_kind(record: Dict) -> str:
+    if "nameWithOwner" in record:
+        return "repository"
+    if "websiteUrl" in record or "isVerified" in record: # Organization info rows (organization search)
+        return "organization"
+    return "user"
+
+class EntityStore:
+    """
+    SQLite-backed store of every user, organization and repository collected across runs, with indexed follow/star/member/fork edges.
+    Safe to share between threads (one connection guarded by a lock).
+    """
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Adds columns introduced after a database was created (CREATE TABLE IF NOT EXISTS leaves existing tables as they are)."""
+        for table in ("organizations", "repositories"):
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if "node_id" not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN node_id TEXT")
+        self._conn.executescript(_NODE_ID_INDEXES)
+        if not self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_emails'").fetchone():
+            self._conn.executescript(_USER_EMAILS)
+            with self._conn: # Backfill from the comma-joined emails column of databases created before the table existed
+                self._conn.executemany("INSERT OR IGNORE INTO user_emails VALUES (?, ?)", [
+                    (login, email) for login, emails in self._conn.execute("SELECT login, emails FROM users WHERE emails IS NOT NULL").fetchall()
+                    for email in _emails(emails)
+                ])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ================== WRITES =====================
+
+    def ingest(self, records: Iterable[Dict], search_info: dict = None, target: str = None) -> int:
+        """
+        Inputs: Normalized records from any search mode, the search info dict (search_mode/search_method), and the target string.
+        Outputs: run_id of the recorded run.
+        Method: One transaction: entity rows are upserted (fields only fill in), edges are derived from each record's relationship fields
+                and upserted with the run that last saw them, and every returned entity is attached to the run.
+        """
+        search_info = search_info or {}
+        now = time.time()
+        users, orgs, repos = [], [], []
+        follows, stars, members, forks, seen = set(), set(), {}, {}, set()
+        target_login = target if search_info.get("search_mode") == "user" else None
+
+        for record in records:
+            if not record:
+                continue
+            kind = _record_kind(record)
+            if kind == "repository":
+                repos.append(record)
+                seen.add(("repository", record["nameWithOwner"]))
+                continue
+            login = record.get("login")
+            if not login:
+                continue
+            if kind == "organization":
+                orgs.append(record)
+                seen.add(("organization", login))
+                continue
+            users.append(record)
+            seen.add(("user", login))
+
+            # Followership relative to the target, to the parent the crawler discovered the user through, or to each target of a multi-target search
+            for anchor, relation in (record.get("targetRelations") or {record.get("parent") or target_login: record.get("relation")}).items():
+                if anchor and relation in ("follower", "mutual"):
+                    follows.add((login, anchor))
+                if anchor and relation in ("following", "mutual"):
+                    follows.add((anchor, login))
+
+            for repo in record.get("stargazing") or []:
+                if isinstance(repo, str) and repo:
+                    stars.add((login, repo))
+            roles = record.get("organizationRoles") or {}
+            for org in record.get("organizations") or []:
+                if org:
+                    members[(login, org)] = roles.get(org)
+            for repo, relations in (record.get("repoRelations") or {}).items():
+                if "stargazer" in relations:
+                    stars.add((login, repo))
+                if "fork" in relations:
+                    forks.setdefault((login, repo), None)
+            for fork in record.get("forks") or []:
+                for repo in record.get("repositories") or []:
+                    if (login, repo) in forks and fork and fork.split("/", 1)[-1] == repo.split("/", 1)[-1]:
+                        forks[(login, repo)] = fork
+            for insight in record.get("repo_insights") or []:
+                other, relation_info = insight[0], insight[1].get("relation", "")
+                if "forked" in relation_info:
+                    forks.setdefault((other, f"{login}/*"), None)
+                if "starred" in relation_info:
+                    stars.add((other, f"{login}/*"))
+
+        with self._lock, self._conn:
+            run_id = self._conn.execute(
+                "INSERT INTO runs (search_mode, search_method, target, started) VALUES (?, ?, ?, ?)",
+                (search_info.get("search_mode"), search_info.get("search_method"), target, now)
+            ).lastrowid
+            self._conn.executemany("""
+                INSERT INTO users (login, node_id, name, emails, location, company, bio, created_at, social_accounts, data, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(login) DO UPDATE SET
+                    node_id = COALESCE(excluded.node_id, node_id), name = COALESCE(excluded.name, name),
+                    emails = COALESCE(excluded.emails, emails), location = COALESCE(excluded.location, location),
+                    company = COALESCE(excluded.company, company), bio = COALESCE(excluded.bio, bio),
+                    created_at = COALESCE(excluded.created_at, created_at), social_accounts = COALESCE(excluded.social_accounts, social_accounts),
+                    data = COALESCE(json_patch(data, excluded.data), excluded.data, data), last_seen = excluded.last_seen
+                """, [(
+                    u["login"], u.get("id"), u.get("name") or _joined(u.get("names")), _joined(u.get("emails") or u.get("email")),
+                    u.get("location"), u.get("company"), u.get("bio"), u.get("createdAt"), _joined(u.get("socialAccounts")),
+                    _dumps({k: v for k, v in u.items() if k not in _RUN_FIELDS and v not in (None, "", set(), [], {})}), now, now
+                ) for u in users])
+            self._conn.executemany("INSERT OR IGNORE INTO user_emails VALUES (?, ?)",
+                                   [(u["login"], email) for u in users for email in _emails(u.get("emails") or u.get("email"))])
+            self._conn.executemany("""
+                INSERT INTO organizations (login, node_id, name, email, location, website_url, created_at, data, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(login) DO UPDATE SET
+                    node_id = COALESCE(excluded.node_id, node_id), name = COALESCE(excluded.name, name), email = COALESCE(excluded.email, email), location = COALESCE(excluded.location, location),
+                    website_url = COALESCE(excluded.website_url, website_url), created_at = COALESCE(excluded.created_at, created_at),
+                    data = COALESCE(excluded.data, data), last_seen = excluded.last_seen
+                """, [(o["login"], o.get("id"), o.get("name"), o.get("email"), o.get("location"), o.get("websiteUrl"), o.get("createdAt"), _dumps(o), now, now) for o in orgs])
+            self._conn.executemany("""
+                INSERT INTO repositories (name_with_owner, node_id, owner, stars, forks, created_at, data, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name_with_owner) DO UPDATE SET
+                    node_id = COALESCE(excluded.node_id, node_id), owner = COALESCE(excluded.owner, owner), stars = COALESCE(excluded.stars, stars), forks = COALESCE(excluded.forks, forks),
+                    created_at = COALESCE(excluded.created_at, created_at), data = COALESCE(excluded.data, data), last_seen = excluded.last_seen
+                """, [(
+                    r["nameWithOwner"], r.get("id"), r.get("owner") or r["nameWithOwner"].split("/")[0], r.get("stargazerCount"), r.get("forkCount"),
+                    r.get("createdAt"), _dumps(r), now, now
+                ) for r in repos])
+
+            self._conn.executemany("INSERT INTO follows VALUES (?, ?, ?) ON CONFLICT DO UPDATE SET last_run = excluded.last_run",
+                                   [(a, b, run_id) for a, b in follows])
+            self._conn.executemany("INSERT INTO stars VALUES (?, ?, ?) ON CONFLICT DO UPDATE SET last_run = excluded.last_run",
+                                   [(a, b, run_id) for a, b in stars])
+            self._conn.executemany("""INSERT INTO members VALUES (?, ?, ?, ?) ON CONFLICT DO UPDATE SET
+                                   role = COALESCE(excluded.role, role), last_run = excluded.last_run""",
+                                   [(login, org, role, run_id) for (login, org), role in members.items()])
+            self._conn.executemany("""INSERT INTO forks VALUES (?, ?, ?, ?) ON CONFLICT DO UPDATE SET
+                                   fork = COALESCE(excluded.fork, fork), last_run = excluded.last_run""",
+                                   [(login, repo, fork, run_id) for (login, repo), fork in forks.items()])
+            self._conn.executemany("INSERT OR IGNORE INTO run_entities VALUES (?, ?, ?)", [(run_id, kind, name) for kind, name in seen])
+        return run_id
+
+    def rename(self, kind: str, old: str, new: str) -> None:
+        """
+        Inputs: Entity kind ("user", "organization", "repository"), the stored name, and the entity's current name.
+        Outputs: None. The entity row and every edge and run reference move to the new name (merged into it if the new name is already stored).
+        """
+        table, key = _ENTITY_TABLES[kind]
+        with self._lock, self._conn:
+            if self._conn.execute(f"SELECT 1 FROM {table} WHERE {key} = ?", (new,)).fetchone():
+                self._conn.execute(f"DELETE FROM {table} WHERE {key} = ?", (old,))
+            else:
+                self._conn.execute(f"UPDATE {table} SET {key} = ? WHERE {key} = ?", (new, old))
+            for edge_table, column in _ENTITY_REFERENCES[kind] + (("run_entities", "name"),):
+                condition = " AND kind = ?" if edge_table == "run_entities" else ""
+                params = (kind,) if condition else ()
+                self._conn.execute(f"UPDATE OR IGNORE {edge_table} SET {column} = ? WHERE {column} = ?{condition}", (new, old) + params)
+                self._conn.execute(f"DELETE FROM {edge_table} WHERE {column} = ?{condition}", (old,) + params) # Duplicates of edges already stored under the new name
+
+    # ================== QUERIES =====================
+
+    def _column(self, sql: str, params: tuple) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def user(self, login: str) -> Optional[Dict]:
+        """Returns the stored record of a user (the merged JSON data of every run) or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM users WHERE login = ?", (login,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def node_ids(self, kind: str, names: Iterable[str] = None) -> Dict[str, str]:
+        """Returns {stored name: GraphQL node ID} for the stored entities of a kind (all of them, or only names) that have an ID."""
+        table, key = _ENTITY_TABLES[kind]
+        with self._lock:
+            if names is None:
+                rows = self._conn.execute(f"SELECT {key}, node_id FROM {table} WHERE node_id IS NOT NULL").fetchall()
+            else:
+                names, rows = list(names), []
+                for i in range(0, len(names), 500): # Stay under SQLite's bound-parameter limit
+                    chunk = names[i:i+500]
+                    rows += self._conn.execute(f"SELECT {key}, node_id FROM {table} WHERE node_id IS NOT NULL AND {key} IN ({', '.join('?' * len(chunk))})", chunk).fetchall()
+        return dict(rows)
+
+    def followers_of(self, login: str) -> List[str]:
+        """Collected users that follow login."""
+        return self._column("SELECT follower FROM follows WHERE followee = ? ORDER BY follower", (login,))
+
+    def following_of(self, login: str) -> List[str]:
+        """Collected users that login follows."""
+        return self._column("SELECT followee FROM follows WHERE follower = ? ORDER BY followee", (login,))
+
+    def stargazers_of(self, repository: str) -> List[str]:
+        return self._column("SELECT login FROM stars WHERE repository = ? ORDER BY login", (repository,))
+
+    def members_of(self, organization: str) -> List[str]:
+        return self._column("SELECT login FROM members WHERE organization = ? ORDER BY login", (organization,))
+
+    def organizations_of(self, login: str) -> List[str]:
+        return self._column("SELECT organization FROM members WHERE login = ? ORDER BY organization", (login,))
+
+    def users_by_email(self, email: str) -> List[str]:
+        """Collected users that have ever listed exactly this address (case-insensitive), via the user_emails index."""
+        return self._column("SELECT login FROM user_emails WHERE email = ? ORDER BY login", (email.strip().lower(),))
+
+    def recurring_users(self, min_runs: int = 3, search_mode: str = None) -> List[Dict]:
+        """
+        Inputs: Minimum number of distinct runs (investigations) and an optional search mode filter ("user", "organization", "repository").
+        Outputs: List of {"login", "runs", "targets"} for users returned by at least min_runs runs, most frequent first.
+        Method: Aggregation over the run_entities index (e.g. "who appears in three of our org searches").
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT e.name, COUNT(DISTINCT e.run_id), GROUP_CONCAT(DISTINCT r.target)
+                FROM run_entities e JOIN runs r ON r.run_id = e.run_id
+                WHERE e.kind = 'user' AND (? IS NULL OR r.search_mode = ?)
+                GROUP BY e.name HAVING COUNT(DISTINCT e.run_id) >= ?
+                ORDER BY 2 DESC, 1
+                """, (search_mode, search_mode, min_runs)).fetchall()
+        return [{"login": login, "runs": runs, "targets": (targets or "").split(",")} for login, runs, targets in rows]
+
+    def runs(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT run_id, search_mode, search_method, target, started FROM runs ORDER BY run_id").fetchall()
+        return [dict(zip(("run_id", "search_mode", "search_method", "target", "started"), row)) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("runs", "users", "organizations", "repositories", "follows", "stars", "members", "forks")}
+
+_default_store = None
+_default_lock = threading.Lock()
+
+def default_store() -> EntityStore:
+    """Returns the process-wide EntityStore at DEFAULT_DB_PATH (opened on first use)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = EntityStore()
+        return _default_store
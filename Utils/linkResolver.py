@@ -0,0 +1,174 @@
+# Utils/linkResolver.py
+import threading, time, requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+from tldextract import extract
+from .entityCache import EntityCache, resolve_cache
+from .sendRequests import probe_url
+
+## NOTES: Social links are resolved hop by hop (HEAD, falling back to GET for sites that reject HEAD) instead of letting requests follow
+## redirects, so every hop, including URL shorteners, passes through the per-domain limiter: at most per_domain_concurrency requests in
+## flight and per_domain_rate requests per second to any one host, however many workers run. Different hosts are resolved in parallel.
+## Results are cached in the EntityCache under ("link", normalized URL), so a link shared by many users is resolved once per run.
+## Enrichment passes the search's (or service job's) cache, so resolutions live as long as that cache; links a budget stopped before
+## they were started are left out of the results and are not cached.
+## A link is "alive" when its final hop answers below 400. Some platforms answer 403/429/999 to clients without a browser session;
+## those are recorded with their status and platform but reported as "unverified" rather than dead.
+
+MAX_REDIRECTS = 10
+HEAD_REJECTED = {400, 403, 405, 501} # Retried with GET before being reported
+UNVERIFIABLE = {401, 403, 429, 999} # Bot walls / login walls: the account may exist
+
+PLATFORMS = {
+    "twitter.com": "Twitter/X", "x.com": "Twitter/X", "t.co": "Twitter/X", "linkedin.com": "LinkedIn", "lnkd.in": "LinkedIn",
+    "facebook.com": "Facebook", "fb.me": "Facebook", "instagram.com": "Instagram", "youtube.com": "YouTube", "youtu.be": "YouTube",
+    "tiktok.com": "TikTok", "reddit.com": "Reddit", "medium.com": "Medium", "dev.to": "DEV", "hashnode.dev": "Hashnode",
+    "substack.com": "Substack", "stackoverflow.com": "Stack Overflow", "stackexchange.com": "Stack Exchange", "keybase.io": "Keybase",
+    "t.me": "Telegram", "telegram.me": "Telegram", "discord.gg": "Discord", "discord.com": "Discord", "twitch.tv": "Twitch",
+    "gitlab.com": "GitLab", "bitbucket.org": "Bitbucket", "npmjs.com": "npm", "pypi.org": "PyPI", "hackerone.com": "HackerOne",
+    "bugcrowd.com": "Bugcrowd", "kaggle.com": "Kaggle", "huggingface.co": "Hugging Face", "upwork.com": "Upwork", "fiverr.com": "Fiverr",
+    "bsky.app": "Bluesky", "threads.net": "Threads", "patreon.com": "Patreon", "ko-fi.com": "Ko-fi", "buymeacoffee.com": "Buy Me a Coffee",
+    "linktr.ee": "Linktree", "about.me": "about.me", "mastodon.social": "Mastodon", "hachyderm.io": "Mastodon", "fosstodon.org": "Mastodon",
+}
+
+def normalize_link(url: str) -> str:
+    """Cache key of a link: https scheme, lower-case host without 'www.', no fragment and no trailing slash."""
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    host = host[4:] if host.startswith("www.") else host
+    path = parsed.path.rstrip("/")
+    return f"https://{host}{path}" + (f"?{parsed.query}" if parsed.query else "")
+
+def platform_of(url: str) -> Optional[str]:
+    """Platform name of a URL (PLATFORMS, else the registered domain name), or None for URLs without a host."""
+    host = urlparse(url).netloc.lower()
+    if not host:
+        return None
+    host = host[4:] if host.startswith("www.") else host
+    parts = host.split(".")
+    for i in range(len(parts) - 1): # Subdomains inherit their parent's platform (e.g. m.facebook.com, name.substack.com)
+        platform = PLATFORMS.get(".".join(parts[i:]))
+        if platform:
+            return platform
+    return extract(host).domain or host
+
+class DomainRateLimiter:
+    """Thread-safe per-host limiter: at most concurrency requests in flight and one request every 1/rate seconds per host."""
+    def __init__(self, rate: float = 2.0, concurrency: int = 2):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.concurrency = concurrency
+        self._next_slot: Dict[str, float] = {}
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, host: str):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.Semaphore(self.concurrency))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot.get(host, 0.0))
+                self._next_slot[host] = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+def resolve_link(url: str, limiter: DomainRateLimiter, timeout: int = 10) -> Dict:
+    """
+    Inputs: Link URL, the shared DomainRateLimiter, and per-hop timeout.
+    Outputs: {"url", "finalUrl", "status", "alive", "platform", "redirects", "error"}; alive is True, False, or None (unverified).
+    Method: HEAD per hop (GET when HEAD is rejected), following Location headers manually up to MAX_REDIRECTS hops.
+    """
+    current, redirects, status, error = url, 0, None, None
+    try:
+        while True:
+            host = urlparse(current).netloc.lower()
+            with limiter.slot(host):
+                response = probe_url(current, "HEAD", timeout)
+                if response.status_code in HEAD_REJECTED:
+                    response = probe_url(current, "GET", timeout)
+            status = response.status_code
+            location = response.headers.get("location")
+            if not (300 <= status < 400 and location) or redirects >= MAX_REDIRECTS:
+                break
+            current = urljoin(current, location)
+            redirects += 1
+    except (requests.exceptions.RequestException, ValueError) as e: # ValueError: malformed URLs / Location headers
+        error = type(e).__name__
+
+    if status is None:
+        alive = False
+    elif status < 400:
+        alive = True
+    elif status in UNVERIFIABLE:
+        alive = None
+    else:
+        alive = False
+    return {"url": url, "finalUrl": current, "status": status, "alive": alive, "platform": platform_of(current), "redirects": redirects, "error": error}
+
+def resolve_links(
+    urls: Iterable[str],
+    workers: int = 32,
+    per_domain_rate: float = 5.0,
+    per_domain_concurrency: int = 4,
+    timeout: int = 10,
+    cache: EntityCache = None,
+    budget = None
+    ) -> Dict[str, Dict]:
+    """
+    Inputs: Link URLs, worker threads, per-host request rate (per second) and concurrency, per-hop timeout, an optional EntityCache
+            (defaults to the run cache), and an optional SearchBudget (links not started before its deadline are left unresolved).
+    Outputs: Dict of {normalized URL: resolution dict (see resolve_link)}.
+    Method: Links not yet in the cache are resolved concurrently by a thread pool; the DomainRateLimiter keeps each host within its limits.
+    """
+    cache = resolve_cache(cache)
+    keys = list(dict.fromkeys(normalize_link(url) for url in urls if url))
+    limiter = DomainRateLimiter(per_domain_rate, per_domain_concurrency)
+
+    def resolve_many(links: List[str]) -> Dict[str, Dict]:
+        def resolve(link):
+            if budget is not None and budget.exhausted:
+                return None
+            return resolve_link(link, limiter, timeout)
+        # Round-robin across hosts, so workers waiting on one busy host's limiter never hold up every other host
+        by_host: Dict[str, List[str]] = {}
+        for link in links:
+            by_host.setdefault(urlparse(link).netloc, []).append(link)
+        ordered = [link for group in zip_longest(*by_host.values()) for link in group if link]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ordered)))) as pool:
+            return {link: result for link, result in zip(ordered, pool.map(resolve, ordered)) if result is not None}
+
+    started = time.perf_counter()
+    results = cache.get_or_fetch_many("link", keys, resolve_many)
+    resolved = {key: value for key, value in results.items() if value}
+    print(f"Resolved {len(resolved)} of {len(keys)} links in {time.perf_counter() - started:.1f} seconds "
+          f"({sum(1 for r in resolved.values() if r['alive'] is False)} dead, {sum(1 for r in resolved.values() if r['alive'] is None)} unverified).")
+    return resolved
+
+def resolve_user_links(users: List[Dict], cache: EntityCache = None, budget = None, **kwargs) -> List[Dict]:
+    """
+    Inputs: User dicts with user["socialAccounts"], an optional EntityCache and SearchBudget, and resolve_links options.
+    Outputs: The same users, annotated in place.
+    Method: One resolve_links call over every user's links, so links shared between users are resolved once.
+    Information (per User): user["resolvedLinks"] (final URLs of live or unverified links), user["linkPlatforms"] (set), user["deadLinks"] (set).
+    """
+    links = [url for user in users if user for url in user.get("socialAccounts") or []]
+    if not links:
+        return users
+    results = resolve_links(links, cache=cache, budget=budget, **kwargs)
+    for user in users:
+        if not user or not user.get("socialAccounts"):
+            continue
+        resolved = [results.get(normalize_link(url)) for url in user["socialAccounts"]]
+        resolved = [r for r in resolved if r]
+        user["resolvedLinks"] = sorted({r["finalUrl"] for r in resolved if r["alive"] is not False})
+        user["linkPlatforms"] = {r["platform"] for r in resolved if r["platform"] and r["alive"] is not False}
+        user["deadLinks"] = {r["url"] for r in resolved if r["alive"] is False}
+    return users
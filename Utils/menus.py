@@ -9,13 +9,16 @@ def user_search_mode_menu(): # Menu for selecting user search mode when running
     clearTerminal()
     print("1) User Search - Exact Match") # Finds information for a specific user: (User, Followership, and Stargazing)
     print("2) User Search - Partial Match") #Finds users based on partial matches (will likely return multiple results)
+    print("3) User Search - Network Crawl") # Crawls followership breadth-first to a chosen depth (second-degree networks and beyond)
+    print("4) User Search - Author Search") # Finds unique commit author identities (login, name, email) across repositories
+    print("5) User Search - Multi-target Exact") # Exact Match for several suspected accounts at once, with a report of what they share
     
     while True:
-        choice = input("Enter 1 or 2: ").strip()
-        if choice == "1" or choice == "2":
+        choice = input("Enter 1-5: ").strip()
+        if choice in ("1", "2", "3", "4", "5"):
             return choice
         else:
-            print("Invalid selection. Please enter 1 or 2.")
+            print("Invalid selection. Please enter 1, 2, 3, 4, or 5.")
 
 def organization_search_mode_menu(): # Menu for selecting user search mode when running main.py
     """Presents a menu for selecting organization search mode and returns the selected option."""
@@ -35,10 +38,60 @@ def enrichment_menu(): # Menu for electing to enrich results or not. Used after
     clearTerminal()
     print("1) Enrich Results (Can take several minutes)")
     print("2) Skip Enrichment (Return results now)")
+    print("3) Enrich Highest-Priority Users (Stop after a number of users or seconds; the rest can be enriched later)")
     
     while True:
-        choice = input("Enter 1 or 2: ").strip()
-        if choice == "1" or choice == "2":
+        choice = input("Enter 1, 2, or 3: ").strip()
+        if choice in ("1", "2", "3"):
             return choice
         else:
-            print("Invalid selection. Please enter 1 or 2.")
\ No newline at end of file
+            print("Invalid selection. Please enter 1, 2, or 3.")
+
+def optional_limits_prompt(prompts): # Shared by the limit menus below
+    """Prompts a user once per prompt for an optional positive whole number and returns them as a tuple, with None for each one left blank."""
+    limits = []
+    for prompt in prompts:
+        while True:
+            choice = input(prompt).strip()
+            if not choice:
+                limits.append(None)
+                break
+            elif choice.isdigit() and int(choice) > 0:
+                limits.append(int(choice))
+                break
+            else:
+                print("Invalid selection. Please enter a positive whole number or leave blank.")
+    return tuple(limits)
+
+def enrichment_limits_menu(): # Prompts for the limits of a prioritized enrichment
+    """Prompts a user for the number of users to enrich, an enrichment time limit (seconds) and a minimum confidence (percent), each optional, and returns (top_k, time_budget, min_confidence) with None for no limit."""
+    return optional_limits_prompt(("Number of users to enrich (leave blank for no limit): ", "Enrichment time limit in seconds (leave blank for none): ",
+                                   "Minimum confidence in percent, 1-100 (leave blank to enrich every user): "))
+
+def crawl_depth_menu(): # Prompts for the depth of a network crawl
+    """Prompts a user for the number of followership hops to crawl and returns it as an int."""
+    while True:
+        choice = input("Enter crawl depth (1-4, default 2): ").strip() or "2"
+        if choice in ("1", "2", "3", "4"):
+            return int(choice)
+        else:
+            print("Invalid selection. Please enter a number from 1 to 4.")
+
+def watch_mode_menu(): # Menu for selecting what Watch mode refreshes
+    """Presents a menu for refreshing tracked targets or tracking new ones and returns the selected option."""
+    clearTerminal()
+    print("1) Refresh All Tracked Targets") # Reports new/removed followers, members, repositories and stars since the last refresh
+    print("2) Track New Users")
+    print("3) Track New Organizations")
+    print("4) Track New Repositories")
+    
+    while True:
+        choice = input("Enter 1-4: ").strip()
+        if choice in ("1", "2", "3", "4"):
+            return choice
+        else:
+            print("Invalid selection. Please enter 1, 2, 3, or 4.")
+
+def search_budget_menu(): # Prompts for optional time and API point limits of a search
+    """Prompts a user for a time limit (seconds) and an API point limit, each optional, and returns (deadline, max_points) with None for no limit."""
+    return optional_limits_prompt(("Time limit in seconds (leave blank for none): ", "API point limit (leave blank for none): "))
@@ -0,0 +1,109 @@
+# Utils/nodeRequests.py
+from typing import Dict, List, Optional
+from .queries import graphQL_nodes_query
+from .userRequests import _normalize_user, user_hydration_request
+from .organizationRequests import _organization_info
+from .repositoryRequests import _normalize_repository
+from .sendRequests import send_graphql
+from .searchBudget import BudgetExhausted
+
+## NOTES: Every user, organization and repository record now carries its GraphQL node ID ("id"). IDs survive renames and need no
+## login resolution, so entities that were collected before (run cache, entity store) are refreshed with nodes(ids: [...]) in chunks of
+## 100 instead of one user(login: ...) alias each. A refreshed record whose login (or nameWithOwner) differs from the one it was stored
+## under is a rename; callers receive it under the name they asked for, with the current name in the record.
+
+NODES_PER_QUERY = 100 # GitHub's limit for nodes(ids:)
+
+def _entity_name(record: Dict) -> Optional[str]:
+    return record.get("nameWithOwner") or record.get("login")
+
+def _normalize_node(node: Dict) -> Optional[Dict]:
+    kind = node.get("__typename")
+    if kind == "User":
+        return _normalize_user(node)
+    if kind == "Organization":
+        return _organization_info(node)
+    if kind == "Repository":
+        return _normalize_repository({k: v for k, v in node.items() if k != "__typename"})
+    return None
+
+def node_hydration_request(token, node_ids: List[str], batch_size: int = NODES_PER_QUERY) -> Dict[str, Optional[Dict]]:
+    """
+    Inputs: Personal access token (or TokenPool / BudgetedToken) and GraphQL node IDs of users, organizations and/or repositories.
+    Outputs: Dict of {node ID: normalized record} (None for IDs that no longer resolve, e.g. deleted accounts).
+    Method: nodes(ids: [...]) queries of up to 100 IDs; records are normalized like the login-based requests (users, organization info, repository info).
+    """
+    records: Dict[str, Optional[Dict]] = {}
+    batch_size = max(1, min(batch_size, NODES_PER_QUERY))
+    query = graphQL_nodes_query()
+    for i in range(0, len(node_ids), batch_size):
+        batch = node_ids[i:i+batch_size]
+        try:
+            payload = send_graphql(token, query, {"ids": batch})
+        except BudgetExhausted:
+            break # Search budget spent: the remaining IDs are left out (not reported as unresolved)
+        if payload.get("errors") and not payload.get("data"):
+            raise RuntimeError(f"GraphQL error: {payload['errors']}")
+        nodes = (payload.get("data") or {}).get("nodes") or []
+        for node_id, node in zip(batch, nodes): # nodes() answers in the order of the IDs, with null for the ones it cannot resolve
+            records[node_id] = _normalize_node(node) if node else None
+    return records
+
+def rehydrate_by_node_id(token, names_to_ids: Dict[str, str], batch_size: int = NODES_PER_QUERY) -> Dict[str, Optional[Dict]]:
+    """
+    Inputs: Personal access token and {stored name (login or nameWithOwner): node ID}.
+    Outputs: Dict of {stored name: refreshed record} (None when the node no longer resolves). Renamed entities keep the stored name as key.
+    Method: node_hydration_request over the IDs, mapped back to the names they were stored under; renames are reported.
+    """
+    by_id = node_hydration_request(token, list(dict.fromkeys(names_to_ids.values())), batch_size)
+    refreshed = {}
+    for name, node_id in names_to_ids.items():
+        if node_id not in by_id:
+            continue # Not requested (budget spent)
+        record = by_id[node_id]
+        current = _entity_name(record) if record else None
+        if current and current.lower() != name.lower():
+            print(f"{name} was renamed to {current}.")
+        refreshed[name] = record
+    return refreshed
+
+def refresh_store(token, store, kinds = ("user", "organization", "repository"), batch_size: int = NODES_PER_QUERY) -> Dict[str, int]:
+    """
+    Inputs: Personal access token, an EntityStore, the entity kinds to refresh, and IDs per query.
+    Outputs: Counts {"refreshed", "renamed", "unresolved"}.
+    Method: Re-fetches every stored entity that has a node ID through nodes(ids:), moves renamed entities (and their edges) to their
+            current names, and upserts the refreshed records as one "Refresh" run.
+    """
+    names_to_ids = {}
+    for kind in kinds:
+        names_to_ids.update(store.node_ids(kind))
+    print(f"Refreshing {len(names_to_ids)} stored entities by node ID...")
+    refreshed = rehydrate_by_node_id(token, names_to_ids, batch_size)
+
+    records, renamed, unresolved = [], 0, 0
+    for name, record in refreshed.items():
+        if record is None:
+            unresolved += 1
+            continue
+        current = _entity_name(record)
+        if current and current.lower() != name.lower():
+            kind = "repository" if "nameWithOwner" in record else "organization" if "websiteUrl" in record else "user"
+            store.rename(kind, name, current)
+            renamed += 1
+        records.append(record)
+    store.ingest(records, {"search_mode": "refresh", "search_method": "Nodes"})
+    return {"refreshed": len(records), "renamed": renamed, "unresolved": unresolved}
+
+def hydrate_users(token, logins: List[str], node_ids: Dict[str, str] = None, batch_size: int = 50) -> Dict[str, Optional[Dict]]:
+    """
+    Inputs: Personal access token, user logins, optional {login: node ID} of already known users (e.g. EntityStore.node_ids), and logins per login-based query.
+    Outputs: Dict of {login: normalized user dict} (None for logins that do not resolve), like user_hydration_request.
+    Method: Known users are refreshed by node ID (100 per query, rename-proof); only the rest are resolved by login.
+    """
+    known = {login.lower(): node_id for login, node_id in (node_ids or {}).items()}
+    by_id = {login: known[login.lower()] for login in logins if login.lower() in known}
+    users_by_login = rehydrate_by_node_id(token, by_id) if by_id else {}
+    remaining = [login for login in logins if login not in users_by_login or users_by_login[login] is None]
+    if remaining:
+        users_by_login.update(user_hydration_request(token, remaining, batch_size))
+    return users_by_login
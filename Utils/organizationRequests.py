@@ -1,23 +1,32 @@
 # Utils/organizationRequests.py
-import requests, math
+import math
 from typing import List, Dict
 from .queries import graphQL_organization_info_query, graphQL_organization_membership_query
+from .userRequests import _normalize_user
+from .entityCache import EntityCache, resolve_cache
+from .sendRequests import send_graphql
+from .searchBudget import BudgetExhausted
 
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+ORGANIZATION_FIELDS = ["login", "name", "email", "location", "websiteUrl", "createdAt", "isVerified", "twitterUsername", "id"]
+
+def _organization_info(org_data: Dict) -> Dict:
+    """Returns the organization info row (ORGANIZATION_FIELDS) of an organization node."""
+    return {k: org_data.get(k) for k in ORGANIZATION_FIELDS}
 
 # Sends a POST request to the GitHub GraphQL endpoint for organizations
-def organization_info_request(token: str, target_orgs: List[str]) -> Dict[str, any]:
+def _fetch_organizations(token: str, target_orgs: List[str]) -> Dict[str, Dict]:
     """
     Inputs: List of GitHub organization names (logins) and personal access token.
-    Outputs: Dictionary containing organization info, all repository names, and all members for each organization in target_orgs.
+    Outputs: Dict of {org: {"organization": info, "repositories": [...], "members": [...]}}; each member node carries its "role" in the org.
     Method: Batched requests to the GitHub GraphQL endpoint for organizations with pagination.
-    Information (per Organization): Organization info, all repositories, and all members.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
     results = {}
+    budget_spent = False
     
     # Process orgs in batches of 2
     for i in range(0, len(target_orgs), 2):
+        if budget_spent:
+            break
         batch = target_orgs[i:i+2]
         
         # Initialize per-org state
@@ -33,23 +42,32 @@ def organization_info_request(token: str, target_orgs: List[str]) -> Dict[str, a
                 "members_done": False
             }
         
+        # Compiled query text is reused for every page; only the variables change
+        query, login_variables = graphQL_organization_info_query(batch)
+        
         # Paginate until all orgs in batch are done
         while not all(s["repos_done"] and s["members_done"] for s in org_states.values()):
             
-            # Build query and variables for this batch
-            query = graphQL_organization_info_query(batch)
-            variables = {}
+            # Build variables for this batch
+            variables = dict(login_variables)
                 
             for idx, org in enumerate(batch):
                 # Set variables for this org
                 state = org_states[org]
                 variables[f"repoCursor{idx}"] = state["repo_cursor"]
                 variables[f"memberCursor{idx}"] = state["member_cursor"]
+                variables[f"includeRepos{idx}"] = not state["repos_done"] # Exhausted connections are dropped from the query (@include)
+                variables[f"includeMembers{idx}"] = not state["members_done"]
             
             #Fetches data for this batch
-            response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
-            response.raise_for_status()
-            data = response.json()["data"]
+            try:
+                payload = send_graphql(token, query, variables)
+            except BudgetExhausted: # Search budget spent: keep the pages collected so far and stop paging
+                budget_spent = True
+                break
+            if payload.get("errors") and not payload.get("data"):
+                raise RuntimeError(f"GraphQL error: {payload['errors']}")
+            data = payload.get("data") or {} # An unknown org comes back as a null alias (with a NOT_FOUND error) and is finished below
             
             #Handles logic for each org in the batch and changes the loop condition when complete
             for idx, org in enumerate(batch):
@@ -62,25 +80,27 @@ def organization_info_request(token: str, target_orgs: List[str]) -> Dict[str, a
                     
                 # Org info (only set once)
                 if not org_states[org]["org_info"]:
-                    org_states[org]["org_info"] = {k: org_data[k] for k in ["login", "name", "email", "location", "websiteUrl", "createdAt", "isVerified", "twitterUsername"]}
+                    org_states[org]["org_info"] = _organization_info(org_data)
                 
-                # Repos
-                repos = org_data["repositories"]["nodes"]
-                org_states[org]["all_repos"].extend(repos)
-                repo_page = org_data["repositories"]["pageInfo"]
-                if repo_page["hasNextPage"]:
-                    org_states[org]["repo_cursor"] = repo_page["endCursor"]
-                else:
-                    org_states[org]["repos_done"] = True
+                # Repos (absent from the response once the connection is done)
+                if not org_states[org]["repos_done"]:
+                    repos = org_data["repositories"]["nodes"]
+                    org_states[org]["all_repos"].extend(repos)
+                    repo_page = org_data["repositories"]["pageInfo"]
+                    if repo_page["hasNextPage"]:
+                        org_states[org]["repo_cursor"] = repo_page["endCursor"]
+                    else:
+                        org_states[org]["repos_done"] = True
                 
-                # Members
-                members = org_data["membersWithRole"]["nodes"]
-                org_states[org]["all_members"].extend(members)
-                member_page = org_data["membersWithRole"]["pageInfo"]
-                if member_page["hasNextPage"]:
-                    org_states[org]["member_cursor"] = member_page["endCursor"]
-                else:
-                    org_states[org]["members_done"] = True
+                # Members (the role is carried on the edge)
+                if not org_states[org]["members_done"]:
+                    edges = org_data["membersWithRole"]["edges"]
+                    org_states[org]["all_members"].extend(dict(edge["node"], role=edge.get("role")) for edge in edges if edge and edge.get("node"))
+                    member_page = org_data["membersWithRole"]["pageInfo"]
+                    if member_page["hasNextPage"]:
+                        org_states[org]["member_cursor"] = member_page["endCursor"]
+                    else:
+                        org_states[org]["members_done"] = True
         
         # Store results for this batch
         for org in batch:
@@ -90,28 +110,63 @@ def organization_info_request(token: str, target_orgs: List[str]) -> Dict[str, a
                 "members": org_states[org]["all_members"]
             }
     
-    # Build output: first n dicts are org info, then all members as dicts with 'organizations': [org_name]
+    return results
+
+def _organization_stats(result: Dict) -> Dict:
+    """Returns the member and repository statistics of a fetched organization: memberCount, adminCount, repositoryCount, stargazerCount, forkCount."""
+    members = result.get("members") or []
+    repositories = [repo for repo in result.get("repositories") or [] if repo]
+    return {
+        "memberCount": len(members),
+        "adminCount": sum(1 for member in members if member.get("role") == "ADMIN"),
+        "repositoryCount": len(repositories),
+        "stargazerCount": sum(repo.get("stargazerCount") or 0 for repo in repositories),
+        "forkCount": sum(repo.get("forkCount") or 0 for repo in repositories),
+    }
+
+def _member_row(member: Dict) -> Dict:
+    """Returns the output row of a member node: the profile with flattened socialAccounts, without the (per-org) role."""
+    member_row = {k: v for k, v in member.items() if k != "role"}
+    if isinstance(member_row.get("socialAccounts"), dict):
+        member_row["socialAccounts"] = [n.get("url") for n in member_row["socialAccounts"].get("nodes") or [] if n and n.get("url")]
+    member_row["organizations"] = []
+    member_row["organizationRoles"] = {}
+    return member_row
+
+def organization_info_request(token: str, target_orgs: List[str], cache: EntityCache = None) -> Dict[str, any]:
+    """
+    Inputs: List of GitHub organization names (logins), personal access token, and an optional EntityCache (defaults to the run cache).
+    Outputs: List of organization info rows (one per organization, with member and repository statistics) followed by one row per member login.
+    Method: Organizations already fetched (or in flight) in this run are served from the cache; the rest are fetched with _fetch_organizations.
+            Members are merged by login in one pass (hash aggregation), so a user in several target organizations is flattened and written once.
+    Information (per Organization): Organization info, memberCount, adminCount, repositoryCount, stargazerCount, forkCount.
+    Information (per User): Profile fields, organizations (target orgs the user is a member of), organizationRoles ({org: "ADMIN" | "MEMBER"}).
+    """
+    cache = resolve_cache(cache)
+    results = cache.get_or_fetch_many("organization", target_orgs, lambda orgs: _fetch_organizations(token, orgs))
+    
+    # Build output: first n dicts are org info, then one dict per member
     output = []
-    # Add org info dicts
     for org_name in target_orgs:
-        org_info = results.get(org_name, {}).get("organization", {})
-        if org_info:
-            output.append(org_info)
-    # Add member dicts with 'organizations' key, deduplicated by (org_name, login)
-    seen = set()
+        result = results.get(org_name) or {}
+        if result.get("organization"):
+            output.append(dict(result["organization"], **_organization_stats(result))) # Copy: the cached info stays as fetched
+    
+    # Merge members by (case-insensitive) login; each profile is flattened once however many target orgs it belongs to
+    members_by_login = {}
     for org_name in target_orgs:
-        members = results.get(org_name, {}).get("members", [])
-        for member in members:
+        for member in (results.get(org_name) or {}).get("members", []):
             login = member.get("login")
-            if (org_name, login) not in seen:
-                seen.add((org_name, login))
-                member_row = dict(member)  # copy
-                member_row["organizations"] = [org_name]
-                # Flatten socialAccounts if present
-                if "socialAccounts" in member_row and isinstance(member_row["socialAccounts"], dict):
-                    urls = [n.get("url") for n in member_row["socialAccounts"].get("nodes", []) if n.get("url")]
-                    member_row["socialAccounts"] = urls
-                output.append(member_row)
+            if not login:
+                continue
+            member_row = members_by_login.get(login.lower())
+            if member_row is None:
+                member_row = members_by_login[login.lower()] = _member_row(member)
+                cache.put("user", login, _normalize_user(member))
+            if org_name not in member_row["organizationRoles"]:
+                member_row["organizations"].append(org_name)
+            member_row["organizationRoles"][org_name] = member.get("role")
+    output.extend(members_by_login.values())
     return output
 
 # Returns user logins that are members of at least 1/3 of the organizations (rounded up)
@@ -121,11 +176,13 @@ def organization_membership_request(token: str, target_orgs: List[str]) -> List[
     Outputs: List of user logins that are members of at least 1/3 of the organizations (rounded up).
     Method: Uses organization_request to fetch all members, then counts login occurrences.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
     results = {}
+    budget_spent = False
     
     # Process orgs in batches of 2
     for i in range(0, len(target_orgs), 2):
+        if budget_spent:
+            break
         batch = target_orgs[i:i+2]
         
         # Initialize per-org state
@@ -137,12 +194,14 @@ def organization_membership_request(token: str, target_orgs: List[str]) -> List[
                 "members_done": False
             }
         
+        # Compiled query text is reused for every page; only the variables change
+        query, login_variables = graphQL_organization_membership_query(batch)
+        
         # Paginate until all orgs in batch are done
         while not all(s["members_done"] for s in org_states.values()):
             
-            # Build query and variables for this batch
-            query = graphQL_organization_membership_query(batch)
-            variables = {}
+            # Build variables for this batch
+            variables = dict(login_variables)
                 
             for idx, org in enumerate(batch):
                 # Set variables for this org
@@ -150,9 +209,14 @@ def organization_membership_request(token: str, target_orgs: List[str]) -> List[
                 variables[f"memberCursor{idx}"] = state["member_cursor"]
             
             #Fetches data for this batch
-            response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
-            response.raise_for_status()
-            data = response.json()["data"]
+            try:
+                payload = send_graphql(token, query, variables)
+            except BudgetExhausted: # Search budget spent: keep the pages collected so far and stop paging
+                budget_spent = True
+                break
+            if payload.get("errors") and not payload.get("data"):
+                raise RuntimeError(f"GraphQL error: {payload['errors']}")
+            data = payload.get("data") or {} # An unknown org comes back as a null alias (with a NOT_FOUND error) and is finished below
             
             #Handles logic for each org in the batch and changes the loop condition when complete
             for idx, org in enumerate(batch):
@@ -0,0 +1,163 @@
+# Utils/pageArchive.py
+import hashlib, os, sqlite3, threading, time, zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+## NOTES: Raw profile pages scraped during enrichment are kept in a local archive so extraction rules can be re-run (or changed) over
+## them at disk speed instead of scraping github.com again. Pages are content-addressed: a page is stored once under the SHA-256 of its
+## bytes (objects/ab/<digest>.<codec>), however many logins or fetches produced it, and an SQLite index records every fetch as
+## (login, URL, fetch time, digest). Blobs are compressed with zstd when the zstandard package is installed and with zlib otherwise;
+## each blob records its codec, so an archive can mix both. Blobs are written to a temporary file and renamed into place, so a crash
+## never leaves a truncated blob behind an index row.
+## Profile pages embed per-request tokens, so two fetches of an unchanged profile are usually not byte-identical: deduplication
+## mostly catches pages fetched once and archived again (e.g. by resumed or repeated enrichments served from the archive).
+
+DEFAULT_ARCHIVE_DIR = os.getenv("GITHUB_INVESTIGATION_ARCHIVE_DIR") or os.path.join(os.path.expanduser("~"), "Downloads", "GitHubInvestigationArchive")
+CODEC = "zstd" if zstandard is not None else "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY, codec TEXT, size INTEGER, stored_size INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pages (
+    login TEXT COLLATE NOCASE, fetched_at REAL, url TEXT, digest TEXT,
+    PRIMARY KEY (login, fetched_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_by_digest ON pages (digest);
+CREATE INDEX IF NOT EXISTS pages_by_time ON pages (fetched_at);
+"""
+
+class PageArchive:
+    """Thread-safe content-addressed archive of fetched pages, indexed by login and fetch time."""
+    def __init__(self, path: str = DEFAULT_ARCHIVE_DIR):
+        self.path = path
+        self.objects = os.path.join(path, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self._lock = threading.Lock()
+        self._local = threading.local() # zstd (de)compressors are not safe to share between threads
+        self._conn = sqlite3.connect(os.path.join(path, "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ================== BLOBS =====================
+
+    def _blob_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.objects, digest[:2], f"{digest}.{codec}")
+
+    def _compress(self, data: bytes) -> bytes:
+        if CODEC == "zstd":
+            if not hasattr(self._local, "compressor"):
+                self._local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            return self._local.compressor.compress(data)
+        return zlib.compress(data, ZLIB_LEVEL)
+
+    def _decompress(self, data: bytes, codec: str) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if zstandard is None:
+            raise RuntimeError("This archive blob is zstd-compressed; install the zstandard package to read it.")
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.decompressor.decompress(data)
+
+    def read(self, digest: str) -> str:
+        """Returns the page stored under digest."""
+        with self._lock:
+            row = self._conn.execute("SELECT codec FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if not row:
+            raise KeyError(digest)
+        with open(self._blob_path(digest, row[0]), "rb") as f:
+            return self._decompress(f.read(), row[0]).decode("utf-8")
+
+    # ================== WRITES =====================
+
+    def put(self, login: str, url: str, page: str, fetched_at: float = None) -> str:
+        """
+        Inputs: Login the page belongs to, its URL, the page text, and the fetch time (defaults to now).
+        Outputs: The page's digest (SHA-256 of its UTF-8 bytes).
+        Method: The blob is compressed and written only when the digest is new; the fetch is always indexed.
+        """
+        data = page.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if not known:
+            stored = self._compress(data)
+            path = self._blob_path(digest, CODEC)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(stored)
+            os.replace(temporary, path)
+        with self._lock, self._conn:
+            if not known:
+                self._conn.execute("INSERT OR IGNORE INTO blobs (digest, codec, size, stored_size) VALUES (?, ?, ?, ?)",
+                                   (digest, CODEC, len(data), len(stored)))
+            self._conn.execute("INSERT OR REPLACE INTO pages (login, fetched_at, url, digest) VALUES (?, ?, ?, ?)", (login, fetched_at, url, digest))
+        return digest
+
+    # ================== READS =====================
+
+    def latest(self, login: str, max_age: float = None) -> Optional[Tuple[float, str]]:
+        """Returns (fetch time, page) of the login's most recent archived page, or None (also when it is older than max_age seconds)."""
+        with self._lock:
+            row = self._conn.execute("SELECT fetched_at, digest FROM pages WHERE login = ? ORDER BY fetched_at DESC LIMIT 1", (login,)).fetchone()
+        if not row or (max_age is not None and time.time() - row[0] > max_age):
+            return None
+        return row[0], self.read(row[1])
+
+    def history(self, login: str) -> List[Dict]:
+        """Returns every archived fetch of a login as {"fetchedAt", "url", "digest"}, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT fetched_at, url, digest FROM pages WHERE login = ? ORDER BY fetched_at", (login,)).fetchall()
+        return [{"fetchedAt": fetched_at, "url": url, "digest": digest} for fetched_at, url, digest in rows]
+
+    def logins(self, since: float = None) -> List[str]:
+        """Returns every login with an archived page (fetched at or after since, when given)."""
+        sql, params = "SELECT DISTINCT login FROM pages", ()
+        if since is not None:
+            sql, params = sql + " WHERE fetched_at >= ?", (since,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql + " ORDER BY login", params)]
+
+    def iter_latest(self, logins: List[str] = None) -> Iterator[Tuple[str, float, str]]:
+        """Yields (login, fetch time, page) of the most recent page of every requested login (default: every archived login)."""
+        for login in logins if logins is not None else self.logins():
+            latest = self.latest(login)
+            if latest:
+                yield login, latest[0], latest[1]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*), COUNT(DISTINCT login) FROM pages").fetchone()
+            blobs = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+        return {"pages": pages[0], "logins": pages[1], "blobs": blobs[0], "bytes": blobs[1], "storedBytes": blobs[2]}
+
+_default_archive = None
+_default_lock = threading.Lock()
+
+def default_archive() -> PageArchive:
+    """Returns the process-wide PageArchive at DEFAULT_ARCHIVE_DIR (opened on first use)."""
+    global _default_archive
+    with _default_lock:
+        if _default_archive is None:
+            _default_archive = PageArchive()
+        return _default_archive
+
+def resolve_archive(archive) -> Optional[PageArchive]:
+    """Returns archive, the default archive when archive is None, or None (no archiving) when archive is False."""
+    if archive is False:
+        return None
+    return archive if archive is not None else default_archive()
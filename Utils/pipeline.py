@@ -0,0 +1,112 @@
+# Utils/pipeline.py
+import queue, threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+## NOTES: Searches alternate network waits (fetch) and CPU work (JSON normalization, HTML parsing). The helpers below overlap the two:
+##  - staged_map: independent items (e.g. profile pages) are fetched by a thread pool and parsed by a process pool at the same time.
+##    At most max_in_flight items are between "submitted" and "consumed", so a slow consumer or parser holds back the fetchers
+##    (backpressure) instead of letting fetched pages pile up in memory.
+##  - OrderedStage: for cursor-paginated requests, where the next page cannot be requested before the current one arrives, the
+##    normalization of each page runs on a background thread fed through a bounded queue while the next page is being fetched.
+## Parse functions given to staged_map must be module-level (picklable) when processes are used.
+
+_DONE = object()
+
+class OrderedStage:
+    """
+    One background worker applying fn to every item put on a bounded queue; results are kept in input order.
+    put() blocks while maxsize items are waiting (backpressure on the producer); results() waits for the queue to drain.
+    """
+    def __init__(self, fn: Callable[[Any], Any], maxsize: int = 4):
+        self.fn = fn
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._results: List[Any] = []
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if self._error is None:
+                try:
+                    self._results.append(self.fn(item))
+                except BaseException as e:
+                    self._error = e # Re-raised to the producer by results()
+
+    def put(self, item: Any) -> None:
+        self._queue.put(item)
+
+    def results(self) -> List[Any]:
+        """Closes the stage and returns fn(item) for every item put, in order."""
+        self._queue.put(_DONE)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._results
+
+def staged_map(
+    items: Iterable[Any],
+    fetch: Callable[[Any], Any],
+    parse: Callable[[Any], Any],
+    fetch_workers: int = 8,
+    parse_workers: Optional[int] = None,
+    max_in_flight: int = 32,
+    use_processes: bool = True,
+    keep_going: Callable[[], bool] = None
+    ) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """
+    Inputs: Items, an I/O-bound fetch(item) run on threads, a CPU-bound parse(fetched) run on processes (or threads when use_processes is False),
+            worker counts, the bound on items in flight, and an optional keep_going() checked before each new item is started (e.g. a search budget).
+    Outputs: Generator of (item, parse result, None) or (item, None, exception) in completion order.
+    Method: Items are started only while fewer than max_in_flight are unconsumed. A finished fetch hands its result straight to the parse pool
+            from the fetching thread, so fetching and parsing overlap; the caller consumes results as they complete.
+    """
+    items = iter(items)
+    done = queue.Queue()
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers)
+    parse_pool = ProcessPoolExecutor(max_workers=parse_workers) if use_processes else ThreadPoolExecutor(max_workers=parse_workers or 2)
+
+    def on_parsed(item, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        done.put((item, None if error else future.result(), error))
+
+    def on_fetched(item, future):
+        if future.cancelled(): # Consumer stopped early
+            return
+        error = future.exception()
+        if error is not None:
+            done.put((item, None, error))
+            return
+        try:
+            parse_pool.submit(parse, future.result()).add_done_callback(lambda f: on_parsed(item, f))
+        except RuntimeError as e: # Parse pool already shut down (consumer stopped early)
+            done.put((item, None, e))
+
+    in_flight = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and in_flight < max_in_flight:
+                if keep_going is not None and not keep_going():
+                    exhausted = True
+                    break
+                item = next(items, _DONE)
+                if item is _DONE:
+                    exhausted = True
+                    break
+                fetch_pool.submit(fetch, item).add_done_callback(lambda f, item=item: on_fetched(item, f))
+                in_flight += 1
+            if in_flight == 0:
+                return
+            result = done.get()
+            in_flight -= 1
+            yield result
+    finally:
+        fetch_pool.shutdown(wait=True, cancel_futures=True)
+        parse_pool.shutdown(wait=True, cancel_futures=True)
@@ -1,13 +1,44 @@
 # Utils/queries.py
 """
 Central location for GraphQL query strings used in the project.
+Aliased (multi-target) queries are compiled once per alias count and cached; logins, cursors and page sizes are always passed as
+typed variables, never concatenated into the query text, so the same text is reused across calls.
 """
+from functools import lru_cache
+
+_USER_PROFILE_FRAGMENT = """
+fragment UserProfile on User {
+    id login createdAt name email bio location company
+    socialAccounts(first: $socialSize) {
+        nodes { url }
+    }
+}"""
+
+@lru_cache(maxsize=None)
+def _compile_aliased_query(operation: str, alias: str, selection: str, alias_vars: tuple, count: int, shared_vars: str = "", fragments: str = "") -> str:
+    """
+    Inputs: Operation name, alias prefix, per-alias selection (with {i} placeholders), per-alias variable (name, type) pairs, alias count,
+            shared variable declarations, and fragment definitions.
+    Outputs: Query text declaring {name}{i} variables for every alias (e.g. $login0: String!, $login1: String!, ...).
+    Method: Built once per distinct argument tuple and cached (lru_cache), so repeated batches of the same size reuse the same text.
+    """
+    declarations = [f"${name}{i}: {var_type}" for i in range(count) for name, var_type in alias_vars]
+    if shared_vars:
+        declarations.append(shared_vars)
+    body = "\n        ".join(f"{alias}{i}: " + selection.replace("{i}", str(i)) for i in range(count))
+    return f"""query {operation}({", ".join(declarations)}) {{
+        {body}
+    }}{fragments}"""
+
+def _alias_variables(name: str, values) -> dict:
+    """Returns {name0: values[0], name1: values[1], ...} for the aliases of a compiled query."""
+    return {f"{name}{i}": value for i, value in enumerate(values)}
 
 def graphQL_user_exact_query(login): # Returns a query for GitHub user information, including followership and social accounts
     return """
     query userQuery($login: String!, $pageSize: Int = 100, $socialSize: Int = 10, $followingCursor: String, $followersCursor: String, $cursor: String) {
         user(login: $login) {
-            login createdAt name email bio location company
+            id login createdAt name email bio location company
             socialAccounts(first: $socialSize) {
                 nodes { url }
             }
@@ -18,7 +49,7 @@ def graphQL_user_exact_query(login): # Returns a query for GitHub user informati
             following(first: $pageSize, after: $followingCursor) {
                 pageInfo { hasNextPage endCursor }
                 nodes {
-                    login createdAt name email bio location company
+                    id login createdAt name email bio location company
                     socialAccounts(first: $socialSize) {
                         nodes { url }
                     }
@@ -30,7 +61,7 @@ def graphQL_user_exact_query(login): # Returns a query for GitHub user informati
             followers(first: $pageSize, after: $followersCursor) {
                 pageInfo { hasNextPage endCursor }
                 nodes {
-                    login createdAt name email bio location company
+                    id login createdAt name email bio location company
                     socialAccounts(first: $socialSize) {
                         nodes { url }
                     }
@@ -51,25 +82,16 @@ def graphQL_user_exact_query(login): # Returns a query for GitHub user informati
 }
     """
 
-def graphQL_build_bulk_user_query(user_logins): # Builds and returns a query that fetches information on users that contain or partially match the input string
-    """
-    Assembles a GraphQL query string that fetches information for all users, in one request, returned
-    by the User Search (Partial) method
+def graphQL_build_bulk_user_query(user_logins): # Builds and returns a query (and its variables) that fetches information on a batch of users
     """
-    query = f"""query bulkUserQuery {{
+    Returns the compiled query for len(user_logins) user aliases (user0, user1, ...) and the variables binding each login, in one request.
+    Used to hydrate users known only by login (Intersection Search, contributors, cached entities).
     """
-    
-    for i, user in enumerate(user_logins):
-        user_index = str(i)
-        query += f"""user{user_index}: user(login: "{user}") {{
-            login createdAt name email bio location company
-            socialAccounts(first: 10) {{
-                nodes {{ url }}
-                }}
-            }}"""
-    query += "}"
-    
-    return query
+    query = _compile_aliased_query(
+        "bulkUserQuery", "user", "user(login: $login{i}) { ...UserProfile }", (("login", "String!"),), len(user_logins),
+        "$socialSize: Int = 10", _USER_PROFILE_FRAGMENT
+    )
+    return query, _alias_variables("login", user_logins)
 
 def graphQL_user_starred_repos_query(login): # Returns a query for repositories starred by a GitHub user
     return """
@@ -87,45 +109,34 @@ def graphQL_user_starred_repos_query(login): # Returns a query for repositories
 }
     """
 
-def graphQL_build_partial_user_query(user_logins): # Builds and returns a query that fetches information on users that contain or partially match the input string
+def graphQL_build_partial_user_query(user_logins): # Builds and returns a query (and its variables) that fetches information on users that contain or partially match the input string
     """
-    Assembles a GraphQL query string that fetches information for all users, in one request, returned
-    by the User Search (Partial) method
+    Returns the compiled query for len(user_logins) user aliases and the variables binding each login, fetching all users returned
+    by the User Search (Partial) method in one request.
     """
-    query = f"""query partialUserQuery {{
-"""
-
-    for i, user in enumerate(user_logins):
-        user_index = str(i)
-        query += f"""user{user_index}: user(login: "{user}") {{
-            login createdAt name email bio location company
-            socialAccounts(first: 10) {{
-                nodes {{ url }}
-                }}
-            }}"""
-    query += "}" # Closes the GraphQL query string
-    
-    return query
+    query = _compile_aliased_query(
+        "partialUserQuery", "user", "user(login: $login{i}) { ...UserProfile }", (("login", "String!"),), len(user_logins),
+        "$socialSize: Int = 10", _USER_PROFILE_FRAGMENT
+    )
+    return query, _alias_variables("login", user_logins)
 
-def graphQL_build_stargazing_query(user_logins): # Builds and returns a query that fetches (for each user) the repositories they have starred (including the repository name and owner)
+def graphQL_build_stargazing_query(user_logins): # Builds and returns a query (and its variables) that fetches (for each user) the repositories they have starred
     """
     For use in batch requesting the starred repositories of multiple users (enriching followership information)
     Explanation: Batching used to maintain speed while avoiding GraphQL rate limits.
     Explanation: Try requesting starredRepositories { totalCount } to limit querying in a single request.
     """
-    query = f"""query userStargazingQuery {{
-        """
-    for i, user in enumerate(user_logins):
-        user_index = str(i)
-        query += f"""user{user_index}: user(login: "{user}") {{
-            login starredRepositories(first: 100) {{
-                nodes {{ nameWithOwner }}
-                pageInfo {{ endCursor hasNextPage }}
-                }}
-            }}"""
-        query += "}" # Closes the GraphQL query string
-    
-    return query
+    query = _compile_aliased_query(
+        "userStargazingQuery", "user",
+        """user(login: $login{i}) {
+            login starredRepositories(first: 100) {
+                nodes { nameWithOwner stargazerCount }
+                pageInfo { endCursor hasNextPage }
+            }
+        }""",
+        (("login", "String!"),), len(user_logins)
+    )
+    return query, _alias_variables("login", user_logins)
 
 def graphQL_repo_insights_query(login): # Returns a query for repositories owned by a user, including users that forked and starred each repository
     return f"""query userReposInsightsQuery($login: String!, $repoCursor: String) {{
@@ -148,46 +159,223 @@ def graphQL_repo_insights_query(login): # Returns a query for repositories owned
     }}
     """
 
-def graphQL_organization_info_query(batch): # Returns a query for organizations, including members and repositories
-    var_decl = ", ".join([f"$repoCursor{idx}: String, $memberCursor{idx}: String" for idx in range(len(batch))])
-    query = f"""query({var_decl}) {{
-        """
-    
-    for i, org in enumerate(batch):
-        query += f"""org{i}: organization(login: "{org}") {{
-            login name email location websiteUrl createdAt isVerified twitterUsername
-            repositories(first: 100, after: $repoCursor{i}) {{
-                nodes {{ name description }}
-                pageInfo {{ hasNextPage endCursor }}
-            }}
-            membersWithRole(first: 100, after: $memberCursor{i}) {{
-                nodes {{
-                    login name email location
-                    socialAccounts(first: 10) {{
-                        nodes {{ url }}
-                    }}
-                    createdAt company bio
-                }}
-                pageInfo {{ hasNextPage endCursor }}
-            }}
-        }}"""
-    query += "}" # Closes the GraphQL query string
-    
-    return query
-
-def graphQL_organization_membership_query(batch): # Returns a query for organizations, including members and repositories
-    var_decl = ", ".join([f"$memberCursor{idx}: String" for idx in range(len(batch))])
-    query = f"""query({var_decl}) {{
-        """
-    
-    for i, org in enumerate(batch):
-        query += f"""org{i}: organization(login: "{org}") {{
+def graphQL_organization_info_query(batch): # Returns a query (and its login variables) for organizations, including members (with their role) and repositories
+    """
+    Each organization alias (org0, org1, ...) takes $login{i}, $repoCursor{i} and $memberCursor{i}; the caller adds the cursors.
+    $includeRepos{i} / $includeMembers{i} drop a connection from the query once it is exhausted, while the other one keeps paging.
+    Members are requested as edges, since the member's role (ADMIN / MEMBER) is a field of the edge, not of the user.
+    """
+    query = _compile_aliased_query(
+        "organizationInfoQuery", "org",
+        """organization(login: $login{i}) {
+            id login name email location websiteUrl createdAt isVerified twitterUsername
+            repositories(first: 100, after: $repoCursor{i}) @include(if: $includeRepos{i}) {
+                nodes { name description stargazerCount forkCount }
+                pageInfo { hasNextPage endCursor }
+            }
+            membersWithRole(first: 100, after: $memberCursor{i}) @include(if: $includeMembers{i}) {
+                edges { role node { ...UserProfile } }
+                pageInfo { hasNextPage endCursor }
+            }
+        }""",
+        (("login", "String!"), ("repoCursor", "String"), ("memberCursor", "String"), ("includeRepos", "Boolean = true"), ("includeMembers", "Boolean = true")), len(batch),
+        "$socialSize: Int = 10", _USER_PROFILE_FRAGMENT
+    )
+    return query, _alias_variables("login", batch)
+
+def graphQL_organization_membership_query(batch): # Returns a query (and its login variables) for the member logins of organizations
+    """
+    Each organization alias (org0, org1, ...) takes $login{i} and $memberCursor{i}; the caller adds the cursors.
+    """
+    query = _compile_aliased_query(
+        "organizationMembershipQuery", "org",
+        """organization(login: $login{i}) {
             login
-            membersWithRole(first: 100, after: $memberCursor{i}) {{
-                nodes {{ login }}
+            membersWithRole(first: 100, after: $memberCursor{i}) {
+                nodes { login }
+                pageInfo { hasNextPage endCursor }
+            }
+        }""",
+        (("login", "String!"), ("memberCursor", "String")), len(batch)
+    )
+    return query, _alias_variables("login", batch)
+
+def graphQL_followership_query(): # Returns a query for one page of a user's following and followers (either side can be skipped once exhausted)
+    return """
+    query followershipQuery($login: String!, $pageSize: Int = 100, $socialSize: Int = 10, $followingCursor: String, $followersCursor: String, $includeFollowing: Boolean = true, $includeFollowers: Boolean = true) {
+        user(login: $login) {
+            login
+            following(first: $pageSize, after: $followingCursor) @include(if: $includeFollowing) {
+                pageInfo { hasNextPage endCursor }
+                nodes {
+                    id login createdAt name email bio location company
+                    socialAccounts(first: $socialSize) {
+                        nodes { url }
+                    }
+                }
+            }
+            followers(first: $pageSize, after: $followersCursor) @include(if: $includeFollowers) {
+                pageInfo { hasNextPage endCursor }
+                nodes {
+                    id login createdAt name email bio location company
+                    socialAccounts(first: $socialSize) {
+                        nodes { url }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+def graphQL_build_commit_history_query(batch): # Builds and returns a query (and its variables) that pages the default-branch commit history of several repositories at once
+    """
+    For use in bulk commit author extraction (Author Search). batch is a list of (owner, name) tuples; each repository gets
+    its own alias (repo0, repo1, ...) and its own cursor/page size variables so repositories can advance independently.
+    """
+    query = _compile_aliased_query(
+        "commitHistoryQuery", "repo",
+        """repository(owner: $owner{i}, name: $name{i}) {
+            nameWithOwner
+            defaultBranchRef {
+                target {
+                    ... on Commit {
+                        history(first: $historySize{i}, after: $historyCursor{i}) {
+                            pageInfo { hasNextPage endCursor }
+                            nodes {
+                                author { name email user { login } }
+                                committer { name email user { login } }
+                            }
+                        }
+                    }
+                }
+            }
+        }""",
+        (("owner", "String!"), ("name", "String!"), ("historyCursor", "String"), ("historySize", "Int = 100")), len(batch)
+    )
+    variables = _alias_variables("owner", [owner for owner, _ in batch])
+    variables.update(_alias_variables("name", [name for _, name in batch]))
+    return query, variables
+
+def graphQL_repository_info_query(): # Returns a query for repository metadata
+    return """
+    query repositoryInfoQuery($owner: String!, $name: String!) {
+        repository(owner: $owner, name: $name) {
+            id nameWithOwner description url homepageUrl createdAt pushedAt
+            isFork isArchived stargazerCount forkCount
+            owner { login }
+            parent { nameWithOwner }
+            primaryLanguage { name }
+            licenseInfo { spdxId }
+            repositoryTopics(first: 20) { nodes { topic { name } } }
+        }
+    }
+    """
+
+def graphQL_repository_stargazers_query(): # Returns a query for one page of a repository's stargazers
+    return """
+    query repositoryStargazersQuery($owner: String!, $name: String!, $pageSize: Int = 100, $socialSize: Int = 10, $cursor: String) {
+        repository(owner: $owner, name: $name) {
+            stargazers(first: $pageSize, after: $cursor) {
+                pageInfo { hasNextPage endCursor }
+                nodes {
+                    id login createdAt name email bio location company
+                    socialAccounts(first: $socialSize) {
+                        nodes { url }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+def graphQL_repository_forks_query(): # Returns a query for one page of a repository's forks and their owners
+    return """
+    query repositoryForksQuery($owner: String!, $name: String!, $pageSize: Int = 100, $socialSize: Int = 10, $cursor: String) {
+        repository(owner: $owner, name: $name) {
+            forks(first: $pageSize, after: $cursor) {
+                pageInfo { hasNextPage endCursor }
+                nodes {
+                    nameWithOwner
+                    owner {
+                        login
+                        ... on User {
+                            createdAt name email bio location company
+                            socialAccounts(first: $socialSize) {
+                                nodes { url }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+# Connections tracked by Watch mode per target kind: {connection: (extra arguments, identifying node field)}. Newest-first orderings are
+# used wherever GitHub supports them, so new entities appear on the first page.
+WATCH_CONNECTIONS = {
+    "user": {
+        "followers": ("", "login"),
+        "following": ("", "login"),
+        "repositories": (", ownerAffiliations: OWNER, orderBy: {field: CREATED_AT, direction: DESC}", "nameWithOwner"),
+        "starredRepositories": (", orderBy: {field: STARRED_AT, direction: DESC}", "nameWithOwner"),
+    },
+    "organization": {
+        "membersWithRole": ("", "login"),
+        "repositories": (", orderBy: {field: CREATED_AT, direction: DESC}", "nameWithOwner"),
+    },
+    "repository": {
+        "stargazers": (", orderBy: {field: STARRED_AT, direction: DESC}", "login"),
+        "forks": (", orderBy: {field: CREATED_AT, direction: DESC}", "nameWithOwner"),
+    },
+}
+
+def graphQL_build_watch_query(kind, targets): # Builds and returns a query (and its target variables) for one page of every watched connection of several targets
+    """
+    For use in Watch mode refreshes. Each target gets its own alias (target0, target1, ...) and, per connection, its own cursor and
+    @include flag, so connections that reached already-known entities are skipped while the others keep paging.
+    Only identifying fields (login / nameWithOwner) and totalCount are requested, which keeps refreshes cheap.
+    """
+    connections = WATCH_CONNECTIONS[kind]
+    selection = "\n".join(
+        f"""{name}(first: $pageSize, after: ${name}Cursor{{i}}{arguments}) @include(if: $with_{name}{{i}}) {{
+                totalCount
                 pageInfo {{ hasNextPage endCursor }}
-            }}
-        }}"""
-    query += "}" # Closes the GraphQL query string
-    
-    return query
\ No newline at end of file
+                nodes {{ {field} }}
+            }}""" for name, (arguments, field) in connections.items()
+    )
+    alias_vars = tuple((f"{name}Cursor", "String") for name in connections) + tuple((f"with_{name}", "Boolean!") for name in connections)
+    if kind == "repository":
+        root, target_vars = "repository(owner: $owner{i}, name: $name{i})", (("owner", "String!"), ("name", "String!"))
+        variables = _alias_variables("owner", [t.split("/", 1)[0] for t in targets])
+        variables.update(_alias_variables("name", [t.split("/", 1)[-1] for t in targets]))
+    else:
+        root, target_vars = f"{kind}(login: $login{{i}})", (("login", "String!"),)
+        variables = _alias_variables("login", targets)
+    query = _compile_aliased_query(
+        f"watch{kind.capitalize()}Query", "target", f"{root} {{\n{selection}\n}}", target_vars + alias_vars, len(targets), "$pageSize: Int = 100"
+    )
+    return query, variables
+
+def graphQL_nodes_query(): # Returns a query that re-fetches users, organizations and repositories by their GraphQL node IDs
+    """
+    Node IDs are stable across renames, so entities collected earlier (cached or stored) can be refreshed without re-resolving logins.
+    GitHub accepts up to 100 IDs per nodes() call; unknown or deleted IDs come back as null (with an error entry).
+    """
+    return """
+    query nodesQuery($ids: [ID!]!, $socialSize: Int = 10) {
+        nodes(ids: $ids) {
+            __typename
+            ... on User { ...UserProfile }
+            ... on Organization { id login name email location websiteUrl createdAt isVerified twitterUsername }
+            ... on Repository {
+                id nameWithOwner description url homepageUrl createdAt pushedAt
+                isFork isArchived stargazerCount forkCount
+                owner { login }
+                parent { nameWithOwner }
+                primaryLanguage { name }
+                licenseInfo { spdxId }
+                repositoryTopics(first: 20) { nodes { topic { name } } }
+            }
+        }
+    }""" + _USER_PROFILE_FRAGMENT
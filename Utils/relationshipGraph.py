@@ -0,0 +1,223 @@
+# Utils/relationshipGraph.py
+import numpy as np
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+## NOTES: Every login, org and repo is mapped to one integer ID in a shared ID space; node_kinds records which kind each ID is.
+## Edges are stored per edge type as CSR arrays (indptr, indices) in both directions, so "who does X follow" and "who follows X"
+## are both a single slice. Edges are buffered in compact array('q') buffers and only converted to CSR on build().
+## repo_insights only identifies the owner of the forked/starred repos, so those edges point at the owner's aggregate repo node "{owner}/*".
+
+USER, ORGANIZATION, REPOSITORY = 0, 1, 2
+NODE_KINDS = {"user": USER, "organization": ORGANIZATION, "repository": REPOSITORY}
+EDGE_TYPES = {
+    "follow": ("user", "user"),
+    "star": ("user", "repository"),
+    "member": ("user", "organization"),
+    "fork": ("user", "repository"),
+}
+
+class RelationshipGraph:
+    """
+    Compact in-memory graph of users, organizations and repositories.
+    Follow/star/member/fork edges are held as NumPy CSR adjacency so degree, common-neighbor and k-hop queries are vectorized.
+    """
+    def __init__(self):
+        self._ids: Dict[Tuple[int, str], int] = {}
+        self.names: List[str] = []
+        self._kinds = array('b')
+        self._edge_buffers = {edge_type: (array('q'), array('q')) for edge_type in EDGE_TYPES}
+        self._csr: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        self._built = False
+
+    # ================== CONSTRUCTION =====================
+
+    def node_id(self, kind: str, name: str) -> int:
+        """Returns the integer ID for (kind, name), assigning a new one if unseen. Names are matched case-insensitively (GitHub logins are)."""
+        key = (NODE_KINDS[kind], name.lower())
+        node = self._ids.get(key)
+        if node is None:
+            node = len(self.names)
+            self._ids[key] = node
+            self.names.append(name)
+            self._kinds.append(NODE_KINDS[kind])
+            self._built = False
+        return node
+
+    def lookup(self, kind: str, name: str) -> Optional[int]:
+        """Returns the integer ID for (kind, name) or None if the node is not in the graph."""
+        return self._ids.get((NODE_KINDS[kind], name.lower()))
+
+    def add_edge(self, edge_type: str, src: str, dst: str) -> None:
+        src_kind, dst_kind = EDGE_TYPES[edge_type]
+        sources, targets = self._edge_buffers[edge_type]
+        sources.append(self.node_id(src_kind, src))
+        targets.append(self.node_id(dst_kind, dst))
+        self._built = False
+
+    def add_records(self, records: Iterable[Dict], target: Optional[str] = None) -> "RelationshipGraph":
+        """
+        Inputs: Normalized user/member dicts (as produced by the search modules) and the target login they were collected for.
+        Outputs: self (for chaining).
+        Method: Converts the ad-hoc relationship fields into typed edges:
+        'relation' (follower/following/mutual → follow), 'stargazing' (→ star), 'organizations' (→ member), 'repo_insights' (→ fork/star).
+        """
+        for record in records:
+            if not record:
+                continue
+            login = record.get("login")
+            if not login:
+                continue
+            self.node_id("user", login)
+
+            relation = record.get("relation")
+            if target and relation in ("follower", "mutual"):
+                self.add_edge("follow", login, target)
+            if target and relation in ("following", "mutual"):
+                self.add_edge("follow", target, login)
+
+            for repo in record.get("stargazing") or []:
+                if isinstance(repo, str) and repo:
+                    self.add_edge("star", login, repo)
+
+            for org in record.get("organizations") or []:
+                if org:
+                    self.add_edge("member", login, org)
+
+            for insight in record.get("repo_insights") or []:
+                other, relation_info = insight[0], insight[1].get("relation", "")
+                if "forked" in relation_info:
+                    self.add_edge("fork", other, f"{login}/*")
+                if "starred" in relation_info:
+                    self.add_edge("star", other, f"{login}/*")
+        return self
+
+    def build(self) -> "RelationshipGraph":
+        """Converts the edge buffers into out/in CSR arrays (duplicate edges removed). Called lazily by every query."""
+        if self._built:
+            return self
+        node_count = len(self.names)
+        for edge_type, (sources, targets) in self._edge_buffers.items():
+            src = np.frombuffer(sources, dtype=np.int64).astype(np.int64, copy=False) if len(sources) else np.empty(0, dtype=np.int64)
+            dst = np.frombuffer(targets, dtype=np.int64).astype(np.int64, copy=False) if len(targets) else np.empty(0, dtype=np.int64)
+            if src.size:
+                pairs = np.unique(src * node_count + dst) # Dedupes edges and sorts by (src, dst) in one pass
+                src, dst = pairs // node_count, pairs % node_count
+            self._csr[(edge_type, "out")] = _to_csr(src, dst, node_count)
+            self._csr[(edge_type, "in")] = _to_csr(dst, src, node_count)
+        self._built = True
+        return self
+
+    # ================== QUERIES =====================
+
+    @property
+    def node_kinds(self) -> np.ndarray:
+        return np.frombuffer(self._kinds, dtype=np.int8)
+
+    def edge_count(self, edge_type: str) -> int:
+        return int(self._adjacency(edge_type, "out")[1].size)
+
+    def degree(self, edge_type: str, direction: str = "out", nodes: Union[None, int, Iterable[int]] = None) -> np.ndarray:
+        """
+        Inputs: Edge type, direction ('out', 'in' or 'both') and optional node IDs.
+        Outputs: Degree array (for all nodes, or for the given nodes).
+        Method: Differences of the CSR indptr array.
+        """
+        if direction == "both":
+            return self.degree(edge_type, "out", nodes) + self.degree(edge_type, "in", nodes)
+        indptr, _ = self._adjacency(edge_type, direction)
+        degrees = np.diff(indptr)
+        return degrees if nodes is None else degrees[np.asarray(nodes, dtype=np.int64)]
+
+    def neighbors(self, edge_type: str, node: int, direction: str = "out") -> np.ndarray:
+        """Returns the sorted neighbor IDs of one node."""
+        if direction == "both":
+            return np.union1d(self.neighbors(edge_type, node, "out"), self.neighbors(edge_type, node, "in"))
+        indptr, indices = self._adjacency(edge_type, direction)
+        return indices[indptr[node]:indptr[node + 1]]
+
+    def common_neighbors(self, edge_type: str, a: int, b: int, direction: str = "out") -> np.ndarray:
+        """Returns neighbor IDs shared by nodes a and b (e.g. repos both starred, orgs both belong to)."""
+        return np.intersect1d(self.neighbors(edge_type, a, direction), self.neighbors(edge_type, b, direction), assume_unique=True)
+
+    def common_neighbor_counts(self, edge_type: str, node: int, direction: str = "out") -> np.ndarray:
+        """
+        Inputs: Edge type, node ID and direction ('out', 'in' or 'both').
+        Outputs: Array of length node_count with the number of neighbors every other node shares with node (0 for node itself).
+        Method: Gathers the reverse neighbors of all of node's neighbors in one vectorized slice and counts them with bincount
+                (each (node, neighbor) pair once, so a neighbor linked in both directions is not counted twice).
+        """
+        node_count = len(self.names)
+        neighbors = self.neighbors(edge_type, node, direction)
+        reverse = {"out": ["in"], "in": ["out"], "both": ["out", "in"]}[direction]
+        pairs = np.unique(np.concatenate([reached * node_count + sources for sources, reached in
+                                          (self._gather_pairs(edge_type, d, neighbors) for d in reverse)]))
+        counts = np.bincount(pairs // node_count, minlength=node_count)
+        counts[node] = 0
+        return counts
+
+    def k_hop(self, edge_types: Union[str, Iterable[str]], seeds: Iterable[int], k: int, direction: str = "out") -> Dict[int, np.ndarray]:
+        """
+        Inputs: Edge type(s), seed node IDs, hop count and direction ('out', 'in' or 'both').
+        Outputs: Dict of {hop: array of node IDs first reached at that hop} (hop 0 is the seeds).
+        Method: Breadth-first expansion where each hop gathers every frontier node's neighbors at once and filters them with a visited mask.
+        """
+        edge_types = [edge_types] if isinstance(edge_types, str) else list(edge_types)
+        directions = ["out", "in"] if direction == "both" else [direction]
+        visited = np.zeros(len(self.names), dtype=bool)
+        frontier = np.unique(np.asarray(list(seeds), dtype=np.int64))
+        visited[frontier] = True
+        hops = {0: frontier}
+
+        for hop in range(1, k + 1):
+            if not frontier.size:
+                break
+            reached = np.concatenate([self._gather(edge_type, d, frontier) for edge_type in edge_types for d in directions])
+            reached = np.unique(reached)
+            frontier = reached[~visited[reached]]
+            visited[frontier] = True
+            hops[hop] = frontier
+        return hops
+
+    def ids_of_kind(self, kind: str) -> np.ndarray:
+        return np.flatnonzero(self.node_kinds == NODE_KINDS[kind])
+
+    def names_of(self, nodes: Iterable[int]) -> List[str]:
+        return [self.names[node] for node in np.asarray(nodes, dtype=np.int64)]
+
+    # ================== INTERNALS =====================
+
+    def _adjacency(self, edge_type: str, direction: str) -> Tuple[np.ndarray, np.ndarray]:
+        self.build()
+        return self._csr[(edge_type, direction)]
+
+    def _gather(self, edge_type: str, direction: str, nodes: np.ndarray) -> np.ndarray:
+        """Concatenates the CSR rows of all given nodes without a Python loop."""
+        return self._gather_pairs(edge_type, direction, nodes)[1]
+
+    def _gather_pairs(self, edge_type: str, direction: str, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (source node of each gathered edge, neighbor reached) for the CSR rows of all given nodes."""
+        indptr, indices = self._adjacency(edge_type, direction)
+        nodes = np.asarray(nodes, dtype=np.int64)
+        starts = indptr[nodes]
+        lengths = indptr[nodes + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # Position i of the output reads indices[starts[row] + (i - first output position of row)]
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return np.repeat(nodes, lengths), indices[offsets + np.arange(total)]
+
+def _to_csr(rows: np.ndarray, cols: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=node_count), out=indptr[1:])
+    return indptr, cols[order].astype(np.int64, copy=False)
+
+def build_relationship_graph(records: Iterable[Dict], target: Optional[str] = None) -> RelationshipGraph:
+    """
+    Inputs: Search output records and the target login (for 'relation' annotated followership records).
+    Outputs: Built RelationshipGraph.
+    Method: RelationshipGraph.add_records followed by build().
+    """
+    return RelationshipGraph().add_records(records, target).build()
@@ -0,0 +1,139 @@
+# Utils/repositoryRequests.py
+from typing import Callable, Dict, List, Optional, Tuple
+from .queries import graphQL_build_commit_history_query
+from .sendRequests import send_graphql, send_rest, stream_graphql
+from .searchBudget import BudgetExhausted
+
+def _split_repo(target: str) -> Tuple[str, str]:
+    """Splits 'owner/name' (or a github.com URL) into (owner, name)."""
+    path = target.strip().rstrip("/").split("github.com/")[-1]
+    owner, _, name = path.partition("/")
+    return owner, name.split("/")[0].removesuffix(".git")
+
+def commit_history_request(
+    token: str,
+    batch: List[str],
+    max_commits: int,
+    on_page: Callable[[str, List[Dict]], None]
+    ) -> Dict[str, int]:
+    """
+    Inputs: Personal access token, batch of repositories ('owner/name'), commit cap per repository, and a callback receiving (repo, commit nodes) for every page.
+    Outputs: Dict of {repo: commits scanned}.
+    Method: Aliased GraphQL requests that page the default-branch history of every repository in the batch together; repositories that are done or
+            capped are dropped from later queries so each request only carries repositories that still have pages left.
+    Information (per Commit): Author and committer name, email and linked GitHub login.
+    """
+    state = {repo: {"cursor": None, "scanned": 0} for repo in batch}
+    active = list(batch)
+    
+    while active:
+        query, variables = graphQL_build_commit_history_query([_split_repo(repo) for repo in active])
+        for idx, repo in enumerate(active):
+            variables[f"historyCursor{idx}"] = state[repo]["cursor"]
+            variables[f"historySize{idx}"] = min(100, max_commits - state[repo]["scanned"])
+        
+        try:
+            data = send_graphql(token, query, variables).get("data") or {} # Missing/renamed repositories come back as null aliases with errors; they are skipped
+        except BudgetExhausted:
+            break # Search budget spent: keep the commits scanned so far
+        
+        still_active = []
+        for idx, repo in enumerate(active):
+            repo_data = data.get(f"repo{idx}") or {}
+            history = (((repo_data.get("defaultBranchRef") or {}).get("target") or {}).get("history")) or {}
+            nodes = history.get("nodes") or []
+            
+            if nodes:
+                on_page(repo, nodes)
+            state[repo]["scanned"] += len(nodes)
+            
+            page_info = history.get("pageInfo") or {}
+            if page_info.get("hasNextPage") and state[repo]["scanned"] < max_commits:
+                state[repo]["cursor"] = page_info.get("endCursor")
+                still_active.append(repo)
+        active = still_active
+    
+    return {repo: s["scanned"] for repo, s in state.items()}
+
+def _normalize_repository(repo: Dict) -> Dict:
+    """Flattens the nested fields of a repository info node (repository info query or nodes query) in place and returns it."""
+    repo["owner"] = (repo.get("owner") or {}).get("login")
+    repo["parent"] = (repo.get("parent") or {}).get("nameWithOwner")
+    repo["primaryLanguage"] = (repo.get("primaryLanguage") or {}).get("name")
+    repo["licenseInfo"] = (repo.get("licenseInfo") or {}).get("spdxId")
+    repo["repositoryTopics"] = [n["topic"]["name"] for n in (repo.get("repositoryTopics") or {}).get("nodes") or [] if n]
+    return repo
+
+def repository_info_request(token: str, query: str, target: str) -> Optional[Dict]:
+    """
+    Inputs: Personal access token, repository info query, and repository ('owner/name').
+    Outputs: Flattened repository metadata dict (None if the repository does not resolve).
+    Method: Single request to the GitHub GraphQL endpoint.
+    Information (per Repository): nameWithOwner, description, URLs, dates, fork/archive flags, star and fork counts, owner, parent, language, license, topics.
+    """
+    owner, name = _split_repo(target)
+    repo = (send_graphql(token, query, {"owner": owner, "name": name}).get("data") or {}).get("repository")
+    if not repo:
+        return None
+    return _normalize_repository(repo)
+
+def repository_connection_request(token: str, query: str, target: str, connection: str, max_nodes: int) -> List[Dict]:
+    """
+    Inputs: Personal access token, connection query (stargazers/forks), repository ('owner/name'), connection name, and node cap.
+    Outputs: List of raw connection nodes.
+    Method: Cursor pagination of a single repository connection, so each connection of each repository can be paged by its own worker.
+            Pages are parsed incrementally (stream_graphql), so node lists are built while the response is still downloading.
+    """
+    owner, name = _split_repo(target)
+    variables = {"owner": owner, "name": name, "cursor": None}
+    nodes: List[Dict] = []
+    nodes_prefix = f"data.repository.{connection}.nodes.item"
+    page_info_prefix = f"data.repository.{connection}.pageInfo"
+    
+    while len(nodes) < max_nodes:
+        variables["pageSize"] = min(100, max_nodes - len(nodes))
+        page_info = {}
+        errors = []
+        
+        try:
+            for prefix, value in stream_graphql(token, query, variables, (nodes_prefix, page_info_prefix, "errors.item")):
+                if prefix == nodes_prefix:
+                    if value:
+                        nodes.append(value)
+                elif prefix == page_info_prefix:
+                    page_info = value or {}
+                else:
+                    errors.append(value)
+        except BudgetExhausted:
+            break # Search budget spent: keep the pages collected so far
+        
+        if errors:
+            raise RuntimeError(f"GraphQL error: {errors}")
+        
+        if not page_info.get("hasNextPage"):
+            break
+        variables["cursor"] = page_info.get("endCursor")
+    
+    return nodes[:max_nodes]
+
+def repository_contributors_request(token: str, target: str, max_contributors: int) -> List[Dict]:
+    """
+    Inputs: Personal access token, repository ('owner/name'), and contributor cap.
+    Outputs: List of {login, type, contributions} dicts ordered by number of contributions.
+    Method: Paginated requests to the GitHub REST contributors endpoint (the GraphQL API has no contributors connection).
+    """
+    owner, name = _split_repo(target)
+    url = f"/repos/{owner}/{name}/contributors?per_page=100"
+    contributors: List[Dict] = []
+    
+    while url and len(contributors) < max_contributors:
+        try:
+            response, body = send_rest(token, url, "repositoryContributors")
+        except BudgetExhausted:
+            break # Search budget spent: keep the pages collected so far
+        if response.status_code == 204 or not body: # Empty repository
+            break
+        contributors.extend({"login": c.get("login"), "type": c.get("type"), "contributions": c.get("contributions")} for c in body if c.get("login"))
+        url = response.links.get("next", {}).get("url")
+    
+    return contributors[:max_contributors]
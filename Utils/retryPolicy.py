@@ -0,0 +1,237 @@
+# Utils/retryPolicy.py
+import random, threading, time, requests
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from .searchBudget import BudgetExhausted
+
+## NOTES: Every HTTP call made through Utils/sendRequests.py runs through request_with_retries, so one policy decides what is retried,
+## how long to wait, and when to stop:
+##  - Transient failures (connection resets, timeouts, truncated bodies, 500/502/503/504) back off exponentially with full jitter.
+##  - Rate-limited responses (429, or 403 with Retry-After / x-ratelimit-remaining: 0 / a "secondary rate limit" message) wait exactly as long
+##    as GitHub asks: Retry-After first, then x-ratelimit-reset. With a multi-token TokenPool the pool parks the token and the retry goes
+##    out immediately on another one. GitHub API classes honor any wait GitHub reports, up to a full primary reset (close to an hour), as
+##    a single-token crawl always did; only profile pages and third-party links give up on long waits (max_wait).
+##  - Each request class ("graphql", "core" for REST, "search", "page" for profile pages, "link" for social links) has its own attempt cap and retry budget: retries
+##    are paid from a bucket refilled by a fraction of the requests sent, so a degraded API cannot turn a long crawl into a retry storm.
+##  - A circuit breaker per host opens after consecutive server failures and pauses every worker (instead of failing them) until a single
+##    probe request succeeds. Cool-downs double while GitHub stays degraded.
+## Waits never outlast a search's SearchBudget: if the deadline would pass first, BudgetExhausted is raised instead of sleeping.
+
+RETRYABLE_STATUS = {500, 502, 503, 504}
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)
+
+class RetryPolicy:
+    """Attempt cap and backoff parameters of one request class."""
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0, max_wait: Optional[float] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait # Longest server-requested wait (Retry-After / rate-limit reset) that is honored rather than given up on (None: any)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter: uniform(0, min(max_delay, base_delay * 2^attempt))."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class RetryBudget:
+    """Thread-safe token bucket of retries: starts with min_retries, every request adds ratio of a retry, every retry spends one."""
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, max_retries: int = 100):
+        self.ratio = ratio
+        self.max_retries = max_retries
+        self.balance = float(min_retries)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.max_retries, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+class CircuitBreaker:
+    """
+    Per-host breaker. Closed: requests flow. Open (after failure_threshold consecutive server failures): callers wait out the cool-down.
+    Half-open: one probe request is let through; success closes the breaker, failure re-opens it with a doubled cool-down.
+    """
+    def __init__(self, host: str, failure_threshold: int = 5, cooldown: float = 30.0, max_cooldown: float = 300.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_until == 0.0:
+            return "closed"
+        return "open" if time.time() < self.opened_until else "half-open"
+
+    def wait(self, budget=None) -> None:
+        """Blocks while the breaker is open (or another caller is probing); raises BudgetExhausted if the budget's deadline comes first."""
+        announced = False
+        while True:
+            with self._lock:
+                now = time.time()
+                if self.opened_until == 0.0:
+                    return
+                if now >= self.opened_until and not self._probing:
+                    self._probing = True # This caller is the half-open probe
+                    return
+                delay = max(0.5, self.opened_until - now) if now < self.opened_until else 0.5
+            remaining = budget.remaining_seconds() if budget is not None else None
+            if remaining is not None and remaining < delay:
+                raise BudgetExhausted(f"{self.host} is degraded and the search deadline arrives before it recovers")
+            if not announced:
+                print(f"{self.host} appears degraded; pausing requests for {delay:.0f} seconds...")
+                announced = True
+            time.sleep(min(delay, 5.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_until:
+                print(f"{self.host} recovered; resuming requests.")
+            self.failures, self.opened_until, self._probing, self.cooldown = 0, 0.0, False, self.base_cooldown
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                if self._probing:
+                    self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self.opened_until = time.time() + self.cooldown
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """Ends a probe that neither succeeded nor failed on the server side (e.g. rate limited), letting another caller probe."""
+        with self._lock:
+            self._probing = False
+
+POLICIES: Dict[str, RetryPolicy] = {
+    "graphql": RetryPolicy(max_attempts=5),
+    "core": RetryPolicy(max_attempts=5),
+    "search": RetryPolicy(max_attempts=4, base_delay=2.0),
+    "page": RetryPolicy(max_attempts=3, base_delay=2.0, max_wait=120.0),
+    "link": RetryPolicy(max_attempts=2, base_delay=1.0, max_delay=10.0, max_wait=30.0), # Third-party sites: a dead link should fail fast
+}
+RETRY_BUDGETS: Dict[str, RetryBudget] = {request_class: RetryBudget() for request_class in POLICIES}
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def breaker_for(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """True for 429, and for 403s that carry rate-limit headers or GitHub's secondary rate limit message."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers:
+        return True
+    try:
+        return b"rate limit" in response.content.lower() # 403 bodies are small; other 403s (permissions, SSO) are not retried
+    except Exception:
+        return False
+
+def server_wait_seconds(response: requests.Response) -> Optional[float]:
+    """Seconds GitHub asked the client to wait: Retry-After (seconds or HTTP date), else x-ratelimit-reset when the budget is spent."""
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    reset = response.headers.get("x-ratelimit-reset")
+    if reset and response.headers.get("x-ratelimit-remaining") == "0":
+        return max(0.0, float(reset) - time.time()) + 1.0
+    return None
+
+def request_with_retries(
+    send: Callable[[], requests.Response],
+    request_class: str,
+    host: str,
+    budget = None,
+    rotating_tokens: bool = False
+    ) -> requests.Response:
+    """
+    Inputs: Callable sending one attempt, request class (key of POLICIES), host (circuit breaker key), the search's SearchBudget (if any), and whether
+            rate-limited attempts move to another token (multi-token TokenPool) instead of waiting.
+    Outputs: The first response that is not retryable, or the last response once attempts or the retry budget run out (raise_for_status is left to the caller).
+    Method: Retry loop applying the class's policy, GitHub's requested waits, the class retry budget and the host's circuit breaker. Transient
+            exceptions are re-raised when no retry is left.
+    """
+    policy = POLICIES.get(request_class, POLICIES["core"])
+    retries = RETRY_BUDGETS.get(request_class, RETRY_BUDGETS["core"])
+    breaker = breaker_for(host)
+    retries.deposit()
+    attempt = 0
+
+    while True:
+        breaker.wait(budget)
+        error, response = None, None
+        try:
+            response = send()
+        except TRANSIENT_ERRORS as e:
+            breaker.record_failure()
+            error = e
+        except BaseException:
+            breaker.release_probe() # e.g. BudgetExhausted before sending: never leave the breaker waiting on a probe that was not sent
+            raise
+        else:
+            if response.status_code in RETRYABLE_STATUS:
+                breaker.record_failure()
+            elif is_rate_limited(response):
+                breaker.release_probe() # The server answered; rate limiting says nothing about its health
+            else:
+                breaker.record_success()
+                return response
+
+        attempt += 1
+        if attempt >= policy.max_attempts or not retries.withdraw():
+            if response is not None:
+                return response
+            raise error
+
+        server_wait = server_wait_seconds(response) if response is not None else None
+        if response is not None and is_rate_limited(response):
+            delay = 0.0 if rotating_tokens else (server_wait if server_wait is not None else max(60.0, policy.backoff(attempt))) # GitHub: wait at least a minute on secondary limits without a hint
+        else:
+            delay = server_wait if server_wait is not None else policy.backoff(attempt)
+        if policy.max_wait is not None and delay > policy.max_wait:
+            print(f"{host} asked to wait {delay:.0f} seconds (longer than {policy.max_wait:.0f}); giving up on this request.")
+            if response is not None:
+                return response
+            raise error
+
+        remaining = budget.remaining_seconds() if budget is not None else None
+        if remaining is not None and remaining < delay:
+            if response is not None:
+                response.close()
+            raise BudgetExhausted(f"Retrying {request_class} request would pass the search deadline")
+
+        reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+        if delay:
+            print(f"{reason} from {host}; retrying in {delay:.1f} seconds (attempt {attempt + 1} of {policy.max_attempts})")
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+def retry_status() -> Dict[str, Dict]:
+    """Snapshot of retry budgets and circuit breakers, for logging."""
+    return {
+        "retry_budgets": {request_class: round(b.balance, 1) for request_class, b in RETRY_BUDGETS.items()},
+        "breakers": {host: {"state": b.state, "failures": b.failures} for host, b in _breakers.items()},
+    }
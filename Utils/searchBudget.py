@@ -0,0 +1,90 @@
+# Utils/searchBudget.py
+import threading, time
+from typing import Optional
+
+## NOTES: A SearchBudget bounds one search by wall-clock time (deadline, in seconds from its creation) and/or API points.
+## Points are counted per request sent to the API (1 per GraphQL query or REST call), which matches GitHub's charge for the
+## small, paginated queries this project sends. Profile page scraping is bounded by the deadline only.
+## The budget travels with the token: with_budget(token, budget) returns a BudgetedToken, which Utils/sendRequests.py charges before
+## every request, so every request function and worker thread of a search is bounded without extra arguments. When the budget runs out
+## the request raises BudgetExhausted; paging loops catch it and return what they have collected, and the search returns PartialResults.
+
+class BudgetExhausted(Exception):
+    """Raised instead of sending a request once a search's deadline has passed or its API points are spent."""
+
+class PartialResults(list):
+    """List of search results that were cut short by a SearchBudget. reason says why ("deadline" or "points")."""
+    partial = True
+
+    def __init__(self, records, reason: str):
+        super().__init__(records)
+        self.reason = reason
+
+class SearchBudget:
+    """Thread-safe wall-clock deadline and API-point budget shared by every stage and worker of one search."""
+    def __init__(self, deadline: Optional[float] = None, max_points: Optional[int] = None):
+        self.started = time.monotonic()
+        self.deadline = deadline
+        self.max_points = max_points
+        self.points = 0
+        self.reason = None
+        self._lock = threading.Lock()
+
+    def remaining_seconds(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() - self.started))
+
+    @property
+    def exhausted(self) -> bool:
+        if self.reason is None and self.deadline is not None and self.remaining_seconds() <= 0:
+            self.reason = "deadline"
+        return self.reason is not None
+
+    def spend(self, points: int = 1) -> bool:
+        """Reserves points for a request. Returns False (and marks the budget exhausted) if the deadline passed or the points are spent."""
+        with self._lock:
+            if self.exhausted:
+                return False
+            if self.max_points is not None and self.points + points > self.max_points:
+                self.reason = "points"
+                return False
+            self.points += points
+            return True
+
+    def charge(self, points: int = 1) -> None:
+        """Like spend(), but raises BudgetExhausted instead of returning False."""
+        if not self.spend(points):
+            raise BudgetExhausted(f"Search budget exhausted ({self.reason}) after {self.points} points and {time.monotonic() - self.started:.1f} seconds")
+
+    def result(self, records):
+        """Returns records unchanged, or as PartialResults when the budget ran out during the search."""
+        return PartialResults(records or [], self.reason) if self.exhausted else records
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        limits = ", ".join(filter(None, [f"deadline {self.deadline:.0f} s" if self.deadline else "", f"{self.max_points} points" if self.max_points else ""]))
+        state = f"PARTIAL ({self.reason})" if self.exhausted else "complete"
+        return f"Search budget ({limits or 'unbounded'}): {self.points} points in {elapsed:.1f} s, results {state}"
+
+class BudgetedToken:
+    """A token (or TokenPool) bound to the SearchBudget of the search it is used in. Resolved by Utils/sendRequests.py."""
+    def __init__(self, token, budget: SearchBudget):
+        self.token = token
+        self.budget = budget
+
+def with_budget(token, budget: Optional[SearchBudget]):
+    """Returns the token bound to budget (or the token unchanged when there is no budget)."""
+    if budget is None:
+        return token
+    if isinstance(token, BudgetedToken):
+        token = token.token
+    return BudgetedToken(token, budget)
+
+def mark_partial(records, budget: Optional[SearchBudget]):
+    """Returns records, as PartialResults when a budget was given and ran out."""
+    return budget.result(records) if budget is not None else records
+
+def budget_of(token) -> Optional[SearchBudget]:
+    """Returns the SearchBudget a token is bound to, if any."""
+    return token.budget if isinstance(token, BudgetedToken) else None
@@ -0,0 +1,256 @@
+# Utils/sendRequests.py
+import json, re, threading, time, requests
+from urllib.parse import urlparse
+from collections import deque
+from typing import Dict, Iterable, Iterator, Tuple, Union
+from .tokenPool import TokenPool
+from .searchBudget import BudgetedToken
+from .retryPolicy import request_with_retries, is_rate_limited, server_wait_seconds
+
+## NOTES: Every HTTP call in Utils/ and Modules/ goes through this file, so connection pooling, JSON decoding and response-size
+## accounting happen in one place. Responses are read with stream=True so urllib3's tell() reports the bytes pulled over the wire
+## (compressed size) while len(content) is the decompressed size.
+## orjson (fast JSON) and ijson (incremental JSON) are optional; without them the standard library decoder is used.
+## Wherever a token is accepted, a TokenPool may be passed instead: each request then uses the pooled token with the most headroom,
+## the pool is updated from the response's rate-limit headers, and a rate-limited response is retried once per other token.
+## A token bound to a SearchBudget (Utils/searchBudget.py) is charged one point per request and raises BudgetExhausted once it runs out;
+## the request timeout is also capped at the time left before the budget's deadline.
+## Retries, backoff and circuit breaking for every request (API and profile pages) are decided by Utils/retryPolicy.py.
+
+try:
+    import orjson
+    _loads, _dumps = orjson.loads, orjson.dumps
+    JSON_BACKEND = "orjson"
+except ImportError:
+    _loads, _dumps = json.loads, lambda obj: json.dumps(obj).encode("utf-8")
+    JSON_BACKEND = "json"
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_REST_URL = "https://api.github.com"
+
+session = requests.Session() # Shared connection pool (keep-alive) for every request in the process
+DEFAULT_TIMEOUT = 60 # Seconds without data before a request is treated as a transient failure (and retried)
+
+_OPERATION_NAME = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+class ResponseStats:
+    """Thread-safe per-label totals (and a bounded log of recent requests) of wire bytes, decoded bytes and decode time."""
+    def __init__(self, history: int = 1000):
+        self._lock = threading.Lock()
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self.recent = deque(maxlen=history)
+
+    def record(self, label: str, status: int, wire_bytes: int, decoded_bytes: int, decode_seconds: float) -> None:
+        with self._lock:
+            totals = self.totals.setdefault(label, {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0, "decode_seconds": 0.0})
+            totals["requests"] += 1
+            totals["wire_bytes"] += wire_bytes
+            totals["decoded_bytes"] += decoded_bytes
+            totals["decode_seconds"] += decode_seconds
+            self.recent.append({"label": label, "status": status, "wire_bytes": wire_bytes, "decoded_bytes": decoded_bytes, "decode_seconds": decode_seconds})
+
+    def reset(self) -> None:
+        with self._lock:
+            self.totals.clear()
+            self.recent.clear()
+
+    def summary(self) -> str:
+        with self._lock:
+            requests_made = sum(t["requests"] for t in self.totals.values())
+            wire = sum(t["wire_bytes"] for t in self.totals.values())
+            decoded = sum(t["decoded_bytes"] for t in self.totals.values())
+            decode_time = sum(t["decode_seconds"] for t in self.totals.values())
+        return (f"Requests: {requests_made} | Transferred: {wire / 1_048_576:.2f} MB | Decompressed: {decoded / 1_048_576:.2f} MB"
+                f" | JSON decode ({JSON_BACKEND}): {decode_time:.3f} s")
+
+response_stats = ResponseStats()
+
+def _graphql_headers(token: str) -> dict:
+    return {"Authorization": f"bearer {token}", "Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"}
+
+def _rest_headers(token: str) -> dict:
+    headers = {"Accept": "application/vnd.github+json", "Accept-Encoding": "gzip, deflate"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+def _resource(url: str) -> str:
+    if url.startswith(GITHUB_GRAPHQL_URL):
+        return "graphql"
+    return "search" if "/search/" in url else "core"
+
+def _send(method: str, url: str, token: Union[str, TokenPool, BudgetedToken], headers_for, **kwargs) -> requests.Response:
+    """
+    Sends one request on the pooled session through the retry policy (Utils/retryPolicy.py), resolving a TokenPool to a concrete token for
+    every attempt and feeding the response's rate-limit headers back into the pool; a rate-limited token is parked until its reset and the
+    retry goes out on another token. A BudgetedToken is charged for every attempt (raising BudgetExhausted when its search budget is spent).
+    """
+    budget = None
+    if isinstance(token, BudgetedToken):
+        budget, token = token.budget, token.token
+    resource = _resource(url)
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+    def attempt() -> requests.Response:
+        if budget is not None:
+            budget.charge()
+            remaining = budget.remaining_seconds()
+            if remaining is not None:
+                kwargs["timeout"] = max(1.0, min(kwargs["timeout"], remaining))
+        if not isinstance(token, TokenPool):
+            return session.request(method, url, headers=headers_for(token), stream=True, **kwargs)
+        active = token.acquire(resource)
+        response = session.request(method, url, headers=headers_for(active), stream=True, **kwargs)
+        token.update(active, response.headers)
+        if is_rate_limited(response):
+            token.park(active, resource, time.time() + (server_wait_seconds(response) or 60)) # Retry-After first; the primary reset only when the budget is spent
+        return response
+
+    return request_with_retries(attempt, resource, urlparse(url).netloc, budget, rotating_tokens=isinstance(token, TokenPool) and len(token) > 1)
+
+def _label(query: str, default: str = "graphql") -> str:
+    match = _OPERATION_NAME.match(query)
+    return match.group(1) if match else default
+
+def _wire_bytes(response: requests.Response, decoded_bytes: int) -> int:
+    try:
+        return response.raw.tell() or decoded_bytes
+    except Exception:
+        return decoded_bytes
+
+def _decode(response: requests.Response, label: str):
+    content = response.content
+    started = time.perf_counter()
+    data = _loads(content) if content else None
+    response_stats.record(label, response.status_code, _wire_bytes(response, len(content)), len(content), time.perf_counter() - started)
+    return data
+
+def send_graphql(token: Union[str, TokenPool], query: str, variables: dict = None, label: str = None) -> Dict:
+    """
+    Inputs: Personal access token (or TokenPool), GraphQL query string, variables dictionary, and an optional stats label (defaults to the operation name).
+    Outputs: Decoded GraphQL response payload ({"data": ..., "errors": ...}).
+    Method: POST on the pooled session; the body is encoded and the response decoded with the fast JSON backend and its sizes recorded.
+    """
+    body = _dumps({"query": query, "variables": variables or {}})
+    response = _send("POST", GITHUB_GRAPHQL_URL, token, _graphql_headers, data=body)
+    response.raise_for_status()
+    return _decode(response, label or _label(query))
+
+def send_rest(token: Union[str, TokenPool], url: str, label: str = "rest") -> Tuple[requests.Response, object]:
+    """
+    Inputs: Personal access token (or TokenPool), REST URL (absolute, or a path relative to api.github.com), and a stats label.
+    Outputs: (response, decoded JSON body or None). The response is returned for status codes and Link headers.
+    Method: GET on the pooled session with the fast JSON backend and size accounting.
+    """
+    if url.startswith("/"):
+        url = f"{GITHUB_REST_URL}{url}"
+    response = _send("GET", url, token, _rest_headers)
+    response.raise_for_status()
+    return response, _decode(response, label)
+
+def fetch_page(url: str, label: str = "page", timeout: int = 120) -> requests.Response:
+    """
+    Inputs: URL of a web page and a stats label.
+    Outputs: Response (content already read).
+    Method: GET on the pooled session with retries and size accounting (used for profile page scraping).
+    """
+    response = request_with_retries(lambda: session.get(url, timeout=timeout, stream=True), "page", urlparse(url).netloc)
+    response.raise_for_status()
+    content = response.content
+    response_stats.record(label, response.status_code, _wire_bytes(response, len(content)), len(content), 0.0)
+    return response
+
+def probe_url(url: str, method: str = "HEAD", timeout: int = 10) -> requests.Response:
+    """
+    Inputs: Absolute URL, HTTP method (HEAD, or GET for sites that reject HEAD), and timeout.
+    Outputs: Response of this single hop (redirects are not followed; the body of a GET is not downloaded).
+    Method: Request on the pooled session with the "link" retry policy (used for social link resolution, Utils/linkResolver.py).
+    """
+    response = request_with_retries(
+        lambda: session.request(method, url, allow_redirects=False, timeout=timeout, stream=True), "link", urlparse(url).netloc
+    )
+    response_stats.record("link", response.status_code, 0, 0, 0.0)
+    response.close() # Only the status line and headers are needed
+    return response
+
+# ================== INCREMENTAL DECODING =====================
+
+class _CountingReader:
+    """File-like wrapper over a urllib3 response that counts decompressed bytes handed to the incremental parser."""
+    def __init__(self, raw):
+        self.raw = raw
+        self.decoded_bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0: # ijson probes the stream type with read(0)
+            return b""
+        chunk = self.raw.read(size if size is not None and size > 0 else None, decode_content=True)
+        self.decoded_bytes += len(chunk)
+        return chunk
+
+def _walk(document, prefix: str) -> Iterator:
+    """Fallback for iter_json_items: yields the values at an ijson-style prefix ('data.user.followers.nodes.item') of a decoded document."""
+    values = [document]
+    for part in prefix.split(".") if prefix else []:
+        next_values = []
+        for value in values:
+            if part == "item" and isinstance(value, list):
+                next_values.extend(value)
+            elif isinstance(value, dict) and value.get(part) is not None:
+                next_values.append(value[part])
+        values = next_values
+    return iter(values)
+
+def iter_json_items(source, prefixes: Iterable[str]) -> Iterator[Tuple[str, object]]:
+    """
+    Inputs: JSON source (bytes or a file-like object) and ijson-style prefixes (e.g. 'data.repository.stargazers.nodes.item').
+    Outputs: Generator of (prefix, value) for every value found at one of the prefixes, in document order.
+    Method: With ijson, one streaming pass that builds only the matched values (large 'nodes' arrays never exist as one list);
+            without ijson, a full decode followed by a walk of each prefix.
+    """
+    prefixes = set(prefixes)
+    if ijson is None:
+        document = _loads(source if isinstance(source, (bytes, str)) else source.read())
+        for prefix in prefixes:
+            for value in _walk(document, prefix):
+                yield prefix, value
+        return
+
+    building = None
+    for prefix, event, value in ijson.parse(source):
+        if building is None:
+            if prefix in prefixes:
+                if event in ("start_map", "start_array"):
+                    building = (prefix, ObjectBuilder())
+                    building[1].event(event, value)
+                else:
+                    yield prefix, value
+        else:
+            building[1].event(event, value)
+            if prefix == building[0] and event in ("end_map", "end_array"):
+                yield building[0], building[1].value
+                building = None
+
+def stream_graphql(token: Union[str, TokenPool], query: str, variables: dict, prefixes: Iterable[str], label: str = None) -> Iterator[Tuple[str, object]]:
+    """
+    Inputs: Personal access token (or TokenPool), GraphQL query string, variables dictionary, ijson-style prefixes, and an optional stats label.
+    Outputs: Generator of (prefix, value) pairs (see iter_json_items). Include 'errors.item' in prefixes to receive GraphQL errors.
+    Method: The response body is parsed incrementally while it is downloaded; sizes are recorded once the stream is exhausted.
+    """
+    body = _dumps({"query": query, "variables": variables or {}})
+    response = _send("POST", GITHUB_GRAPHQL_URL, token, _graphql_headers, data=body)
+    response.raise_for_status()
+    reader = _CountingReader(response.raw)
+    started = time.perf_counter()
+    try:
+        yield from iter_json_items(reader if ijson is not None else response.content, prefixes)
+    finally:
+        decoded = reader.decoded_bytes or len(response.content)
+        response_stats.record(label or _label(query), response.status_code, _wire_bytes(response, decoded), decoded, time.perf_counter() - started)
+        response.close()
@@ -0,0 +1,96 @@
+# Utils/tokenPool.py
+import os, threading, time
+from typing import Dict, List, Optional
+
+## NOTES: Budgets are tracked per token and per rate-limit resource ("graphql", "core" for REST, "search"), from the
+## x-ratelimit-* headers GitHub returns on every response. Until a token's first response arrives its budget is unknown and it is
+## assumed to have its full hourly budget, so fresh tokens are preferred.
+## Each request optimistically reserves one point on the chosen token so concurrent workers spread across tokens immediately.
+
+DEFAULT_LIMITS = {"graphql": 5000, "core": 5000, "search": 30}
+
+class TokenPool:
+    """
+    Thread-safe pool of GitHub personal access tokens.
+    Each request is routed to the token with the most remaining budget for its resource; exhausted tokens are parked until their reset.
+    """
+    def __init__(self, tokens: List[str]):
+        tokens = [t.strip() for t in tokens if t and t.strip()]
+        if not tokens:
+            raise ValueError("TokenPool requires at least one token")
+        self.tokens = list(dict.fromkeys(tokens))
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, Dict[str, Dict[str, float]]] = {token: {} for token in self.tokens}
+
+    @classmethod
+    def from_env(cls, fallback: Optional[str] = None) -> Optional["TokenPool"]:
+        """
+        Inputs: Optional fallback token string (comma-separated tokens allowed).
+        Outputs: TokenPool built from GITHUB_API_TOKENS (comma-separated), GITHUB_API_TOKEN, or the fallback; None if none is set.
+        """
+        raw = os.getenv("GITHUB_API_TOKENS") or os.getenv("GITHUB_API_TOKEN") or fallback or ""
+        tokens = [t for t in raw.split(",") if t.strip()]
+        return cls(tokens) if tokens else None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _budget(self, token: str, resource: str) -> Dict[str, float]:
+        return self._budgets[token].setdefault(resource, {"remaining": DEFAULT_LIMITS.get(resource, 5000), "reset": 0.0})
+
+    def acquire(self, resource: str = "graphql") -> str:
+        """
+        Inputs: Rate-limit resource the request will be charged to.
+        Outputs: The token with the most remaining budget (one point is reserved on it).
+        Method: Tokens whose budget is spent are parked until their reset time; if every token is parked, waits for the earliest reset.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                best, best_remaining, earliest_reset = None, -1, None
+                for token in self.tokens:
+                    budget = self._budget(token, resource)
+                    if budget["remaining"] <= 0 and budget["reset"] > now:
+                        earliest_reset = budget["reset"] if earliest_reset is None else min(earliest_reset, budget["reset"])
+                        continue
+                    if budget["remaining"] <= 0: # Reset time has passed: the token is back to a full budget
+                        budget["remaining"] = DEFAULT_LIMITS.get(resource, 5000)
+                    if budget["remaining"] > best_remaining:
+                        best, best_remaining = token, budget["remaining"]
+                if best is not None:
+                    self._budget(best, resource)["remaining"] -= 1
+                    return best
+                wait = max(1.0, (earliest_reset or now + 60) - now)
+
+            print(f"All {len(self.tokens)} tokens exhausted for '{resource}'; waiting {wait:.0f} seconds for the next reset...")
+            time.sleep(min(wait, 60))
+
+    def update(self, token: str, headers) -> None:
+        """
+        Inputs: Token used for a request and the response headers.
+        Outputs: None. Records the remaining budget and reset time reported by GitHub (x-ratelimit-remaining / -reset / -resource).
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        if token not in self._budgets or remaining is None:
+            return
+        resource = headers.get("x-ratelimit-resource") or "core"
+        with self._lock:
+            budget = self._budget(token, resource)
+            budget["remaining"] = int(remaining)
+            budget["reset"] = float(headers.get("x-ratelimit-reset") or budget["reset"])
+
+    def park(self, token: str, resource: str, until: float) -> None:
+        """
+        Marks a token as exhausted for a resource until the given epoch time (e.g. after a rate-limited response).
+        until replaces the recorded reset: a secondary rate limit (403 + Retry-After) is lifted after Retry-After, long before the primary
+        x-ratelimit-reset that update() recorded from the same response.
+        """
+        with self._lock:
+            budget = self._budget(token, resource)
+            budget["remaining"] = 0
+            budget["reset"] = until
+
+    def status(self) -> List[Dict]:
+        """Returns a per-token budget snapshot (tokens masked) for logging."""
+        with self._lock:
+            return [{"token": f"...{token[-4:]}", **{resource: dict(b) for resource, b in self._budgets[token].items()}} for token in self.tokens]
@@ -1,10 +1,25 @@
 # Utils/userRequests.py
-import requests
 from typing import List, Dict, Optional, Tuple
 from .dataTransformations import compare_user_relations, starred_repo_owners
-from .queries import graphQL_repo_insights_query
+from .queries import graphQL_repo_insights_query, graphQL_build_bulk_user_query
+from .entityCache import EntityCache, resolve_cache
+from .sendRequests import send_graphql, stream_graphql
+from .searchBudget import BudgetExhausted
+from .pipeline import OrderedStage
 
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+def _as_set(value) -> set:
+    """
+    Inputs: A record field: None, a string, a collection of strings, or a raw GraphQL {"nodes": [...]} connection.
+    Outputs: The field's values as a set (a connection's node URLs or logins; never its keys).
+    """
+    if not value:
+        return set()
+    if isinstance(value, str):
+        return {value}
+    if isinstance(value, dict):
+        nodes = value.get("nodes") or []
+        return {node.get("url") or node.get("login") if isinstance(node, dict) else node for node in nodes} - {None, ""}
+    return set(value)
 
 def _normalize_user(node: Dict) -> Dict:
     """
@@ -13,8 +28,7 @@ def _normalize_user(node: Dict) -> Dict:
     Method: Normalizing URLs to eliminate erroneous duplicates in later steps, reduce dimensionality of objects by discarding less relevant information, and reorganizes dict value ordering based on significance for the written output form.
     Information (per User): Convert GraphQL user node to a flat dict including socialAccounts URLs.
     """
-    social_nodes = (node.get("socialAccounts") or {}).get("nodes") or []
-    social_urls = {n.get("url") for n in social_nodes if n and n.get("url")}
+    social_urls = _as_set(node.get("socialAccounts"))
     
     normalized_urls = set()
     for url in social_urls:
@@ -27,8 +41,7 @@ def _normalize_user(node: Dict) -> Dict:
         normalized_urls.add(normal_url)
     
     # Extract organizations (list of org logins)
-    organization_nodes = (node.get("organizations") or {}).get("nodes") or []
-    organizations = {org.get("login") for org in organization_nodes if org and org.get("login")}
+    organizations = _as_set(node.get("organizations"))
     
     # Always return emails as a set (if present, else empty set)
     email_val = node.get("email")
@@ -46,66 +59,94 @@ def _normalize_user(node: Dict) -> Dict:
         "location": node.get("location"),
         "company": node.get("company"),
         "bio": node.get("bio"),
-        "organizations": organizations
+        "organizations": organizations,
+        "id": node.get("id") # GraphQL node ID: stable across renames (see Utils/nodeRequests.py)
     }
 
+_PROFILE_FIELDS = ("id", "login", "createdAt", "name", "email", "bio", "location", "company", "socialAccounts", "organizations")
+_EXACT_PAGE_PREFIXES = tuple(f"data.user.{field}" for field in _PROFILE_FIELDS) + tuple(
+    f"data.user.{connection}.{part}" for connection in ("following", "followers") for part in ("nodes.item", "pageInfo")
+) + ("errors.item",)
+
+def _normalize_page(page: Tuple[str, List[Dict]]) -> Tuple[str, List[Dict]]:
+    """Normalizes one page of a connection ((connection name, raw nodes)). Runs on an OrderedStage while the next page is fetched."""
+    key, nodes = page
+    return key, [_normalize_user(n) for n in nodes]
+
 def user_exact_request(
     token: str,
     query: str,
-    variables: dict
+    variables: dict,
+    cache: EntityCache = None
     ) -> Tuple[Dict, List[Dict], List[Dict]]:
     """
-    Inputs: GitHub username (login), personal access token, and variables dictionary.
+    Inputs: GitHub username (login), personal access token, variables dictionary, and an optional EntityCache (defaults to the run cache).
     Outputs: Target user profile dict, list of following, list of followers.
-    Method: Batched requests to the GitHub GraphQL endpoint for users with pagination.
+    Method: Batched requests to the GitHub GraphQL endpoint for users with pagination. Every normalized user is stored in the cache for later stages.
+            Pages are parsed incrementally (stream_graphql), so follower/following node lists are built while the response is still downloading.
     Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
+    cache = resolve_cache(cache)
     
-    following: List[Dict] = []
-    followers: List[Dict] = []
+    following_count = 0
+    followers_count = 0
     more_following = True
     more_followers = True
+    normalizer = OrderedStage(_normalize_page) # Normalizes each page while the next one is being fetched
+    
+    max_following, max_followers = variables.get("max_following", 250), variables.get("max_followers")
+    user = None
+    try:
+        while (more_following or more_followers) and (following_count < max_following or followers_count < max_followers):
+            # The page is parsed while it downloads: follower/following nodes are collected one by one, up to the caps
+            page_user, page_nodes, page_info, errors = {}, {"following": [], "followers": []}, {}, []
+            room = {"following": max_following - following_count, "followers": max_followers - followers_count}
+            try:
+                for prefix, value in stream_graphql(token, query, variables, _EXACT_PAGE_PREFIXES):
+                    if prefix == "errors.item":
+                        errors.append(value)
+                    elif prefix.endswith(".nodes.item"):
+                        connection = prefix.split(".")[2]
+                        if value and len(page_nodes[connection]) < room[connection]:
+                            page_nodes[connection].append(value)
+                    elif prefix.endswith(".pageInfo"):
+                        page_info[prefix.split(".")[2]] = value or {}
+                    else:
+                        page_user[prefix.rsplit(".", 1)[1]] = value
+            except BudgetExhausted:
+                break # Search budget spent: keep the target profile and the pages collected so far
+            
+            if errors:
+                raise RuntimeError(f"GraphQL error: {errors}")
+            
+            print(f"Fetched user payload: {page_user}")
+            if not page_user.get("login"):
+                break
+            user = page_user
+            
+            # Following
+            normalizer.put(("following", page_nodes["following"]))
+            following_count += len(page_nodes["following"])
+            following_page = page_info.get("following") or {}
+            more_following = bool(following_page.get("hasNextPage")) and following_count < max_following
+            variables["followingCursor"] = following_page.get("endCursor")
+            
+            # Followers
+            normalizer.put(("followers", page_nodes["followers"]))
+            followers_count += len(page_nodes["followers"])
+            followers_page = page_info.get("followers") or {}
+            more_followers = bool(followers_page.get("hasNextPage")) and followers_count < max_followers
+            variables["followersCursor"] = followers_page.get("endCursor")
+            
+            # If no more to fetch, break
+            if not (more_following or more_followers):
+                break
+    finally:
+        pages = normalizer.results()
+    
+    following = [node for key, nodes in pages if key == "following" for node in nodes]
+    followers = [node for key, nodes in pages if key == "followers" for node in nodes]
     
-    while (more_following or more_followers) and (len(following) < variables.get("max_following") or len(followers) < variables.get("max_followers")):
-        response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
-        response.raise_for_status()
-        payload = response.json()
-        
-        if payload.get("errors"):
-            raise RuntimeError(f"GraphQL error: {payload['errors']}")
-        
-        user = payload.get("data", {}).get("user")
-        print(f"Fetched user payload: {user}")
-        if not user:
-            break
-        
-        # Following
-        following_conn = user["following"]
-        following_nodes_raw = following_conn.get("nodes") or []
-        following_nodes = [_normalize_user(n) for n in following_nodes_raw]
-        remaining_following = variables.get("max_following", 250) - len(following)
-        if remaining_following > 0:
-            following.extend(following_nodes[:remaining_following])
-        following_cursor = following_conn["pageInfo"]["endCursor"]
-        more_following = following_conn["pageInfo"]["hasNextPage"] and len(following) < variables.get("max_following")
-        variables["followingCursor"] = following_cursor
-        
-        # Followers
-        followers_conn = user["followers"]
-        followers_nodes_raw = followers_conn.get("nodes") or []
-        followers_nodes = [_normalize_user(n) for n in followers_nodes_raw]
-        remaining_followers = variables.get("max_followers") - len(followers)
-        if remaining_followers > 0:
-            followers.extend(followers_nodes[:remaining_followers])
-        followers_cursor = followers_conn["pageInfo"]["endCursor"]
-        more_followers = followers_conn["pageInfo"]["hasNextPage"] and len(followers) < variables.get("max_followers")
-        variables["followersCursor"] = followers_cursor
-        
-        # If no more to fetch, break
-        if not (more_following or more_followers):
-            break
-        
     # Normalize target_user and perform some data transformations
     if user:
         normalized_target = _normalize_user(user)
@@ -113,30 +154,118 @@ def user_exact_request(
     else:
         normalized_target = None
     
+    # Makes every fetched profile available to later stages (stargazing batches, org searches) without re-requesting it
+    for record in ([normalized_target] if normalized_target else []) + following + followers:
+        if record.get("login"):
+            cache.put("user", record["login"], record)
+    
     # Sets user['relation'] value for each user based on followership (mutual, following, follower)
     followership = compare_user_relations(following, followers, normalized_target)
     
     return [normalized_target], followership
 
-def user_bulk_request(token: str, query: str) -> Dict:
+def user_followership_request(
+    token: str,
+    query: str,
+    variables: dict,
+    budget = None,
+    cache: EntityCache = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Inputs: Personal access token, followership query, variables dictionary (login, max_following, max_followers), an optional request budget (object with spend() -> bool), and an optional EntityCache.
+    Outputs: List of following and list of followers (normalized user dicts).
+    Method: Paginates both connections in the same request and drops a connection from the query (@include) once it is exhausted or capped. Stops early when the budget refuses a page.
+    Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
+    """
+    cache = resolve_cache(cache)
+    
+    max_following = variables.get("max_following", 250)
+    max_followers = variables.get("max_followers", 250)
+    variables["includeFollowing"] = max_following > 0
+    variables["includeFollowers"] = max_followers > 0
+    
+    counts = {"following": 0, "followers": 0}
+    normalizer = OrderedStage(_normalize_page) # Normalizes each page while the next one is being fetched
+    try:
+        while variables["includeFollowing"] or variables["includeFollowers"]:
+            if budget is not None and not budget.spend():
+                break
+            
+            request_variables = {k: v for k, v in variables.items() if k not in ("max_following", "max_followers")}
+            try:
+                payload = send_graphql(token, query, request_variables)
+            except BudgetExhausted:
+                break # Search budget spent: keep the pages collected so far
+            
+            if payload.get("errors"):
+                raise RuntimeError(f"GraphQL error: {payload['errors']}")
+            
+            user = payload.get("data", {}).get("user")
+            if not user:
+                break
+            
+            for key, cap, cursor_key, include_key in (
+                ("following", max_following, "followingCursor", "includeFollowing"),
+                ("followers", max_followers, "followersCursor", "includeFollowers"),
+            ):
+                connection = user.get(key)
+                if not connection:
+                    continue
+                nodes = [n for n in connection.get("nodes") or [] if n][:cap - counts[key]]
+                normalizer.put((key, nodes))
+                counts[key] += len(nodes)
+                variables[cursor_key] = connection["pageInfo"]["endCursor"]
+                variables[include_key] = connection["pageInfo"]["hasNextPage"] and counts[key] < cap
+    finally:
+        pages = normalizer.results()
+    
+    following = [node for key, nodes in pages if key == "following" for node in nodes]
+    followers = [node for key, nodes in pages if key == "followers" for node in nodes]
+    
+    for record in following + followers:
+        if record.get("login"):
+            cache.put("user", record["login"], record)
+    
+    return following, followers
+
+def user_bulk_request(token: str, query: str, variables: dict = None) -> Dict:
     """
-    Inputs: GitHub usernames (logins) list and personal access token.
+    Inputs: Personal access token, bulk user query, and its variables (the logins bound to each alias).
     Outputs: GraphQL response JSON for bulk user queries.
     Method: Batched requests to the GitHub GraphQL endpoint for users.
     Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
-    response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query}, headers=headers)
-    response.raise_for_status()
-    payload = response.json()
+    payload = send_graphql(token, query, variables)
     if payload.get("errors"):
-        raise RuntimeError(f"GraphQL error: {payload['errors']}")
+        if not payload.get("data"):
+            raise RuntimeError(f"GraphQL error: {payload['errors']}")
+        print(f"GraphQL warning (unresolved logins skipped): {payload['errors']}") # e.g. renamed/deleted accounts; the rest of the batch is still valid
     
     user_dicts = list(payload["data"].values())
     
     normalized_users = [_normalize_user(user) for user in user_dicts if user]
     return normalized_users
 
+def user_hydration_request(token: str, logins: List[str], batch_size: int = 50) -> Dict[str, Dict]:
+    """
+    Inputs: Personal access token and list of user logins.
+    Outputs: Dict of {login: normalized user dict} (None for logins that do not resolve to a user).
+    Method: Bulk GraphQL user queries (batch_size aliases per query). Results are matched to the requested logins case-insensitively.
+    """
+    users_by_login = {}
+    for i in range(0, len(logins), batch_size):
+        user_batch = logins[i:i+batch_size]
+        query, variables = graphQL_build_bulk_user_query(user_batch)
+        
+        try:
+            fetched = {user["login"].lower(): user for user in user_bulk_request(token, query, variables) if user.get("login")}
+        except BudgetExhausted:
+            break # Search budget spent: the remaining logins are left out (not reported as unresolved)
+        for login in user_batch:
+            users_by_login[login] = fetched.get(login.lower())
+    
+    return users_by_login
+
 def user_exact_results_requests(token: str,
     query: str,
     variables: dict
@@ -147,17 +276,13 @@ def user_exact_results_requests(token: str,
     Method: Batched requests to the GitHub GraphQL endpoint for users with pagination.
     Information (per User): Owner & Repository names of starred repositories.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
-    
     starred_edges = []
     starred_cursor = variables.get("starredCursor")
     starred_fetched = 0
     max_starred = variables.get("maxStarred", 250)
 
     while starred_fetched < max_starred:
-        response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
-        response.raise_for_status()
-        payload = response.json()
+        payload = send_graphql(token, query, variables)
         
         if payload.get("errors"):
             raise RuntimeError(f"GraphQL error: {payload['errors']}")
@@ -195,16 +320,7 @@ def starred_repos_request(token: str, query: str, variables: dict = None) -> Dic
     Method: Batched requests to the GitHub GraphQL endpoint for users with pagination.
     Information (per User): Owner & Repository names of starred repositories.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    
-    payload = {"query": query}
-    if variables is not None:
-        payload["variables"] = variables
-    response = requests.post(GITHUB_GRAPHQL_URL, json=payload, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return send_graphql(token, query, variables)
 
 #============================================================================================
 
@@ -212,23 +328,19 @@ def user_partial_request(
     token: str,
     query: str,
     variables: dict
-) -> Tuple[Dict, List[Dict], List[Dict]]:
+) -> List[Dict]:
     """
     Inputs: GitHub username (login), personal access token, and variables dictionary.
-    Outputs: Target user profile dict, list of following, list of followers.
+    Outputs: List of normalized user dicts (see _normalize_user), one per login that resolved.
     Method: Batched requests to the GitHub GraphQL endpoint for users with pagination.
     Information (per User): Login, Name, Email, Bio, Location, Company, socialAccounts URLs.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
-    
-    response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
-    response.raise_for_status()
-    payload = response.json()
+    payload = send_graphql(token, query, variables)
     
     if payload.get("errors"):
         raise RuntimeError(f"GraphQL error: {payload['errors']}")
     
-    user_dicts = list(payload["data"].values())
+    user_dicts = [_normalize_user(node) for node in payload["data"].values() if node] # Flat socialAccounts URLs, like every other search mode
     
     print(f"Fetched user payload: {user_dicts}")
     
@@ -244,7 +356,6 @@ def repo_insights_request(token: str, login: str):
     Method: Batched requests to the GitHub GraphQL endpoint for repositories with pagination.
     Information (per Repository): Users who have forked or starred the repository.
     """
-    headers = {"Authorization": f"bearer {token}", "Content-Type": "application/json"}
     repo_cursor = None
     forked_users = set()
     starred_users = set()
@@ -254,9 +365,10 @@ def repo_insights_request(token: str, login: str):
     
     while total_repos < max_repos:
         variables = {"login": login, "repoCursor": repo_cursor}
-        response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
-        response.raise_for_status()
-        payload = response.json()
+        try:
+            payload = send_graphql(token, query, variables)
+        except BudgetExhausted:
+            break # Search budget spent: insights from the repositories paged so far
         
         if payload.get("errors"):
             raise RuntimeError(f"GraphQL error: {payload['errors']}")
@@ -1,59 +1,149 @@
 # Utils/writeToFile.py
-import os, openpyxl
+import os, json, openpyxl
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from openpyxl.utils import get_column_letter
 from datetime import datetime
+from .entityStore import _record_kind
+
+## NOTES: Excel sheets hold at most 1,048,576 rows (one is the header), and openpyxl saves a workbook on a single core. Results that do not
+## fit one sheet are split into shards (by entity type and/or row count); each shard file is written by its own worker process and a
+## JSON manifest listing every file and sheet with its row range (first_row / last_row, 1-based and inclusive, counted within the
+## shard's group in input order; the group is every row when shard_by is not set) is saved alongside them. Results that fit one sheet are written exactly as before.
+## Shards are streamed: each shard's rows are submitted as soon as its file is planned, at most one shard per worker is pending at a time,
+## and cell values are built inside the worker while the sheet is written, so the parent never holds a second (cell) copy of the output.
+
+EXCEL_MAX_ROWS = 1_048_576 - 1 # Data rows per sheet (the first row is the header)
 
 search_info = {}
 
-def write_to_excel(user_data: list, target: str, search_info: dict):
+def _entity_type(row: dict) -> str:
+    return row.get("entityType") or _record_kind(row) # Organization info rows are told apart the same way the entity store does
+
+def _cell_value(val):
+    # Convert sets/lists to comma-separated string for Excel
+    if isinstance(val, (set, list)):
+        return ', '.join(str(item) for item in val)
+    if isinstance(val, dict):
+        return str(val)
+    return val
+
+def _column_keys(rows: list) -> list:
+    # Preserve column order: start with keys from first row, append any new keys found in others
+    keys = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return list(keys)
+
+def _write_workbook(file_path: str, sheets: list) -> str:
+    """
+    Inputs: Output path and list of (sheet title, column keys, rows of cell values).
+    Outputs: Output path (workbook saved).
+    Method: Write-only openpyxl workbook (rows are streamed to the file instead of held as cell objects). Runs in a worker process for shards.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for title, keys, rows in sheets:
+        ws = wb.create_sheet(title=title[:31])
+        for col in range(1, len(keys)+1): # Autosize columns
+            ws.column_dimensions[get_column_letter(col)].auto_size = True
+        ws.append(keys)
+        for row in rows:
+            ws.append(row)
+    wb.save(file_path)
+    return file_path
+
+def _write_shard(file_path: str, sheets: list) -> str:
+    """
+    Inputs: Output path and list of (sheet title, column keys, row dicts).
+    Outputs: Output path (workbook saved).
+    Method: Runs in a worker process; cell values are produced row by row as _write_workbook streams each sheet.
+    """
+    return _write_workbook(file_path, [(title, keys, ([_cell_value(user.get(key, "")) for key in keys] for user in rows)) for title, keys, rows in sheets])
+
+def _plan_shards(user_data: list, shard_by: str, rows_per_sheet: int, rows_per_file: int) -> list:
+    """Groups rows (by entity type or by a key when shard_by is set) and cuts each group into files of sheets. Returns [(group, [[rows per sheet]])]."""
+    groups = {}
+    if shard_by:
+        for row in user_data:
+            value = _entity_type(row) if shard_by == "type" else row.get(shard_by)
+            groups.setdefault(str(value if value not in (None, "") else "other"), []).append(row)
+    else:
+        groups["all"] = user_data
+
+    shards = []
+    for group, rows in groups.items():
+        for file_start in range(0, len(rows), rows_per_file):
+            file_rows = rows[file_start:file_start + rows_per_file]
+            shards.append((group, [file_rows[i:i + rows_per_sheet] for i in range(0, len(file_rows), rows_per_sheet)]))
+    return shards
+
+def write_to_excel(
+    user_data: list,
+    target: str,
+    search_info: dict,
+    shard_by: str = None,
+    rows_per_sheet: int = EXCEL_MAX_ROWS,
+    rows_per_file: int = None,
+    workers: int = None,
+    output_dir: str = None
+    ):
     """
-    Inputs: List of dicts containing returned information and target name(s).
-    Outputs: Excel file written to user's Downloads folder.
-    Method: Uses Openpyxl to write data to an Excel file.
+    Inputs: List of dicts containing returned information, target name(s), search info, optional sharding: shard_by ("type" for
+            entity type, or a column key such as "relation"), rows per sheet (capped at Excel's limit), rows per file, and worker processes,
+            and an optional output folder (defaults to Downloads).
+    Outputs: Excel file(s) written to user's Downloads folder (or output_dir). Returns the file name, or the manifest file name when the output was sharded.
+    Method: Uses Openpyxl to write data to Excel. Output that needs more than one sheet is sharded and the shard files are written in
+            parallel with process workers; a manifest (JSON) describes every shard.
     """
     searchMode = search_info.get("search_mode")
     searchMethod = search_info.get("search_method")
-    
-    # Create workbook and worksheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = f"{searchMode}Search{searchMethod}"
-    
-    # Preserve column order: start with keys from first user, append any new keys found in others
-    if user_data:
-        all_keys = list(user_data[0].keys())
-        for user in user_data[1:]:
-            for k in user.keys():
-                if k not in all_keys:
-                    all_keys.append(k)
-    else:
-        all_keys = []
-    
-    # Write header
-    for col, key in enumerate(all_keys, 1):
-        ws.cell(row=1, column=col, value=key)
-    
-    # Write user data
-    for row, user in enumerate(user_data, 2):
-        for col, key in enumerate(all_keys, 1):
-            val = user.get(key, "")
-            # Convert sets/lists to comma-separated string for Excel
-            if isinstance(val, (set, list)):
-                val = ', '.join(str(item) for item in val)
-            elif isinstance(val, dict):
-                val = str(val)
-            ws.cell(row=row, column=col, value=val)
-    
-    # Autosize columns
-    for col in range(1, len(all_keys)+1):
-        ws.column_dimensions[get_column_letter(col)].auto_size = True
-    
+    sheet_title = f"{searchMode}Search{searchMethod}"
+    rows_per_sheet = max(1, min(rows_per_sheet, EXCEL_MAX_ROWS))
+    rows_per_file = max(rows_per_sheet, rows_per_file or rows_per_sheet)
+
     # Build filename and path to Downloads
     date_str = datetime.now().strftime("%Y%m%d%H%M")
-    filename = f"{date_str}{searchMode}Search{searchMethod}_{target}.xlsx"
-    downloads_folder = os.path.join(os.path.expanduser("~"), "Downloads")
-    file_path = os.path.join(downloads_folder, filename)
-    
-    # Save results to workbook
-    wb.save(file_path)
-    return filename
\ No newline at end of file
+    base_name = f"{date_str}{searchMode}Search{searchMethod}_{target}"
+    downloads_folder = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+    os.makedirs(downloads_folder, exist_ok=True)
+
+    all_keys = _column_keys(user_data)
+    shards = _plan_shards(user_data, shard_by, rows_per_sheet, rows_per_file)
+
+    if not shard_by and (not shards or (len(shards) == 1 and len(shards[0][1]) == 1)): # Fits one sheet: single workbook, written in this process
+        rows = [[_cell_value(user.get(key, "")) for key in all_keys] for user in user_data]
+        filename = f"{base_name}.xlsx"
+        _write_workbook(os.path.join(downloads_folder, filename), [(sheet_title, all_keys, rows)])
+        return filename
+
+    manifest = {"target": target, "search_mode": searchMode, "search_method": searchMethod, "created": datetime.now().isoformat(timespec="seconds"),
+                "total_rows": len(user_data), "columns": all_keys, "shard_by": shard_by, "shards": []}
+    workers = workers or min(len(shards), os.cpu_count() or 1)
+    print(f"Writing {len(user_data)} rows to {len(shards)} files with {workers} processes...")
+    group_rows = {} # Rows of each group already assigned to earlier shards (manifest row ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for number, (group, sheets) in enumerate(shards, 1):
+            filename = f"{base_name}_part{number:03d}" + (f"_{group}" if shard_by else "") + ".xlsx"
+            keys = _column_keys(row for sheet in sheets for row in sheet) if shard_by else all_keys
+            sheet_specs, sheet_entries = [], []
+            first_row = group_rows.get(group, 0) + 1
+            for sheet_number, sheet_rows in enumerate(sheets, 1):
+                title = f"{sheet_title[:26]}_{sheet_number}" if len(sheets) > 1 else sheet_title
+                sheet_specs.append((title, keys, sheet_rows))
+                sheet_first = group_rows.get(group, 0) + 1
+                group_rows[group] = sheet_first - 1 + len(sheet_rows)
+                sheet_entries.append({"sheet": title[:31], "rows": len(sheet_rows), "first_row": sheet_first, "last_row": group_rows[group]})
+            manifest["shards"].append({"file": filename, "group": group, "rows": sum(len(s) for s in sheets),
+                                       "first_row": first_row, "last_row": group_rows.get(group, 0), "sheets": sheet_entries})
+            if len(pending) >= workers: # Backpressure: the next shard is pickled only once a worker is free
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(pool.submit(_write_shard, os.path.join(downloads_folder, filename), sheet_specs))
+        for future in pending:
+            future.result()
+
+    manifest_name = f"{base_name}_manifest.json"
+    with open(os.path.join(downloads_folder, manifest_name), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_name
@@ -1,44 +1,89 @@
 # main.py
-import os, time # Time used to measure code execution times
+import os, sys, time # Time used to measure code execution times
 from pathlib import Path
 from Modules.userSearch import user_search_exact, user_search_partial
+from Modules.multiTargetSearch import user_search_multi
+from Modules.followershipCrawler import crawl_followership
+from Modules.authorSearch import author_search
 from Modules.organizationSearch import organization_search_info, organization_search_intersection
-from Utils.menus import user_search_mode_menu, organization_search_mode_menu, clearTerminal
+from Modules.repositorySearch import repository_search_info
+from Modules.confidenceScoring import score_users
+from Modules.identityResolution import annotate_identity_clusters
+from Modules.watchMode import refresh_targets, tracked_targets
+from Utils.menus import user_search_mode_menu, organization_search_mode_menu, crawl_depth_menu, watch_mode_menu, search_budget_menu, clearTerminal
 from Utils.writeToFile import write_to_excel
+from Utils.dataTransformations import author_identity_rows
+from Utils.entityCache import reset_run_cache
+from Utils.entityStore import default_store, _record_kind
+from Utils.searchBudget import SearchBudget, mark_partial
+from Utils.sendRequests import response_stats
+from Utils.tokenPool import TokenPool
 
 ## CONSIDERED FOR FUTURE UPDATES:
-## 1) Implement a scoring module to rank attribution confidence based on multiple factors (e.g., name/email syntax, location, company, social links, achievements, etc.).
 ## n) Optimize code to reduce time complexity where possible.
 
 BASE_DIR = Path(__file__).resolve().parent
 ENV_PATH = BASE_DIR / ".env"
 
-try:
-    from dotenv import load_dotenv
-    if ENV_PATH.exists():
-        load_dotenv(dotenv_path=ENV_PATH, override=False)
-        # Optional: warn or raise if the file is expected to exist
-        print(f"[env] No env file found at: {ENV_PATH}")
-    token = os.getenv("GITHUB_API_TOKEN")
-    
-except ImportError:
-    token = input("Enter your GitHub Personal Access Token: ")
-
 search_info = {}
 
+def _load_token() -> TokenPool:
+    """
+    Loads the token pool from .env / the environment, prompting when python-dotenv is not installed.
+    Called only when main.py runs as a script: process workers started with spawn (Windows, macOS) re-import this module and must not prompt.
+    """
+    # Accepts several tokens (GITHUB_API_TOKENS=token1,token2,...) so requests are spread across their hourly budgets
+    try:
+        from dotenv import load_dotenv
+        if ENV_PATH.exists():
+            load_dotenv(dotenv_path=ENV_PATH, override=False)
+            # Optional: warn or raise if the file is expected to exist
+            print(f"[env] No env file found at: {ENV_PATH}")
+        return TokenPool.from_env()
+        
+    except ImportError:
+        return TokenPool.from_env(fallback=input("Enter your GitHub Personal Access Token(s), comma-separated: "))
+
+def _start_budget(limits: tuple):
+    """Creates the SearchBudget for a search from (deadline, max_points), or None when neither limit was given."""
+    deadline, max_points = limits
+    return SearchBudget(deadline, max_points) if deadline or max_points else None
+
+def _note_partial(records, budget):
+    """Reports a budgeted search's usage and tags the outfile name when its results are partial."""
+    if budget is None:
+        return
+    print(budget.summary())
+    if getattr(records, "partial", False):
+        search_info["search_method"] += "Partial" # used in outfile name
+
+def _annotate_people(records: list):
+    """Scores and clusters the user rows of a search's records (organization info and repository rows are left as they are)."""
+    people = [record for record in records if record and _record_kind(record) == "user"]
+    score_users(people) # Adds an attribution 'confidence' column (0-1)
+    annotate_identity_clusters(people) # Adds 'identityCluster' and 'possibleAliases' columns for logins that look like the same person
+
+def _save_to_store(records: list, target: str):
+    """Upserts a search's records and relationships into the local entity store (failures never block the Excel output)."""
+    try:
+        run_id = default_store().ingest(records, search_info, target)
+        print(f"Results indexed in the entity store (run {run_id}).")
+    except Exception as e:
+        print(f"Error saving results to the entity store: {e}")
+
 def _decision_tree():
     clearTerminal()
     
     print("1) User Search")
     print("2) Organization Search")
-    print("3) PLACEHOLDER")
-    print("4) PLACEHOLDER")
+    print("3) Repository Search")
+    print("4) Watch Targets")
     
     actions = {
         "1": lambda: user_search(token), 
         "2": lambda: organization_search(token),
-        "3": lambda: print("Placeholder '3' Selected"),
-        "4": lambda: print("Placeholder '4' Selected"),
+        "3": lambda: repository_search(token),
+        "4": lambda: watch_search(token),
     }
     
     while True:
@@ -55,31 +100,81 @@ def user_search(token):
     Broadens target analysis by fetching followership data and returning noteworthy followers:
     1. Exact: Returns info on the input user and their followership and stargazing relationships
     2. Partial: Returns info for users with similar names to the search string and returns their profile info
+    3. Network Crawl: Returns the followership network of the input user to a chosen depth
+    4. Author Search: Returns the unique {login: {fullname, email}} identities found in the commit history of the input repositories
+    5. Multi-target Exact: Runs Exact for several logins concurrently, merges them into one row per login, and reports what the targets share
     '''
     search_info["search_mode"] = "user" # used in outfile name
     
     search_mode = user_search_mode_menu()
     clearTerminal()
     
-    target_user = input("Enter the GitHub username to analyze: ").strip()
+    if search_mode == "4":
+        #Builds a list of target repositories from user input
+        target_repos = []
+        while True:
+            target_repo = input("Enter a repository as owner/name (leave blank to finish): ").strip()
+            if not target_repo:
+                break
+            target_repos.append(target_repo)
+        target_user = f"{len(target_repos)}repos" # used in outfile name
+    elif search_mode == "5":
+        #Builds a list of target users from user input
+        target_users = []
+        while True:
+            login = input("Enter a GitHub username (leave blank to finish): ").strip()
+            if not login:
+                break
+            target_users.append(login)
+        target_user = f"{len(target_users)}users" # used in outfile name
+    else:
+        target_user = input("Enter the GitHub username to analyze: ").strip()
+    if search_mode == "3":
+        depth = crawl_depth_menu()
+    limits = search_budget_menu()
     clearTerminal()
     
     start_time = time.perf_counter() # Start time measurement
+    budget = _start_budget(limits)
+    reset_run_cache() # Entities are shared between the stages of this search only
+    response_stats.reset()
     
     if search_mode == "1":
         search_info["search_method"] = "Exact" # used in outfile name
-        user_data = user_search_exact(token, target_user)
+        user_data = user_search_exact(token, target_user, budget=budget)
         print(user_data)
         
     elif search_mode == "2":
         search_info["search_method"] = "Partial" # used in outfile name
         user_data = set()
-        user_data = user_search_partial(token, target_user)
+        user_data = user_search_partial(token, target_user, budget=budget)
+        print(user_data)
+    
+    elif search_mode == "3":
+        search_info["search_method"] = f"Crawl{depth}Hop" # used in outfile name
+        user_data = crawl_followership(token, target_user, depth=depth, budget=budget)
+        print(user_data)
+    
+    elif search_mode == "4":
+        search_info["search_method"] = "Author" # used in outfile name
+        user_data = mark_partial(author_identity_rows(author_search(token, target_repos, budget=budget)), budget)
+        print(user_data)
+    
+    elif search_mode == "5":
+        search_info["search_method"] = "Multi" # used in outfile name
+        user_data, overlap = user_search_multi(token, target_users, budget=budget)
         print(user_data)
     
+    _annotate_people(user_data)
+    
+    clearTerminal()
+    _note_partial(user_data, budget)
+    _save_to_store(user_data, target_user)
+    
     try:
-        clearTerminal()
         write_to_excel(user_data, target_user, search_info)
+        if search_mode == "5":
+            write_to_excel(overlap, f"{target_user}_overlap", search_info) # Shared followers, following, orgs and starred owners
         print(f"Results saved to Excel in your Downloads folder.")
     
     except Exception as e:
@@ -90,6 +185,7 @@ def user_search(token):
     end_time = time.perf_counter()
     elapsed_time = end_time - start_time
     print(f"Execution time: {elapsed_time:.4f} seconds") # Prints execution time (without user input delay)
+    print(response_stats.summary()) # Prints request count, transferred/decompressed sizes, and JSON decode time
 
 def organization_search(token):
     '''
@@ -109,25 +205,34 @@ def organization_search(token):
             break
         target_orgs.append(target_org)
         orgCount = f"{len(target_orgs)}orgs" # used in outfile name
+    limits = search_budget_menu()
     
     start_time = time.perf_counter() # Start time measurement
+    budget = _start_budget(limits)
+    reset_run_cache() # Entities are shared between the stages of this search only
+    response_stats.reset()
     
     if search_mode == "1":
         search_info["search_method"] = "Info" # used in outfile name
-        org_data = organization_search_info(token, target_orgs) # ADD FUTURE ENRICHMENT FUNCTIONS HERE
+        org_data = organization_search_info(token, target_orgs, budget=budget) # ADD FUTURE ENRICHMENT FUNCTIONS HERE
         
         clearTerminal()
         print(org_data)
     
     elif search_mode == "2":
         search_info["search_method"] = "Intersection" # used in outfile name
-        org_data = organization_search_intersection(token, target_orgs)
+        org_data = organization_search_intersection(token, target_orgs, budget=budget)
         
         clearTerminal()
         print(org_data)
     
+    _annotate_people(org_data) # Members of the target orgs (one row per login) that look like the same person
+    
+    clearTerminal()
+    _note_partial(org_data, budget)
+    _save_to_store(org_data, " ".join(target_orgs))
+    
     try:
-        clearTerminal()
         write_to_excel(org_data, orgCount, search_info)
         print(f"Results saved to Excel in your Downloads folder.")
     
@@ -139,7 +244,108 @@ def organization_search(token):
     end_time = time.perf_counter()
     elapsed_time = end_time - start_time
     print(f"Execution time: {elapsed_time:.4f} seconds") # Prints execution time (without user input delay)
+    print(response_stats.summary()) # Prints request count, transferred/decompressed sizes, and JSON decode time
+
+def repository_search(token):
+    '''
+    Broadens target analysis by fetching repository data:
+    1. Full Info: Returns information on the input repositories and the users related to them: (Stargazers, Forks, Contributors)
+    '''
+    search_info["search_mode"] = "repository" # used in outfile name
+    search_info["search_method"] = "Info" # used in outfile name
+    clearTerminal()
+    
+    #Builds a list of target repositories from user input
+    target_repos = []
+    while True:
+        target_repo = input("Enter a repository as owner/name (leave blank to finish): ").strip()
+        if not target_repo:
+            break
+        target_repos.append(target_repo)
+    repoCount = f"{len(target_repos)}repos" # used in outfile name
+    limits = search_budget_menu()
+    
+    start_time = time.perf_counter() # Start time measurement
+    budget = _start_budget(limits)
+    reset_run_cache() # Entities are shared between the stages of this search only
+    response_stats.reset()
+    
+    repo_data = repository_search_info(token, target_repos, budget=budget)
+    
+    clearTerminal()
+    print(repo_data)
+    
+    clearTerminal()
+    _note_partial(repo_data, budget)
+    _save_to_store(repo_data, " ".join(target_repos))
+    
+    try:
+        write_to_excel(repo_data, repoCount, search_info)
+        print(f"Results saved to Excel in your Downloads folder.")
+    
+    except Exception as e:
+        clearTerminal()
+        print(f"Error saving results to Excel: {e}")
+        print(repo_data)
+    
+    end_time = time.perf_counter()
+    elapsed_time = end_time - start_time
+    print(f"Execution time: {elapsed_time:.4f} seconds") # Prints execution time (without user input delay)
+    print(response_stats.summary()) # Prints request count, transferred/decompressed sizes, and JSON decode time
+
+def watch_search(token):
+    '''
+    Re-checks tracked targets for changes since their last refresh:
+    1. Refresh: Reports new and removed followers/following, members, repositories, stars, stargazers and forks of every tracked target
+    2-4. Track: Adds users, organizations or repositories to the watch list (their first refresh records a baseline snapshot)
+    '''
+    search_info["search_mode"] = "watch" # used in outfile name
+    search_info["search_method"] = "Refresh" # used in outfile name
+    
+    watch_mode = watch_mode_menu()
+    clearTerminal()
+    
+    targets = None
+    if watch_mode != "1":
+        kind = {"2": "user", "3": "organization", "4": "repository"}[watch_mode]
+        targets = []
+        while True:
+            target = input(f"Enter a {kind} to track{' as owner/name' if kind == 'repository' else ''} (leave blank to finish): ").strip()
+            if not target:
+                break
+            targets.append((kind, target))
+    elif not tracked_targets():
+        print("No targets are tracked yet. Select a 'Track New' option first.")
+        return
+    
+    start_time = time.perf_counter() # Start time measurement
+    response_stats.reset()
+    
+    changes = refresh_targets(token, targets)
+    target_count = f"{len(targets) if targets else len(tracked_targets())}targets" # used in outfile name
+    
+    try:
+        write_to_excel(changes, target_count, search_info)
+        print(f"Changes saved to Excel in your Downloads folder.")
+    
+    except Exception as e:
+        print(f"Error saving changes to Excel: {e}")
+        print(changes)
+    
+    end_time = time.perf_counter()
+    elapsed_time = end_time - start_time
+    print(f"Execution time: {elapsed_time:.4f} seconds") # Prints execution time (without user input delay)
+    print(response_stats.summary()) # Prints request count, transferred/decompressed sizes, and JSON decode time
 
 if __name__ == '__main__':
+    token = _load_token()
     #print(f"GitHub Token: {token}")
-    _decision_tree()
\ No newline at end of file
+    if "--serve" in sys.argv: # python main.py --serve [port]: long-running local service with warm caches (see Modules/investigationService.py)
+        from Modules.investigationService import serve
+        args = sys.argv[sys.argv.index("--serve") + 1:]
+        serve(token, port=int(args[0]) if args and args[0].isdigit() else 8765)
+    elif "--refresh-store" in sys.argv: # python main.py --refresh-store: re-fetch every stored entity by node ID (see Utils/nodeRequests.py)
+        from Utils.nodeRequests import refresh_store
+        print(refresh_store(token, default_store()))
+    else:
+        _decision_tree()
\ No newline at end of file
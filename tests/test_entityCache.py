@@ -0,0 +1,24 @@
+# tests/test_entityCache.py
+from Utils.entityCache import EntityCache
+
+def test_keys_left_out_by_the_fetch_are_not_cached():
+    cache = EntityCache()
+    results = cache.get_or_fetch_many("user", ["found", "missing", "skipped"], lambda logins: {"found": {"login": "found"}, "missing": None})
+
+    assert results == {"found": {"login": "found"}, "missing": None, "skipped": None}
+    assert ("user", "missing") in cache # Reported as not found: cached
+    assert ("user", "skipped") not in cache # Never attempted (e.g. budget spent): fetched again next time
+    assert cache.get_or_fetch_many("user", ["skipped"], lambda logins: {"skipped": {"login": "skipped"}}) == {"skipped": {"login": "skipped"}}
+
+def test_cached_records_do_not_share_containers_with_callers():
+    cache = EntityCache()
+    record = {"login": "octocat", "emails": {"octocat@example.com"}, "organizations": ["github"]}
+    cache.put("user", "octocat", record)
+    record["emails"].add("other@example.com")
+    record["organizations"].append("other-org")
+
+    served = cache.get_or_fetch("user", "octocat", lambda: None)
+    served["emails"].add("served@example.com")
+    served["relation"] = "follower"
+
+    assert cache.get("user", "octocat") == {"login": "octocat", "emails": {"octocat@example.com"}, "organizations": ["github"]}
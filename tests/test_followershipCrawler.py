@@ -0,0 +1,18 @@
+# tests/test_followershipCrawler.py
+import Modules.followershipCrawler as followershipCrawler
+from Utils.entityCache import EntityCache
+
+def test_target_profile_is_fetched_as_hop_zero(monkeypatch):
+    requested = []
+    def hydration(token, logins):
+        requested.extend(logins)
+        return {login: {"login": login, "name": "The Octocat", "company": "@github"} for login in logins}
+    monkeypatch.setattr(followershipCrawler, "user_hydration_request", hydration)
+    monkeypatch.setattr(followershipCrawler, "user_followership_request", lambda *args: ([{"login": "ferris"}], []))
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+
+    records = followershipCrawler.crawl_followership("token", "octocat", depth=1, cache=EntityCache())
+
+    assert requested == ["octocat"]
+    assert records[0] == {"login": "octocat", "name": "The Octocat", "company": "@github", "relation": "target", "hop": 0, "parent": None}
+    assert [record["login"] for record in records[1:]] == ["ferris"]
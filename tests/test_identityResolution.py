@@ -0,0 +1,31 @@
+# tests/test_identityResolution.py
+import Utils.userRequests as userRequests
+from Utils.userRequests import _as_set
+from Modules.confidenceScoring import extract_features
+from Modules.identityResolution import resolve_identities
+
+def _raw_partial_node(login: str, url: str) -> dict:
+    # Shape of a user alias in the partialUserQuery response (UserProfile fragment)
+    return {"id": f"U_{login}", "login": login, "createdAt": "2020-01-01T00:00:00Z", "name": None, "email": "", "bio": None,
+            "location": None, "company": None, "socialAccounts": {"nodes": [{"url": url}]}}
+
+def test_partial_results_do_not_cluster_on_connection_keys(monkeypatch):
+    logins = ["octocat", "ferris", "gopher", "duke", "tux", "wilber"] # Unrelated logins, so only a shared key could link them
+    payload = {"data": {f"user{i}": _raw_partial_node(login, f"https://example{i}.com/profile") for i, login in enumerate(logins)}}
+    monkeypatch.setattr(userRequests, "send_graphql", lambda token, query, variables: payload)
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+
+    users = userRequests.user_partial_request("token", "query", {})
+
+    assert [user["socialAccounts"] for user in users] == [{f"https://example{i}.com/profile"} for i in range(6)]
+    assert resolve_identities(users) == []
+
+def test_as_set_reads_raw_connection_values_not_keys():
+    assert _as_set({"nodes": [{"url": "https://example.com"}, None, {"login": "github"}]}) == {"https://example.com", "github"}
+    assert _as_set({"nodes": []}) == set()
+
+def test_raw_and_normalized_records_score_and_cluster_alike():
+    raw = {"login": "octocat", "socialAccounts": {"nodes": [{"url": "https://example.com/octocat"}]}}
+    normalized = {"login": "octocat", "socialAccounts": {"https://example.com/octocat"}}
+    assert (extract_features([raw]) == extract_features([normalized])).all()
+    assert resolve_identities([dict(raw, login="octocat"), dict(normalized, login="ferris")]) != []
@@ -0,0 +1,18 @@
+# tests/test_main.py
+import main
+
+def test_org_members_are_scored_and_clustered_but_org_rows_are_not():
+    org_row = {"login": "acme", "name": "Acme", "email": "contact@acme.example.com", "websiteUrl": "https://acme.example.com", "isVerified": True}
+    members = [
+        {"login": "jdoe", "name": "Jane Doe", "emails": {"jane@example.com"}, "organizations": ["acme"]},
+        {"login": "jane-work", "name": "Jane Doe", "emails": {"jane@example.com"}, "organizations": ["acme"]},
+        {"login": "octocat", "name": "The Octocat", "organizations": ["acme"]},
+    ]
+
+    main._annotate_people([org_row] + members)
+
+    assert "confidence" not in org_row and "identityCluster" not in org_row
+    assert all("confidence" in member for member in members)
+    assert members[0]["identityCluster"] == members[1]["identityCluster"]
+    assert members[0]["possibleAliases"] == {"jane-work"}
+    assert "identityCluster" not in members[2]
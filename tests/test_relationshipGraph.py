@@ -0,0 +1,38 @@
+# tests/test_relationshipGraph.py
+import Modules.followershipCrawler as followershipCrawler
+from Utils.entityCache import EntityCache
+from Utils.relationshipGraph import RelationshipGraph, build_relationship_graph
+
+def test_common_neighbor_counts_both_directions_counts_each_neighbor_once():
+    graph = RelationshipGraph()
+    for follower, followee in [("target", "a"), ("a", "target"), ("target", "b"), ("a", "x"), ("x", "a"), ("b", "x"), ("c", "target")]:
+        graph.add_edge("follow", follower, followee)
+
+    counts = graph.common_neighbor_counts("follow", graph.lookup("user", "target"), "both")
+
+    assert dict(zip(graph.names, counts.tolist())) == {"target": 0, "a": 0, "b": 0, "x": 2, "c": 0}
+
+def test_add_records_builds_typed_edges():
+    graph = build_relationship_graph([
+        {"login": "octocat", "relation": "target", "organizations": ["github"], "stargazing": ["rust-lang/rust"]},
+        {"login": "ferris", "relation": "mutual", "stargazing": ["rust-lang/rust"]},
+    ], target="octocat")
+
+    assert graph.edge_count("follow") == 2
+    assert graph.names_of(graph.common_neighbors("star", graph.lookup("user", "octocat"), graph.lookup("user", "ferris"))) == ["rust-lang/rust"]
+    assert graph.names_of(graph.neighbors("member", graph.lookup("user", "octocat"))) == ["github"]
+
+def test_crawl_counts_connections_through_every_parent(monkeypatch):
+    # login: (following, followers)
+    network = {"target": (["a", "b"], ["a", "c"]), "a": (["x"], ["x", "target"]), "b": (["x"], []), "c": (["target"], ["y"])}
+    def followership(token, query, variables, request_budget, cache):
+        following, followers = network.get(variables["login"], ([], []))
+        return [{"login": login} for login in following], [{"login": login} for login in followers]
+    monkeypatch.setattr(followershipCrawler, "user_followership_request", followership)
+    monkeypatch.setattr(followershipCrawler, "user_hydration_request", lambda token, logins: {login: {"login": login} for login in logins})
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+
+    records = {record["login"]: record for record in followershipCrawler.crawl_followership("token", "target", depth=2, cache=EntityCache())}
+
+    assert records["x"]["hop"] == 2 and records["x"]["sharedConnections"] == 2 # Reached through a and b, recorded once
+    assert records["y"]["sharedConnections"] == 1
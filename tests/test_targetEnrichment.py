@@ -0,0 +1,22 @@
+# tests/test_targetEnrichment.py
+import Modules.targetEnrichment as targetEnrichment
+
+def test_users_below_min_confidence_are_skipped(monkeypatch):
+    scraped = []
+    def fetch_profile(login, base_url):
+        scraped.append(login)
+        return "<html><body></body></html>"
+    monkeypatch.setattr(targetEnrichment, "_fetch_profile", fetch_profile)
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+    users = [
+        {"login": "octocat", "relation": "target"},
+        {"login": "monalisa", "relation": "mutual", "name": "Mona Lisa Octocat", "emails": {"mona@example.com"}, "location": "San Francisco",
+         "company": "@github", "bio": "Octocat", "socialAccounts": {"https://example.com/mona"}, "createdAt": "2010-01-01T00:00:00Z"},
+        {"login": "x1", "relation": "follower"},
+    ]
+
+    targetEnrichment.enrich_user_data(users, min_confidence=0.5, resolve_links=False, archive=False, clear_terminal=False)
+
+    assert sorted(scraped) == ["monalisa", "octocat"] # The target is kept whatever its score
+    assert [user["enrichment"] for user in users] == ["enriched", "enriched", "skipped"]
+    assert users[2]["confidence"] < 0.5 <= users[1]["confidence"]
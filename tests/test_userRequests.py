@@ -0,0 +1,35 @@
+# tests/test_userRequests.py
+import json
+import Utils.userRequests as userRequests
+from Utils.entityCache import EntityCache
+from Utils.sendRequests import iter_json_items
+
+def _node(login: str) -> dict:
+    return {"id": f"U_{login}", "login": login, "createdAt": "2020-01-01T00:00:00Z", "name": None, "email": "", "bio": None,
+            "location": None, "company": None, "socialAccounts": {"nodes": []}, "organizations": {"nodes": []}}
+
+def _page(following: list, followers: list, following_next: bool, followers_next: bool) -> bytes:
+    user = dict(_node("octocat"), name="The Octocat", socialAccounts={"nodes": [{"url": "https://example.com/octocat"}]},
+                organizations={"totalCount": 1, "nodes": [{"login": "github"}]})
+    user["following"] = {"pageInfo": {"hasNextPage": following_next, "endCursor": "f1"}, "nodes": [_node(login) for login in following]}
+    user["followers"] = {"pageInfo": {"hasNextPage": followers_next, "endCursor": "r1"}, "nodes": [_node(login) for login in followers]}
+    return json.dumps({"data": {"user": user}}).encode("utf-8")
+
+def test_exact_request_streams_pages_and_respects_caps(monkeypatch):
+    pages = iter([_page(["a", "b", "c"], ["b"], True, True), _page(["d"], ["e", "f"], False, False)])
+    sent = []
+    def stream(token, query, variables, prefixes, label=None):
+        sent.append(dict(variables))
+        yield from iter_json_items(next(pages), prefixes)
+    monkeypatch.setattr(userRequests, "stream_graphql", stream)
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+
+    variables = {"login": "octocat", "max_following": 3, "max_followers": 10, "followingCursor": None, "followersCursor": None}
+    target, followership = userRequests.user_exact_request("token", "query userQuery", variables, EntityCache())
+
+    assert target[0]["name"] == "The Octocat" and target[0]["organizations"] == {"github"}
+    assert target[0]["socialAccounts"] == {"https://example.com/octocat"}
+    assert sent[1]["followersCursor"] == "r1"
+    relations = {user["login"]: user["relation"] for user in followership}
+    assert target[0]["relation"] == "target"
+    assert relations == {"a": "following", "b": "mutual", "c": "following", "e": "follower", "f": "follower"} # d is past the following cap
@@ -0,0 +1,21 @@
+# tests/test_writeToFile.py
+import json, os
+from Utils.writeToFile import _entity_type, write_to_excel
+
+def test_organization_rows_get_their_own_type():
+    assert _entity_type({"login": "acme", "websiteUrl": "https://acme.example.com", "isVerified": False}) == "organization"
+    assert _entity_type({"login": "octocat"}) == "user"
+    assert _entity_type({"nameWithOwner": "octocat/hello-world"}) == "repository"
+
+def test_manifest_records_row_ranges(tmp_path, monkeypatch):
+    monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+    rows = [{"login": "acme", "websiteUrl": "https://acme.example.com", "isVerified": True}] + [{"login": f"user{i}"} for i in range(5)]
+
+    manifest_name = write_to_excel(rows, "acme", {"search_mode": "organization", "search_method": "Info"}, shard_by="type",
+                                   rows_per_sheet=2, rows_per_file=4, workers=1, output_dir=str(tmp_path))
+    with open(os.path.join(tmp_path, manifest_name), encoding="utf-8") as f:
+        shards = json.load(f)["shards"]
+
+    assert [(shard["group"], shard["first_row"], shard["last_row"]) for shard in shards] == [("organization", 1, 1), ("user", 1, 4), ("user", 5, 5)]
+    assert [(sheet["first_row"], sheet["last_row"]) for sheet in shards[1]["sheets"]] == [(1, 2), (3, 4)]
+    assert all(os.path.exists(os.path.join(tmp_path, shard["file"])) for shard in shards)